@@ -0,0 +1,20 @@
+import streamlit as st
+import pandas as pd
+
+from utils.st_cache import stage_stats
+
+
+def render_cache_debug():
+    """
+    이번 세션의 단계별 캐시 적중 / 소요 시간 (사이드바)
+    """
+    with st.sidebar.expander("🛠 캐시 / 단계별 시간"):
+        stats = stage_stats()
+        if not stats:
+            st.caption("기록 없음")
+            return
+
+        table = pd.DataFrame.from_dict(stats, orient="index")
+        table.index.name = "단계"
+        table.columns = ["적중", "미적중", "마지막", "마지막(ms)"]
+        st.dataframe(table, use_container_width=True)
@@ -1,29 +1,21 @@
 import streamlit as st
-import pandas as pd
-from io import BytesIO
 
+from utils.export import XLSX_MIME
 
-def render_xlsx_download(A: pd.DataFrame, dataset_id: str):
+
+def render_xlsx_download(build, dataset_id: str, empty: bool = False):
     """
-    기준 초과 분석 결과(통합 A+B)를 엑셀로 다운로드
+    기준 초과 분석 결과 엑셀 다운로드 (A / B / A+B / 초과시료 시트)
+    build: 인자 없는 함수 → XLSX 바이트 (버튼을 누를 때만 실행)
     """
 
-    if A is None or A.empty:
+    if empty:
         st.warning("다운로드할 데이터가 없습니다.")
         return
 
-    output = BytesIO()
-
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        A.to_excel(
-            writer,
-            index=False,
-            sheet_name="기준초과_종합"
-        )
-
     st.download_button(
         label="📥 기준 초과 분석 결과 다운로드 (XLSX)",
-        data=output.getvalue(),
+        data=build,
         file_name=f"{dataset_id}_기준초과분석.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
     )
@@ -2,7 +2,124 @@ import streamlit as st
 import os
 import uuid
 from datetime import datetime
-from utils.io import load_datasets, save_datasets, DATA_DIR
+from utils.io import load_datasets, store_dataset, remove_dataset, read_table, CATALOG, DATA_DIR
+from utils.catalog import dataset_stats, frame_stats
+from utils.preprocess import preprocess_dataframe, find_region_column, ALL_ITEMS
+from utils.analysis import materialize_survey_partitions
+from utils.materialize import remove_summary
+from utils.columnar import load_frame, remove_sidecar
+from utils.indexes import remove_index
+from utils.aggregates import remove_aggregates
+from utils.jobs import IngestQueue, QueueFull
+
+# 분석 기준표 / 조사구분 컬럼 (dashboard.py 와 동일)
+STANDARD_CSV = "example_table2.csv"
+SURVEY_COL = "조사구분"
+
+# 업로드 후처리 워커 수 / 대기 한도
+INGEST_WORKERS = 2
+INGEST_MAX_PENDING = 8
+
+
+def forget_files(files):
+    """
+    참조가 끊겨 삭제된 파일의 파생 파일 (요약 / 사이드카 / 행 인덱스) 정리
+    """
+    for file in files:
+        path = os.path.join(DATA_DIR, file)
+        remove_summary(path)
+        remove_sidecar(path)
+        remove_index(path)
+
+
+def materialize_upload(path, df):
+    """
+    업로드 직후 전체 항목 A / B / A+B 분석 결과를 파일 옆에 저장
+    (지역/조사구분 컬럼이 없는 파일은 건너뜀 → 대시보드에서 직접 계산)
+    """
+    if find_region_column(df) is None or SURVEY_COL not in df.columns:
+        return
+
+    df = preprocess_dataframe(df)
+    materialize_survey_partitions(df, path, ALL_ITEMS, STANDARD_CSV, survey_col=SURVEY_COL)
+
+
+@st.cache_resource
+def get_ingest_queue():
+    """
+    세션/재실행과 무관하게 서버 프로세스당 1개
+    """
+    return IngestQueue(workers=INGEST_WORKERS, max_pending=INGEST_MAX_PENDING)
+
+
+def ingest_upload(job, tmp_path, ext, dataset_id, record):
+    """
+    업로드 후처리 (rerun 밖 스레드에서 실행)
+    이미 저장된 내용과 같으면 파싱 / 사전 계산 없이 기존 파일을 공유
+    """
+    try:
+        # 해시 계산 패스에서 인코딩 판별 → 이후 읽기는 재시도 없음
+        job.update("검증", 0.1)
+        stats = dataset_stats(tmp_path)
+
+        df = None
+        if not CATALOG.known_blob(stats["sha256"]):
+            job.update("정규화", 0.3)
+            df = read_table(tmp_path, stats["encoding"])
+            stats.update(frame_stats(df))
+
+        job.update("등록", 0.6)
+        stored = store_dataset(dataset_id, record, stats, tmp_path, ext)
+    except Exception:
+        # 등록 전 실패 → 임시 파일 정리
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    forget_files(stored["released"])
+
+    if df is not None:
+        # 이미 파싱한 결과로 열 단위 사이드카 생성 → 대시보드와 같은 (헤더 정리된) 형태로 사전 계산
+        path = os.path.join(DATA_DIR, stored["file"])
+        parsed = df
+        job.update("사이드카", 0.7)
+        df, _ = load_frame(path, lambda: parsed, sha256=stats["sha256"])
+
+        job.update("사전 계산", 0.8)
+        materialize_upload(path, df)
+
+    return {
+        "dataset_id": dataset_id,
+        "row_count": stored["stats"].get("row_count"),
+        "deduped": stored["deduped"],
+    }
+
+
+def render_ingest_jobs():
+    """
+    이 세션에서 올린 업로드 작업 진행 상황
+    """
+    job_ids = st.session_state.setdefault("ingest_jobs", [])
+    if not job_ids:
+        return
+
+    queue = get_ingest_queue()
+    remaining = []
+    for job_id in job_ids:
+        job = queue.get(job_id)
+        if job is None:
+            continue
+        if job.status == "done":
+            st.sidebar.success(f"✅ 업로드 완료: {job.name}")
+        elif job.status == "failed":
+            st.sidebar.error(f"❌ 업로드 실패: {job.name} ({job.error})")
+        else:
+            st.sidebar.progress(job.progress, text=f"{job.name}: {job.stage}")
+            remaining.append(job_id)
+
+    st.session_state["ingest_jobs"] = remaining
+    if remaining:
+        st.sidebar.button("🔄 진행 상황 새로고침")
 
 
 def render_dataset_manager():
@@ -26,22 +143,31 @@ def render_dataset_manager():
             if uploaded is None:
                 st.warning("파일을 선택하세요.")
             else:
-                # 🔒 서버 저장용 파일명은 무조건 ASCII (UUID)
+                # 🔒 서버 저장 파일명은 내용 해시 (등록 시 결정) → 임시 파일은 UUID
                 ext = os.path.splitext(uploaded.name)[1].lower()
-                safe_fname = f"{uuid.uuid4().hex}{ext}"
-
-                with open(os.path.join(DATA_DIR, safe_fname), "wb") as f:
-                    f.write(uploaded.getbuffer())
-
-                # 메타데이터에는 사용자 친화적인 이름 유지
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                datasets[ts] = {
-                    "name": name or uploaded.name,  # UI 표시용 (한글 OK)
-                    "file": safe_fname              # 시스템 저장용 (영문만)
-                }
-                save_datasets(datasets)
-
-                st.success("✅ 업로드 완료")
+                tmp_path = os.path.join(DATA_DIR, f"{uuid.uuid4().hex}.upload{ext}")
+                queue = get_ingest_queue()
+
+                if queue.full():
+                    st.warning("처리 대기 중인 업로드가 많습니다. 잠시 후 다시 시도하세요.")
+                else:
+                    with open(tmp_path, "wb") as f:
+                        f.write(uploaded.getbuffer())
+
+                    # 메타데이터에는 사용자 친화적인 이름 유지 (file 은 등록 시 blob 경로)
+                    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    record = {"name": name or uploaded.name}  # UI 표시용 (한글 OK)
+
+                    # 검증 / 정규화 / 사전 계산은 큐에서 처리
+                    try:
+                        job = queue.submit(record["name"], ingest_upload, tmp_path, ext, ts, record)
+                        st.session_state.setdefault("ingest_jobs", []).append(job.id)
+                        st.info("⏳ 업로드 처리 중")
+                    except QueueFull as e:
+                        os.remove(tmp_path)
+                        st.warning(str(e))
+
+    render_ingest_jobs()
 
     # =========================
     # ❌ 데이터 삭제 (기존 기능 유지)
@@ -57,13 +183,11 @@ def render_dataset_manager():
 
         if st.sidebar.checkbox("⚠ 정말 삭제"):
             if st.sidebar.button("삭제 실행"):
-                try:
-                    os.remove(os.path.join(DATA_DIR, datasets[did]["file"]))
-                except FileNotFoundError:
-                    pass
-
-                datasets.pop(did)
-                save_datasets(datasets)
+                # 같은 내용을 쓰는 다른 데이터셋이 없을 때만 파일 삭제
+                record, released = remove_dataset(did)
+                remove_aggregates(DATA_DIR, did)
+                if record is not None:
+                    forget_files(([record["file"]] if released else []) + record["released_partitions"])
 
                 # 삭제는 rerun 안전
                 st.rerun()
@@ -7,10 +7,21 @@ from components.sidebar import (
 )
 from components.item_selector import render_item_selector
 from components.downloader import render_xlsx_download
+from components.debug_panel import render_cache_debug
+
+from utils.catalog import file_sha256
+from utils.analysis import slice_survey_partitions
+from utils.st_cache import (
+    run_stage,
+    standards_registry,
+    load_raw,
+    load_prepared,
+    full_analysis,
+    export_xlsx
+)
 
-from utils.io import read_table
-from utils.preprocess import preprocess_dataframe
-from utils.analysis import analyze_exceedance
+STANDARD_CSV = "example_table2.csv"
+SURVEY_COL = "조사구분"
 
 
 # =========================
@@ -20,6 +31,12 @@ def main():
     st.set_page_config(page_title="📊 Data Hub", layout="wide")
     st.title("📊 Streamlit Data Hub")
 
+    render_dashboard()
+    render_cache_debug()
+
+
+def render_dashboard():
+
     # -------------------------
     # 1. 데이터 관리 / 선택
     # -------------------------
@@ -27,7 +44,11 @@ def main():
     dataset_id = render_dataset_selector(datasets)
 
     data_path = os.path.join("data", datasets[dataset_id]["file"])
-    df_raw = read_table(data_path)
+    stats = datasets[dataset_id]["stats"]
+
+    # 캐시 키: 파일 내용 해시 (이관된 항목에 없으면 직접 계산)
+    sha256 = stats["sha256"] or file_sha256(data_path)
+    df_raw = run_stage("원본 읽기", load_raw, sha256, data_path, stats["encoding"])
 
     st.subheader("📄 원본 데이터")
     st.dataframe(df_raw, use_container_width=True)
@@ -35,7 +56,7 @@ def main():
     # -------------------------
     # 2. 전처리
     # -------------------------
-    df = preprocess_dataframe(df_raw)
+    df = run_stage("전처리", load_prepared, sha256, df_raw)
 
     # -------------------------
     # 3. 분석 항목 선택
@@ -47,37 +68,28 @@ def main():
         return
 
     # -------------------------
-    # 4. 조사구분(A/B) 분리
+    # 4. 조사구분 컬럼 확인
     # -------------------------
-    SURVEY_COL = "조사구분"
-
     if SURVEY_COL not in df.columns:
         st.error(f"❌ 데이터에 '{SURVEY_COL}' 컬럼이 없습니다.")
         return
 
-    df_A = df[df[SURVEY_COL] == "A"]   # 개황조사
-    df_B = df[df[SURVEY_COL] == "B"]   # 상세조사
-
     # -------------------------
-    # 5. 기준 초과 분석
+    # 5. 기준 초과 분석 (A / B / A+B 일괄 집계)
+    #    전체 항목 결과를 (내용 해시, 기준표 버전)으로 캐시 → 항목 선택은 잘라 쓰기만
     # -------------------------
-    results_A = analyze_exceedance(
-        df=df_A,
-        items=selected_items,
-        standard_csv="example_table2.csv"
+    std = standards_registry().get(STANDARD_CSV)
+    full = run_stage(
+        "기준 초과 분석", full_analysis,
+        sha256, STANDARD_CSV, std.version, SURVEY_COL, df, data_path
     )
-
-    results_B = analyze_exceedance(
-        df=df_B,
-        items=selected_items,
-        standard_csv="example_table2.csv"
+    results = run_stage(
+        "항목 선택", slice_survey_partitions, full, selected_items, cached=False
     )
 
-    results_AB = analyze_exceedance(
-        df=df,
-        items=selected_items,
-        standard_csv="example_table2.csv"
-    )
+    results_A = results["A"]     # 개황조사
+    results_B = results["B"]     # 상세조사
+    results_AB = results["A+B"]  # 통합
 
     # -------------------------
     # 6. 결과 표시 (조사단계별 탭)
@@ -101,13 +113,17 @@ def main():
         st.dataframe(results_AB, use_container_width=True)
 
     # -------------------------
-    # 7. XLSX 다운로드 (통합 결과)
+    # 7. XLSX 다운로드 (A / B / A+B / 초과시료)
+    #    버튼을 누를 때만 생성, (내용 해시, 항목, 기준표 버전)으로 캐시
     # -------------------------
     st.markdown("### ⬇️ 결과 다운로드")
 
     render_xlsx_download(
-        A=results_AB,
-        dataset_id=dataset_id
+        build=lambda: export_xlsx(
+            sha256, tuple(selected_items), std.version, STANDARD_CSV, SURVEY_COL, results, df
+        ),
+        dataset_id=dataset_id,
+        empty=results_AB.empty
     )
 
 
@@ -0,0 +1,194 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis import get_site_column, item_values, threshold_table, region_positions
+from utils.materialize import source_version
+from utils.normalize import SURVEY_TYPES, REGIONS
+
+
+# 저장 형식이 바뀌면 올림 → 이전 집계는 처음부터 다시 계산
+AGGREGATES_VERSION = 2
+
+# 데이터 폴더 아래 데이터셋별 누적 집계 (aggregates/<id>.pkl)
+AGGREGATES_DIR = "aggregates"
+
+# 같은 데이터셋 집계를 두 요청/작업이 동시에 갱신하지 않도록
+_UPDATE_LOCK = threading.Lock()
+
+
+# =========================================================
+# 1. 저장 위치 / 파티션 식별
+# =========================================================
+def aggregates_path(data_dir: str, dataset_id: str) -> str:
+    return os.path.join(data_dir, AGGREGATES_DIR, f"{dataset_id}.pkl")
+
+
+def part_key(data_dir: str, path: str) -> tuple:
+    """
+    파티션 식별자 (데이터 폴더 기준 경로, mtime_ns, size)
+    """
+    return (os.path.relpath(path, data_dir),) + source_version(path)
+
+
+def remove_aggregates(data_dir: str, dataset_id: str) -> None:
+    try:
+        os.remove(aggregates_path(data_dir, dataset_id))
+    except FileNotFoundError:
+        pass
+
+
+# =========================================================
+# 2. 누적 집계 (조사구분 × 지역 × 기준종류 × 항목)
+# =========================================================
+class Aggregates:
+    """
+    파티션(조사 회차)을 순서대로 더해 가는 기준 초과 집계
+
+    - sites[(조사, 지역)]: 지점(시료명, 없으면 지점명) 집합, 지점명 결측 행 제외
+    - samples[(조사, 지역, 항목)]: 측정값이 있는 시료 수
+    - top[(조사, 지역, 항목)]: 최고값
+    - exceed_samples / exceed_sites[(조사, 지역, 기준종류, 항목)]: 초과 시료 수 / 초과 지점 집합
+    - 지점 집합을 보관 → 회차가 달라도 같은 지점은 1번만 셈
+    - update 비용은 새 파티션 행 수에만 비례
+    """
+
+    def __init__(self, standards_version: tuple, items: list[str], levels: list[str]):
+        self.format = AGGREGATES_VERSION
+        self.standards_version = standards_version
+        self.items = list(items)
+        self.levels = list(levels)
+        self.parts = []
+        self.present = set()
+        self.sites = {}
+        self.samples = {}
+        self.top = {}
+        self.exceed_samples = {}
+        self.exceed_sites = {}
+
+    def update(self, df: pd.DataFrame, std, part: tuple) -> None:
+        """
+        전처리된 파티션 1개 반영 (_조사 / _지역 / 수치 항목 정규화 완료 상태)
+        """
+        site_col = get_site_column(df)
+        if site_col is not None:
+            # 지점명이 비어 있는 행은 어느 지점에도 속하지 않음 (analyze_regions 와 동일)
+            has_site = df[site_col].notna().to_numpy()
+            sites = df[site_col].astype(str).to_numpy(dtype=object)
+        else:
+            # 지점 컬럼이 없으면 행 자체가 지점 (파티션 간 구분)
+            has_site = np.ones(len(df), dtype=bool)
+            sites = np.array([f"{part[0]}:{i}" for i in range(len(df))], dtype=object)
+
+        values = item_values(df, self.items)
+        measured = ~np.isnan(values)
+
+        # 그룹 안에서는 지역이 같음 → 지역별 기준값 (기준종류 × 항목) 1줄과 비교
+        table = threshold_table(self.items, std)
+        region_pos = dict(zip(REGIONS, region_positions(REGIONS, std)))
+
+        survey = df["_조사"].to_numpy(dtype=object)
+        region = df["_지역"].to_numpy(dtype=object)
+
+        for s in SURVEY_TYPES:
+            in_survey = survey == s
+            for r in REGIONS:
+                mask = in_survey & (region == r)
+                if not mask.any():
+                    continue
+                self._add_group(
+                    s, r, sites[mask], has_site[mask], values[mask], measured[mask], table[region_pos[r]]
+                )
+
+        self.present.update(i for i in self.items if i in df.columns)
+        self.parts.append(part)
+
+    def _add_group(self, s, r, sites, has_site, values, measured, thresholds) -> None:
+        self.sites.setdefault((s, r), set()).update(sites[has_site])
+
+        counts = measured.sum(axis=0)
+        for j in np.flatnonzero(counts):
+            item = self.items[j]
+            self.samples[(s, r, item)] = self.samples.get((s, r, item), 0) + int(counts[j])
+            top = float(np.nanmax(values[:, j]))
+            old = self.top.get((s, r, item))
+            self.top[(s, r, item)] = top if old is None else max(old, top)
+
+        # 기준종류별 (시료 × 항목) 비교 → 초과가 있는 항목만 순회
+        for l, level in enumerate(self.levels):
+            with np.errstate(invalid="ignore"):
+                exceed = values > thresholds[l]
+            hits = exceed.sum(axis=0)
+            for j in np.flatnonzero(hits):
+                key = (s, r, level, self.items[j])
+                self.exceed_samples[key] = self.exceed_samples.get(key, 0) + int(hits[j])
+                self.exceed_sites.setdefault(key, set()).update(sites[exceed[:, j] & has_site])
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def site_count(self, survey: str, region: str) -> int:
+        return len(self.sites.get((survey, region), ()))
+
+    def max_value(self, survey: str, region: str, item: str) -> float | None:
+        return self.top.get((survey, region, item))
+
+    def exceed_site_count(self, survey: str, region: str, level: str, item: str) -> int:
+        return len(self.exceed_sites.get((survey, region, level, item), ()))
+
+
+# =========================================================
+# 3. 저장 / 로딩
+# =========================================================
+def save_aggregates(path: str, agg: Aggregates) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pd.to_pickle(agg, tmp)
+    os.replace(tmp, path)
+
+
+def load_aggregates(path: str, standards_version: tuple, items: list[str], parts: list[tuple]) -> Aggregates | None:
+    """
+    저장된 집계가 현재 기준표 / 항목과 일치하고 파티션 목록의 앞부분일 때만 반환
+    (이후 추가된 파티션은 호출 측에서 update)
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        agg = pd.read_pickle(path)
+    except Exception:
+        return None
+
+    if getattr(agg, "format", None) != AGGREGATES_VERSION:
+        return None
+    if agg.standards_version != standards_version:
+        return None
+    if not set(items) <= set(agg.items):
+        return None
+    if agg.parts != parts[:len(agg.parts)]:
+        return None
+    return agg
+
+
+def update_dataset_aggregates(data_dir: str, dataset_id: str, paths: list[str], std, items: list[str], loader) -> Aggregates:
+    """
+    파티션 순서대로 누적한 집계 (paths: [원본, 추가 회차 ...])
+    저장된 집계 이후 추가된 파티션만 loader(path) 로 전처리해 반영 → 새 행 수에 비례
+    """
+    parts = [part_key(data_dir, p) for p in paths]
+    store = aggregates_path(data_dir, dataset_id)
+
+    with _UPDATE_LOCK:
+        agg = load_aggregates(store, std.version, items, parts)
+        if agg is None:
+            agg = Aggregates(std.version, items, std.levels)
+        if len(agg.parts) == len(parts):
+            return agg
+
+        for path, part in zip(paths[len(agg.parts):], parts[len(agg.parts):]):
+            agg.update(loader(path), std, part)
+        save_aggregates(store, agg)
+    return agg
@@ -1,113 +1,165 @@
+import numpy as np
 import pandas as pd
-import os
+
+from utils.standards import get_standards
+from utils.materialize import save_summary, slice_items
 
 
 # =========================================================
-# 1. 기준표 로딩
+# 1. 기준 초과 판정 (벡터 연산)
 # =========================================================
-def load_standards(filename: str) -> pd.DataFrame:
+def get_site_column(df: pd.DataFrame) -> str | None:
     """
-    기준표 CSV 로딩
-    (utils 폴더 기준)
+    지점 컬럼 자동 결정 (시료명 우선)
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    full_path = os.path.join(base_dir, filename)
+    if "시료명" in df.columns:
+        return "시료명"
+    if "지점명" in df.columns:
+        return "지점명"
+    return None
 
-    if not os.path.exists(full_path):
-        raise FileNotFoundError(f"기준표 파일을 찾을 수 없습니다: {full_path}")
 
-    df = pd.read_csv(full_path, encoding="utf-8")
-    df.columns = df.columns.str.strip()
-    return df
+# 고유값 판정에 bitmap 을 쓸 최대 키 공간 (초과 시 정렬 방식)
+_BITMAP_MAX_KEYS = 64_000_000
 
 
-# =========================================================
-# 2. 기준 lookup 테이블 생성
-# =========================================================
-def build_standard_map(std_df: pd.DataFrame) -> dict:
+def distinct_per_bucket(buckets: np.ndarray, sites: np.ndarray, n_buckets: int, n_sites: int) -> np.ndarray:
     """
-    {(지역, 기준종류, 항목): 기준값} 형태의 lookup dict 생성
+    (bucket, site) 쌍에서 bucket별 고유 site 수
     """
-    std_map = {}
+    keys = buckets.astype(np.int64) * n_sites + sites
+    space = n_buckets * n_sites
 
-    for _, r in std_df.iterrows():
-        region = r.iloc[0]
-        level = r.iloc[1]
+    if space <= _BITMAP_MAX_KEYS:
+        seen = np.zeros(space, dtype=bool)
+        seen[keys] = True
+        unique = np.flatnonzero(seen)
+    else:
+        keys = np.sort(keys)
+        unique = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
 
-        for item in std_df.columns[2:]:
-            val = r[item]
-
-            if pd.isna(val):
-                continue
-
-            try:
-                std_map[(region, level, item)] = float(val)
-            except (ValueError, TypeError):
-                continue
-
-    return std_map
+    return np.bincount(unique // n_sites, minlength=n_buckets)
 
 
 # =========================================================
-# 3. 단일 기준 초과 요약
+# 2. 조사구분 × 기준종류 × 항목 일괄 집계
 # =========================================================
-def summarize_exceed(
-    df: pd.DataFrame,
-    items: list[str],
-    std_map: dict,
-    level: str
-) -> pd.DataFrame:
+def threshold_table(items: list[str], std) -> np.ndarray:
     """
-    항목별 기준 초과 지점수 / 시료수 집계
+    (지역 × 기준종류 × 항목) 기준값 표, 기준 없음 = NaN
+    마지막 지역 행 = 지역 결측 / 기준표에 없는 지역 (전부 NaN)
     """
+    item_pos = np.array([std.items.index(i) if i in std.items else -1 for i in items], dtype=int)
+    table = np.full((len(std.regions) + 1, len(std.levels), len(std.items) + 1), np.nan)
+    table[:-1, :, :-1] = std.values
+    return table[:, :, item_pos]
 
-    rows = []
-
-    # 지점 컬럼 자동 결정
-    site_col = None
-    if "시료명" in df.columns:
-        site_col = "시료명"
-    elif "지점명" in df.columns:
-        site_col = "지점명"
 
-    for item in items:
-        if item not in df.columns:
-            rows.append({"항목": item, "지점수": 0, "시료수": 0})
-            continue
+def region_positions(regions, std) -> np.ndarray:
+    """
+    지역 → threshold_table 지역 위치 (-1 = 마지막 NaN 행)
+    """
+    return pd.Index(std.regions).get_indexer(regions)
 
-        exceed_rows = []
 
-        for _, r in df.iterrows():
-            key = (r["_지역"], level, item)
-            std = std_map.get(key)
+def level_thresholds(table: np.ndarray, region_pos: np.ndarray, level: int) -> np.ndarray:
+    """
+    기준종류 1개의 행별 기준값 (행 × 항목)
+    (행 × 기준종류 × 항목) 전체를 만들지 않도록 기준종류마다 따로 사용
+    """
+    return table[:, level, :][region_pos]
 
-            if std is None:
-                continue
 
-            val = r[item]
-            if pd.notna(val) and val > std:
-                exceed_rows.append(r)
+def item_values(df: pd.DataFrame, items: list[str]) -> np.ndarray:
+    """
+    (행 × 항목) 수치 배열, 없는 항목 = NaN
+    """
+    values = np.full((len(df), len(items)), np.nan)
+    present = [i for i in items if i in df.columns]
+    if present:
+        cols = [j for j, i in enumerate(items) if i in df.columns]
+        values[:, cols] = df[present].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    return values
 
-        if exceed_rows:
-            ex_df = pd.DataFrame(exceed_rows)
 
-            site_cnt = ex_df[site_col].nunique() if site_col else len(ex_df)
-            sample_cnt = len(ex_df)
-        else:
-            site_cnt = 0
-            sample_cnt = 0
+def exceed_counts(
+    df: pd.DataFrame,
+    items: list[str],
+    std,
+    groups: np.ndarray,
+    n_groups: int
+) -> dict:
+    """
+    전체 행을 한 번만 비교해 그룹별 / 전체 초과 시료수·지점수 계산
 
-        rows.append({
-            "항목": item,
-            "지점수": site_cnt,
-            "시료수": sample_cnt
-        })
+    - std: utils.standards.CompiledStandards
+    - groups: 행별 그룹 코드 (0 ~ n_groups-1)
+    - 반환 배열 shape: 그룹별 (n_groups, 기준종류, 항목), 전체 (기준종류, 항목)
+    - 전체 지점수는 그룹별 값을 더하지 않고 (기준, 항목, 지점) 쌍으로 다시 셈
+    """
+    n_levels, n_items = len(std.levels), len(items)
+    shape = (n_levels, n_items)
+
+    table = threshold_table(items, std)
+    region_pos = region_positions(df["_지역"], std)
+    values = item_values(df, items)
+
+    # 기준종류별 (행 × 항목) 비교 → 초과 위치만 (행, 기준×항목) 으로 모음
+    rows, flat = [], []
+    for l in range(n_levels):
+        with np.errstate(invalid="ignore"):
+            r, j = np.nonzero(values > level_thresholds(table, region_pos, l))
+        rows.append(r)
+        flat.append(l * n_items + j)
+    rows = np.concatenate(rows)
+    flat = np.concatenate(flat)
+
+    # 시료수: 초과 (행, 기준×항목) 위치를 그룹별로 카운트
+    width = n_levels * n_items
+    group_samples = np.bincount(
+        groups[rows] * width + flat, minlength=n_groups * width
+    ).reshape(n_groups, width)
+    total_samples = group_samples.sum(axis=0)
+
+    site_col = get_site_column(df)
+    if site_col is None:
+        group_sites, total_sites = group_samples, total_samples
+    else:
+        site_codes, _ = pd.factorize(df[site_col])
+        n_sites = max(int(site_codes.max()) + 1, 1) if len(site_codes) else 1
+
+        sites = site_codes[rows]
+        valid = sites >= 0
+        rows, flat, sites = rows[valid], flat[valid], sites[valid].astype(np.int64)
+
+        total_sites = distinct_per_bucket(flat, sites, width, n_sites)
+        group_sites = distinct_per_bucket(
+            groups[rows] * width + flat, sites, n_groups * width, n_sites
+        ).reshape(n_groups, width)
+
+    return {
+        "group_samples": group_samples.reshape((n_groups,) + shape),
+        "group_sites": group_sites.reshape((n_groups,) + shape),
+        "total_samples": total_samples.reshape(shape),
+        "total_sites": total_sites.reshape(shape),
+    }
+
+
+def _counts_frame(items: list[str], levels: list[str], sites: np.ndarray, samples: np.ndarray) -> pd.DataFrame:
+    """
+    analyze_exceedance 결과 형식: 항목 | {기준}_지점수 | {기준}_시료수 ...
+    """
+    out = {"항목": items}
+    for l, level in enumerate(levels):
+        out[f"{level}_지점수"] = sites[l].astype(int)
+        out[f"{level}_시료수"] = samples[l].astype(int)
 
-    return pd.DataFrame(rows)
+    # 기존 기준별 outer merge 결과와 동일하게 항목명 순 정렬
+    return pd.DataFrame(out).sort_values("항목", ignore_index=True)
 
 
 # =========================================================
-# 4. 기준 초과 분석 (종합 결과 반환)
+# 3. 기준 초과 분석 (종합 결과 반환)
 # =========================================================
 def analyze_exceedance(
     df: pd.DataFrame,
@@ -122,31 +174,132 @@ def analyze_exceedance(
     if df.empty:
         return pd.DataFrame({"항목": items})
 
-    std_df = load_standards(standard_csv)
-    std_map = build_standard_map(std_df)
+    # 기준표는 레지스트리에서 1회 컴파일 (파일 변경 시에만 재로딩)
+    std = get_standards(standard_csv)
 
-    merged_df = None
+    counts = exceed_counts(df, items, std, np.zeros(len(df), dtype=np.int64), 1)
+    return _counts_frame(items, std.levels, counts["total_sites"], counts["total_samples"])
 
-    for level in ["우려40", "우려기준", "대책기준"]:
-        tmp = summarize_exceed(
-            df=df,
-            items=items,
-            std_map=std_map,
-            level=level
-        )
 
-        tmp = tmp.rename(columns={
-            "지점수": f"{level}_지점수",
-            "시료수": f"{level}_시료수"
-        })
+def analyze_survey_partitions(
+    df: pd.DataFrame,
+    items: list[str],
+    standard_csv: str,
+    survey_col: str = "조사구분",
+    partitions: tuple = ("A", "B")
+) -> dict:
+    """
+    조사구분별(A, B) + 통합(A+B) 기준 초과 분석을 한 번의 집계로 반환
+    {"A": DataFrame, "B": DataFrame, "A+B": DataFrame}
+
+    - 통합은 전체 행 기준 (조사구분이 A/B가 아닌 행 포함, 기존 동작과 동일)
+    - 통합 시료수는 그룹 합, 지점수는 (기준, 항목, 지점) 쌍으로 정확히 계산
+    """
+    total_key = "+".join(partitions)
+    std = get_standards(standard_csv)
+
+    # 행별 그룹 코드: 0..P-1 = partitions, P = 기타/결측
+    groups = pd.Index(partitions).get_indexer(df[survey_col]) if len(df) else np.array([], dtype=int)
+    groups = np.where(groups < 0, len(partitions), groups).astype(np.int64)
+    sizes = np.bincount(groups, minlength=len(partitions) + 1)
 
-        if merged_df is None:
-            merged_df = tmp
+    counts = exceed_counts(df, items, std, groups, len(partitions) + 1)
+
+    results = {}
+    for p, name in enumerate(partitions):
+        if sizes[p] == 0:
+            results[name] = pd.DataFrame({"항목": items})
         else:
-            merged_df = merged_df.merge(tmp, on="항목", how="outer")
+            results[name] = _counts_frame(
+                items, std.levels, counts["group_sites"][p], counts["group_samples"][p]
+            )
+
+    if df.empty:
+        results[total_key] = pd.DataFrame({"항목": items})
+    else:
+        results[total_key] = _counts_frame(
+            items, std.levels, counts["total_sites"], counts["total_samples"]
+        )
+    return results
+
+
+def exceed_detail(
+    df: pd.DataFrame,
+    items: list[str],
+    standard_csv: str,
+    survey_col: str = "조사구분"
+) -> pd.DataFrame:
+    """
+    기준을 하나라도 넘은 (시료, 항목) 목록 (엑셀 상세 시트)
+    초과기준: 넘은 기준 중 가장 높은 기준 / 기준별 값은 컬럼으로 표시
+    """
+    std = get_standards(standard_csv)
+    items = list(dict.fromkeys(items))
+
+    table = threshold_table(items, std)
+    region_pos = region_positions(df["_지역"], std)
+    values = item_values(df, items)
+
+    # 기준종류 순서대로 비교 → 마지막으로 넘은 기준 = 가장 높은 기준
+    top = np.full(values.shape, -1, dtype=np.int8)
+    for l in range(len(std.levels)):
+        with np.errstate(invalid="ignore"):
+            top[values > level_thresholds(table, region_pos, l)] = l
+
+    rows, cols = np.nonzero(top >= 0)
+    top = top[rows, cols]
+
+    out = {}
+    for c in (survey_col, "지점명", "시료명"):
+        if c in df.columns:
+            out[c] = df[c].to_numpy()[rows]
+    out["지역"] = df["_지역"].to_numpy()[rows]
+    out["항목"] = np.array(items, dtype=object)[cols]
+    out["측정값"] = values[rows, cols]
+    out["초과기준"] = np.array(std.levels, dtype=object)[top]
+    for l, level in enumerate(std.levels):
+        out[level] = table[region_pos[rows], l, cols]
+
+    return pd.DataFrame(out)
 
-    # NaN → 0
-    count_cols = [c for c in merged_df.columns if c != "항목"]
-    merged_df[count_cols] = merged_df[count_cols].fillna(0).astype(int)
 
-    return merged_df
+# =========================================================
+# 4. 업로드 시점 사전 계산 결과
+# =========================================================
+def materialize_survey_partitions(
+    df: pd.DataFrame,
+    data_path: str,
+    items: list[str],
+    standard_csv: str,
+    survey_col: str = "조사구분"
+) -> None:
+    """
+    전체 항목 A / B / A+B 결과를 데이터 파일 옆에 저장
+    (df 는 preprocess_dataframe 결과)
+    """
+    std = get_standards(standard_csv)
+    items = summary_items(items, std)
+
+    results = analyze_survey_partitions(df, items, standard_csv, survey_col=survey_col)
+    save_summary(data_path, std.version, items, results)
+
+
+def summary_items(items: list[str], std) -> list[str]:
+    """
+    전체 항목 결과에 포함할 항목 (요청 항목 + 기준표 항목, 순서 유지)
+    """
+    return list(dict.fromkeys(list(items) + std.items))
+
+
+def slice_survey_partitions(results: dict, items: list[str]) -> dict:
+    """
+    전체 항목 결과에서 선택 항목만 잘라 analyze_survey_partitions 와 같은 형태로 반환
+    """
+    sliced = {}
+    for name, frame in results.items():
+        if list(frame.columns) == ["항목"]:
+            # 해당 조사구분 행이 없던 경우
+            sliced[name] = pd.DataFrame({"항목": items})
+        else:
+            sliced[name] = slice_items(frame, items).sort_values("항목", ignore_index=True)
+    return sliced
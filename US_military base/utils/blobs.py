@@ -0,0 +1,30 @@
+import os
+import re
+
+
+# 데이터 폴더 아래 내용 주소 저장소 (blobs/ab/abcdef....csv)
+BLOB_DIR = "blobs"
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+def blob_relpath(sha256: str, ext: str) -> str:
+    """
+    내용 해시 → 데이터 폴더 기준 상대 경로
+    """
+    return os.path.join(BLOB_DIR, sha256[:2], f"{sha256}{ext.lower()}")
+
+
+def blob_digest(path: str) -> str | None:
+    """
+    blob 경로면 내용 해시, 아니면 None
+    (blob 은 내용이 바뀌지 않으므로 해시만으로 캐시 키가 됨)
+    """
+    head, name = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(name)[0]
+    head, shard = os.path.split(head)
+    if os.path.basename(head) != BLOB_DIR:
+        return None
+    if not _DIGEST.fullmatch(stem) or shard != stem[:2]:
+        return None
+    return stem
@@ -0,0 +1,175 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.blobs import blob_digest
+
+
+# =========================================================
+# 1. 메모리 사용량 추정
+# =========================================================
+def frame_nbytes(value) -> int:
+    """
+    캐시 항목의 대략적인 메모리 크기(byte)
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(frame_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(frame_nbytes(v) for v in value.values())
+    return 0
+
+
+# =========================================================
+# 2. 파일 기반 LRU 캐시
+# =========================================================
+class FrameCache:
+    """
+    파싱/전처리가 끝난 DataFrame을 프로세스 단위로 보관하는 LRU 캐시
+
+    - 키: (단계, 절대경로, mtime_ns, size, version) → 파일이 바뀌면 자동으로 새 키
+    - blob(내용 주소) 파일은 경로 대신 내용 해시로 키 → 같은 내용은 한 번만 적재
+    - version: 결과에 영향을 주는 외부 입력(기준표 등)의 버전
+    - max_bytes 를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+    - 반환된 DataFrame은 여러 요청이 공유하므로 읽기 전용으로 다룰 것
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (value, nbytes)
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -----------------------------
+    # 키
+    # -----------------------------
+    @staticmethod
+    def source_id(path: str) -> str:
+        digest = blob_digest(path)
+        return f"sha256:{digest}" if digest else os.path.abspath(path)
+
+    @staticmethod
+    def file_key(path: str, stage: str = "raw", version=None) -> tuple:
+        st = os.stat(path)
+        if blob_digest(path):
+            # 내용이 곧 이름 → mtime/size 불필요
+            return (stage, FrameCache.source_id(path), None, None, version)
+        return (stage, os.path.abspath(path), st.st_mtime_ns, st.st_size, version)
+
+    # -----------------------------
+    # 조회 / 적재
+    # -----------------------------
+    def get_or_load(self, path: str, loader, stage: str = "raw", version=None):
+        """
+        캐시에 있으면 그대로 반환, 없으면 loader(path) 결과를 저장 후 반환
+        """
+        try:
+            key = self.file_key(path, stage, version)
+        except FileNotFoundError:
+            # 삭제된 파일 → 남아 있는 항목 정리
+            self.invalidate(path)
+            raise
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = loader(path)
+        self.put(key, value)
+        return value
+
+    def peek(self, path: str, stage: str = "raw", version=None):
+        """
+        캐시에 있으면 반환, 없으면 None (적재하지 않음)
+        """
+        try:
+            key = self.file_key(path, stage, version)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key: tuple, value) -> None:
+        nbytes = frame_nbytes(value)
+
+        with self._lock:
+            # 같은 파일·단계의 이전 버전(mtime/size/version 불일치)은 더 이상 쓸 일이 없음
+            stale = [
+                k for k in self._entries
+                if k[:2] == key[:2] and k != key
+            ]
+            for k in stale:
+                self._drop(k)
+
+            # 예산보다 큰 항목은 캐시하지 않음
+            if nbytes > self.max_bytes:
+                return
+
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    # -----------------------------
+    # 무효화
+    # -----------------------------
+    def invalidate(self, path: str) -> int:
+        """
+        해당 파일에서 만들어진 모든 단계의 항목 제거 (업로드/삭제 시 호출)
+        """
+        source = self.source_id(path)
+        with self._lock:
+            keys = [k for k in self._entries if k[1] == source]
+            for k in keys:
+                self._drop(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key: tuple) -> None:
+        _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    # -----------------------------
+    # 통계
+    # -----------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,495 @@
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.blobs import blob_relpath
+from utils.encoding import EncodingProbe, detect_encoding, read_with_fallback
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id          TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    file        TEXT NOT NULL,
+    meta        TEXT NOT NULL DEFAULT '{}',
+    row_count   INTEGER,
+    columns     TEXT,
+    sha256      TEXT,
+    size        INTEGER,
+    encoding    TEXT,
+    created_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_datasets_name ON datasets(name);
+CREATE INDEX IF NOT EXISTS idx_datasets_file ON datasets(file);
+CREATE INDEX IF NOT EXISTS idx_datasets_sha256 ON datasets(sha256);
+CREATE TABLE IF NOT EXISTS partitions (
+    dataset_id  TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    file        TEXT NOT NULL,
+    sha256      TEXT,
+    row_count   INTEGER,
+    encoding    TEXT,
+    created_at  TEXT NOT NULL,
+    PRIMARY KEY (dataset_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_partitions_file ON partitions(file);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# name / file 외의 항목은 meta(JSON)로 저장
+_CORE_FIELDS = ("name", "file")
+
+# 이전 스키마 DB 에 추가할 컬럼
+_ADDED_COLUMNS = {"encoding": "TEXT"}
+
+
+# =========================================================
+# 1. 데이터셋 통계
+# =========================================================
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def frame_stats(df) -> dict:
+    return {
+        "row_count": len(df),
+        "columns": [str(c) for c in df.columns],
+    }
+
+
+def dataset_stats(path: str, df=None, chunk_size: int = 1024 * 1024) -> dict:
+    """
+    카탈로그에 함께 저장하는 통계 (df 가 있으면 행/컬럼 수 포함)
+    해시 계산과 같은 패스에서 전체 파일 기준 인코딩도 판별 (CSV 만)
+    """
+    h = hashlib.sha256()
+    probe = None if path.endswith(".xlsx") else EncodingProbe()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+            if probe:
+                probe.feed(chunk)
+
+    stats = {
+        "size": os.path.getsize(path),
+        "sha256": h.hexdigest(),
+        "encoding": probe.result() if probe else None,
+    }
+    if df is not None:
+        stats.update(frame_stats(df))
+    return stats
+
+
+# =========================================================
+# 2. SQLite 카탈로그
+# =========================================================
+class Catalog:
+    """
+    datasets.json 을 대체하는 데이터셋 목록 (SQLite, WAL 모드)
+
+    - 등록/삭제는 행 단위 트랜잭션 → 파일 전체 재작성 없음
+    - 요청마다 짧은 연결을 열어 여러 워커 프로세스가 같은 DB 를 공유
+    - 기존 datasets.json 은 최초 1회 자동 이관 (원본 파일은 그대로 둠)
+    - data_dir 를 주면 이관 시 파일 크기/해시도 채움
+    - 파일(blob)은 내용 해시로 저장, 참조하는 데이터셋이 없어질 때 삭제 (add_blob / release)
+    - 추가 조사 회차는 데이터셋의 파티션으로 등록 (add_partition, 원본 파일 = 0번)
+    """
+
+    def __init__(self, db_path: str, legacy_json: str | None = None, data_dir: str | None = None):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(datasets)")}
+            for column, kind in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE datasets ADD COLUMN {column} {kind}")
+        if legacy_json:
+            self._migrate_json(legacy_json, data_dir)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # -----------------------------
+    # 이관
+    # -----------------------------
+    def _migrate_json(self, legacy_json: str, data_dir: str | None) -> None:
+        if not os.path.exists(legacy_json):
+            return
+
+        with self._connect() as conn:
+            # 동시에 시작한 다른 프로세스와 이관이 겹치지 않도록 쓰기 잠금
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'migrated_json'"
+            ).fetchone()
+            if done:
+                return
+
+            with open(legacy_json, encoding="utf-8") as f:
+                datasets = json.load(f)
+
+            files_by_hash = {}
+            for dataset_id, record in datasets.items():
+                stats = {}
+                path = os.path.join(data_dir, record["file"]) if data_dir else None
+                if path and os.path.exists(path):
+                    stats = dataset_stats(path)
+
+                    # 내용이 같은 파일은 처음 등록된 파일을 함께 참조
+                    # (기존 파일은 지우지 않고 카탈로그 참조만 합침)
+                    first = files_by_hash.setdefault(stats["sha256"], record["file"])
+                    record = {**record, "file": first}
+
+                conn.execute(
+                    "INSERT OR IGNORE INTO datasets "
+                    "(id, name, file, meta, sha256, size, encoding, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._row_values(dataset_id, record) + (
+                        stats.get("sha256"), stats.get("size"), stats.get("encoding"),
+                        datetime.now().isoformat()
+                    )
+                )
+            conn.execute(
+                "INSERT INTO catalog_meta (key, value) VALUES ('migrated_json', ?)",
+                (legacy_json,)
+            )
+
+    # -----------------------------
+    # 변환
+    # -----------------------------
+    @staticmethod
+    def _row_values(dataset_id: str, record: dict) -> tuple:
+        meta = {k: v for k, v in record.items() if k not in _CORE_FIELDS}
+        return (
+            dataset_id,
+            record.get("name") or dataset_id,
+            record["file"],
+            json.dumps(meta, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> dict:
+        """
+        기존 datasets.json 항목과 같은 모양 + stats
+        """
+        record = json.loads(row["meta"] or "{}")
+        record["name"] = row["name"]
+        record["file"] = row["file"]
+        record["stats"] = {
+            "row_count": row["row_count"],
+            "columns": json.loads(row["columns"]) if row["columns"] else None,
+            "sha256": row["sha256"],
+            "size": row["size"],
+            "encoding": row["encoding"],
+        }
+        return record
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def all(self) -> dict:
+        """
+        {id: record} (등록 순서)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM datasets ORDER BY created_at, rowid"
+            ).fetchall()
+        return {row["id"]: self._to_record(row) for row in rows}
+
+    def get(self, dataset_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def find_by_name(self, name: str) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM datasets WHERE name = ? ORDER BY created_at", (name,)
+            ).fetchall()
+        return {row["id"]: self._to_record(row) for row in rows}
+
+    def encoding_of(self, file: str) -> str | None:
+        """
+        업로드 / 첫 읽기 때 기록한 인코딩 (없으면 None)
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT encoding FROM datasets WHERE file = ? AND encoding IS NOT NULL "
+                "UNION ALL "
+                "SELECT encoding FROM partitions WHERE file = ? AND encoding IS NOT NULL "
+                "LIMIT 1", (file, file)
+            ).fetchone()
+        return row["encoding"] if row else None
+
+    def set_encoding(self, file: str, encoding: str) -> None:
+        """
+        판별 / 보정한 인코딩 기록 (같은 파일을 쓰는 데이터셋 / 파티션 모두)
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE datasets SET encoding = ? WHERE file = ?", (encoding, file))
+            conn.execute("UPDATE partitions SET encoding = ? WHERE file = ?", (encoding, file))
+
+    def read_encoded(self, file: str, read, encoding: str | None = None):
+        """
+        read(encoding) 를 기록된 인코딩으로 실행 (기록이 없으면 앞부분 표본으로 판별)
+        판별 결과 / 디코딩 실패 후 다음 후보로 읽은 결과는 기록 → 이후 판별 / 재시도 없음
+        """
+        recorded = encoding or self.encoding_of(file)
+        if recorded is None:
+            path = os.path.join(self.data_dir, file) if self.data_dir else file
+            encoding = detect_encoding(path)
+        else:
+            encoding = recorded
+        result, used = read_with_fallback(read, encoding)
+        if used != recorded:
+            self.set_encoding(file, used)
+        return result
+
+    def partition_files(self, dataset_id: str) -> list[str]:
+        """
+        [원본 파일, 추가 파티션 ...] (추가 순서), 없는 데이터셋이면 빈 목록
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT file FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+            if row is None:
+                return []
+            parts = conn.execute(
+                "SELECT file FROM partitions WHERE dataset_id = ? ORDER BY seq", (dataset_id,)
+            ).fetchall()
+        return [row["file"]] + [p["file"] for p in parts]
+
+    def __contains__(self, dataset_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone() is not None
+
+    # -----------------------------
+    # 등록 / 삭제
+    # -----------------------------
+    def upsert(self, dataset_id: str, record: dict, stats: dict | None = None) -> None:
+        """
+        같은 id 가 있으면 교체 (기존 dict 대입과 동일한 동작)
+        """
+        with self._connect() as conn:
+            self._insert(conn, dataset_id, record, stats or {})
+
+    def _insert(self, conn, dataset_id: str, record: dict, stats: dict) -> None:
+        columns = stats.get("columns")
+        conn.execute(
+            "INSERT OR REPLACE INTO datasets "
+            "(id, name, file, meta, row_count, columns, sha256, size, encoding, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._row_values(dataset_id, record) + (
+                stats.get("row_count"),
+                json.dumps(columns, ensure_ascii=False) if columns is not None else None,
+                stats.get("sha256"),
+                stats.get("size"),
+                stats.get("encoding"),
+                datetime.now().isoformat(),
+            )
+        )
+
+    def release(self, dataset_id: str) -> tuple[dict | None, bool]:
+        """
+        데이터셋 삭제 + 참조가 0 이 된 파일 삭제
+        반환: (삭제된 항목 또는 None, 파일 삭제 여부)
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            conn.execute("DELETE FROM datasets WHERE id = ?", (dataset_id,))
+            released = self._release_file(conn, row["file"])
+            parts = self._drop_partitions(conn, dataset_id)
+
+        record = self._to_record(row)
+        record["released_partitions"] = parts
+        return record, released
+
+    # -----------------------------
+    # 내용 주소 저장 (blob)
+    # -----------------------------
+    def find_blob(self, sha256: str) -> dict | None:
+        """
+        같은 내용을 이미 참조하는 데이터셋 (파일이 남아 있는 경우만)
+        """
+        with self._connect() as conn:
+            return self._find_blob(conn, sha256)
+
+    def known_blob(self, sha256: str) -> bool:
+        """
+        같은 내용이 있고 행 수 / 컬럼 통계까지 기록돼 있으면 True → 검증 / 파싱 생략 가능
+        (datasets.json 에서 이관된 항목은 해시 / 크기 / 인코딩만 있음 → False)
+        """
+        blob = self.find_blob(sha256)
+        return blob is not None and all(
+            blob["stats"].get(k) is not None for k in ("row_count", "columns")
+        )
+
+    def _find_blob(self, conn, sha256: str) -> dict | None:
+        rows = conn.execute(
+            "SELECT * FROM datasets WHERE sha256 = ? ORDER BY created_at", (sha256,)
+        ).fetchall()
+        for row in rows:
+            if os.path.exists(os.path.join(self.data_dir, row["file"])):
+                return self._to_record(row)
+        return None
+
+    def _refs(self, conn, file: str) -> int:
+        return conn.execute(
+            "SELECT (SELECT COUNT(*) FROM datasets WHERE file = ?) "
+            "+ (SELECT COUNT(*) FROM partitions WHERE file = ?)", (file, file)
+        ).fetchone()[0]
+
+    def _release_file(self, conn, file: str) -> bool:
+        """
+        참조 수가 0 이면 파일 삭제 (쓰기 트랜잭션 안에서 호출)
+        """
+        if self.data_dir is None or self._refs(conn, file) > 0:
+            return False
+        try:
+            os.remove(os.path.join(self.data_dir, file))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def add_blob(self, dataset_id: str, record: dict, stats: dict, src_path: str, ext: str) -> dict:
+        """
+        src_path(임시 파일)를 내용 해시 위치로 옮기고 데이터셋 등록
+        - 같은 내용이 이미 있으면 임시 파일만 지우고 기존 파일 참조 (+ 기존 통계 재사용)
+        - 같은 id 재등록으로 참조가 0 이 된 이전 파일은 삭제
+        반환: {"file", "stats", "deduped", "released": [이전 파일]}
+        """
+        with self._connect() as conn:
+            # 삭제(release)와 겹치지 않도록 쓰기 잠금 안에서 파일 이동 + 등록
+            conn.execute("BEGIN IMMEDIATE")
+
+            existing = self._find_blob(conn, stats["sha256"])
+            if existing:
+                os.remove(src_path)
+                file = existing["file"]
+                known = {k: v for k, v in existing["stats"].items() if v is not None}
+                stats = {**known, **{k: v for k, v in stats.items() if v is not None}}
+                # 통계 없이 등록된 같은 내용 항목 (이관 등) 도 채움
+                if stats.get("row_count") is not None and stats.get("columns") is not None:
+                    conn.execute(
+                        "UPDATE datasets SET row_count = ?, columns = ? "
+                        "WHERE sha256 = ? AND (row_count IS NULL OR columns IS NULL)",
+                        (stats["row_count"], json.dumps(stats["columns"], ensure_ascii=False),
+                         stats["sha256"])
+                    )
+            else:
+                file = blob_relpath(stats["sha256"], ext)
+                target = os.path.join(self.data_dir, file)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(src_path, target)
+
+            old = conn.execute(
+                "SELECT file FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+            self._insert(conn, dataset_id, {**record, "file": file}, stats)
+
+            # 같은 id 재등록 → 이전 회차 파티션도 새 파일로 대체됨
+            released = self._drop_partitions(conn, dataset_id)
+            if old and old["file"] != file and self._release_file(conn, old["file"]):
+                released.append(old["file"])
+
+        return {"file": file, "stats": stats, "deduped": existing is not None, "released": released}
+
+    # -----------------------------
+    # 조사 회차 파티션
+    # -----------------------------
+    def add_partition(self, dataset_id: str, stats: dict, src_path: str, ext: str) -> dict | None:
+        """
+        src_path(임시 파일)를 내용 해시 위치로 옮기고 데이터셋의 다음 파티션으로 등록
+        반환: {"file", "seq", "duplicate"} / 데이터셋이 없으면 None (임시 파일 삭제)
+        같은 내용이 이미 이 데이터셋에 있으면 등록하지 않음 (duplicate=True)
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            base = conn.execute(
+                "SELECT file, sha256 FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+            if base is None:
+                os.remove(src_path)
+                return None
+
+            file = blob_relpath(stats["sha256"], ext)
+            known = conn.execute(
+                "SELECT 1 FROM partitions WHERE dataset_id = ? AND file = ?", (dataset_id, file)
+            ).fetchone()
+            if known or base["sha256"] == stats["sha256"]:
+                os.remove(src_path)
+                return {"file": file, "seq": None, "duplicate": True}
+
+            target = os.path.join(self.data_dir, file)
+            if os.path.exists(target):
+                os.remove(src_path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(src_path, target)
+
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM partitions WHERE dataset_id = ?", (dataset_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO partitions (dataset_id, seq, file, sha256, row_count, encoding, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (dataset_id, seq, file, stats["sha256"], stats.get("row_count"),
+                 stats.get("encoding"), datetime.now().isoformat())
+            )
+        return {"file": file, "seq": seq, "duplicate": False}
+
+    def partition_stats(self) -> dict:
+        """
+        {데이터셋 id: {"partitions": 추가 회차 수, "row_count": 추가 행 수}} (회차가 있는 것만)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT dataset_id, COUNT(*) AS n, SUM(row_count) AS rows "
+                "FROM partitions GROUP BY dataset_id"
+            ).fetchall()
+        return {
+            row["dataset_id"]: {"partitions": row["n"], "row_count": row["rows"] or 0}
+            for row in rows
+        }
+
+    def _drop_partitions(self, conn, dataset_id: str) -> list[str]:
+        """
+        데이터셋의 파티션 삭제 → 참조가 0 이 되어 지운 파일 목록
+        """
+        files = [
+            row["file"] for row in conn.execute(
+                "SELECT file FROM partitions WHERE dataset_id = ?", (dataset_id,)
+            )
+        ]
+        conn.execute("DELETE FROM partitions WHERE dataset_id = ?", (dataset_id,))
+        return [f for f in dict.fromkeys(files) if self._release_file(conn, f)]
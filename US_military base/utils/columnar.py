@@ -0,0 +1,287 @@
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from utils.blobs import blob_digest
+from utils.catalog import file_sha256
+from utils.normalize import normalize_header, parse_numeric, FLAG_UNPARSEABLE
+
+# 선택 의존성: pyarrow 가 없으면 사이드카 없이 원본 파일을 직접 읽음
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+
+# 데이터 파일 옆 열 단위 사본 (Arrow IPC 파일)
+SIDECAR_SUFFIX = ".arrow"
+
+# 형식이 바뀌면 올림 → 이전 사이드카는 자동 재생성
+# (2: 수치로 변환한 컬럼의 원본 문자열 보관)
+SIDECAR_VERSION = 2
+
+# 수치 항목 컬럼의 해석 플래그 (utils.normalize.FLAG_*) / 원본 문자열을 담는 짝 컬럼
+FLAGS_SUFFIX = "#flags"
+TEXT_SUFFIX = "#text"
+
+# 수치 컬럼으로 저장할 최소 해석 비율 (값이 있는 칸 기준) / 먼저 확인할 고유값 수
+NUMERIC_MIN_RATIO = 0.95
+NUMERIC_PROBE_VALUES = 1000
+
+_META_KEY = b"datahub"
+
+
+# =========================================================
+# 1. 위치 / 사용 가능 여부
+# =========================================================
+def available() -> bool:
+    return pa is not None
+
+
+def sidecar_path(data_path: str) -> str:
+    return f"{data_path}{SIDECAR_SUFFIX}"
+
+
+def remove_sidecar(data_path: str) -> None:
+    try:
+        os.remove(sidecar_path(data_path))
+    except FileNotFoundError:
+        pass
+
+
+def _source(data_path: str) -> dict:
+    st = os.stat(data_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+# =========================================================
+# 2. 생성 (헤더 정리 + 수치 항목 해석)
+# =========================================================
+def _numeric_ratio(s: pd.Series, flags: np.ndarray) -> float:
+    """
+    값이 있는 칸 중 수치(또는 검출한계 / 빈 값 표기)로 읽히는 비율
+    """
+    filled = s.notna().to_numpy()
+    n = int(filled.sum())
+    if not n:
+        return 0.0
+    return int(np.count_nonzero(filled & ((flags & FLAG_UNPARSEABLE) == 0))) / n
+
+
+def _text(s: pd.Series) -> np.ndarray:
+    """
+    문자열 컬럼 (혼합 타입 엑셀 값도 문자열로), 결측은 유지
+    """
+    return s.where(s.isna(), s.astype(str)).to_numpy(dtype=object)
+
+
+def _typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    헤더 정리 / 문자열 컬럼 중 수치로 읽히는 컬럼은 (값, 플래그, 원본 문자열) 세 컬럼으로 변환
+    값: utils.normalize.parse_numeric 결과 (검출한계 미만은 검출한계 값 그대로 보관)
+    원본 문자열: 원본 보기용 ("<0.01", "ND", "1,191" 그대로)
+    """
+    out = {}
+    for c in df.columns:
+        name = normalize_header(c)
+        s = df[c]
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s):
+            out[name] = s.to_numpy()
+            continue
+
+        # 앞부분 고유값으로 먼저 판단 (시료명 같은 문자열 컬럼 전체를 해석하지 않도록)
+        head = pd.Series(pd.unique(s.dropna())[:NUMERIC_PROBE_VALUES], dtype=object)
+        if len(head) and _numeric_ratio(head, parse_numeric(head)[1]) >= NUMERIC_MIN_RATIO:
+            values, flags = parse_numeric(s)
+            if _numeric_ratio(s, flags) >= NUMERIC_MIN_RATIO:
+                out[name] = values
+                out[name + FLAGS_SUFFIX] = flags
+                out[name + TEXT_SUFFIX] = _text(s)
+                continue
+
+        out[name] = _text(s)
+    return pd.DataFrame(out, index=pd.RangeIndex(len(df)))
+
+
+def write_sidecar(data_path: str, df_raw: pd.DataFrame, sha256: str | None = None) -> str | None:
+    """
+    원본을 파싱한 DataFrame → 사이드카 기록 (원자적 교체)
+    pyarrow 가 없거나 Arrow 로 표현할 수 없는 컬럼이면 None
+    """
+    if pa is None:
+        return None
+
+    meta = {
+        "version": SIDECAR_VERSION,
+        "sha256": sha256 or blob_digest(data_path) or file_sha256(data_path),
+        "source": _source(data_path),
+    }
+    try:
+        table = pa.Table.from_pandas(_typed_frame(df_raw), preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    table = table.replace_schema_metadata({_META_KEY: json.dumps(meta).encode("utf-8")})
+
+    path = sidecar_path(data_path)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with pa.OSFile(tmp, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+# =========================================================
+# 3. 읽기 (memory-map + 컬럼 선택)
+# =========================================================
+def _is_fresh(meta: dict, data_path: str) -> bool:
+    """
+    원본 내용 해시가 기록과 같을 때만 유효
+    (blob 은 이름이 곧 해시, 일반 파일은 mtime/size 가 바뀐 경우에만 해시 재계산)
+    """
+    if meta.get("version") != SIDECAR_VERSION:
+        return False
+    digest = blob_digest(data_path)
+    if digest is not None:
+        return digest == meta.get("sha256")
+    if meta.get("source") == _source(data_path):
+        return True
+    return file_sha256(data_path) == meta.get("sha256")
+
+
+def open_sidecar(data_path: str):
+    """
+    유효한 사이드카 → memory-map 된 pyarrow.Table (데이터 복사 없음), 없으면 None
+    """
+    if pa is None:
+        return None
+    path = sidecar_path(data_path)
+    try:
+        reader = ipc.open_file(pa.memory_map(path, "r"))
+        meta = json.loads((reader.schema.metadata or {}).get(_META_KEY, b"{}"))
+        if not _is_fresh(meta, data_path):
+            return None
+        return reader.read_all()
+    except (FileNotFoundError, pa.ArrowException, ValueError):
+        return None
+
+
+def data_columns(table) -> list[str]:
+    return [
+        c for c in table.column_names
+        if not c.endswith(FLAGS_SUFFIX) and not c.endswith(TEXT_SUFFIX)
+    ]
+
+
+def _stored_columns(table, columns: list[str] | None, typed: bool) -> dict:
+    """
+    {컬럼: 사이드카에서 읽을 컬럼} (없는 컬럼은 제외)
+    typed=False: 수치로 변환한 컬럼은 원본 문자열 컬럼
+    """
+    names = set(table.column_names)
+    columns = [c for c in (columns if columns is not None else data_columns(table)) if c in names]
+    if typed:
+        return {c: c for c in columns}
+    return {c: c + TEXT_SUFFIX if c + TEXT_SUFFIX in names else c for c in columns}
+
+
+def table_frame(table, columns: list[str] | None = None, typed: bool = True) -> pd.DataFrame:
+    """
+    필요한 컬럼만 pandas 로 변환 (없는 컬럼은 무시)
+    typed=True (분석): 수치 컬럼의 검출한계 미만 / ND / 해석 불가 칸은 NaN
+                       (normalize_numeric_series 와 같은 값)
+    typed=False (원본 보기): 수치로 변환한 컬럼도 원본 문자열 그대로
+    """
+    stored = _stored_columns(table, columns, typed)
+
+    df = table.select(list(stored.values())).to_pandas()
+    df.columns = list(stored)
+    if typed:
+        names = set(table.column_names)
+        for c in stored:
+            if c + FLAGS_SUFFIX in names:
+                flags = table.column(c + FLAGS_SUFFIX).to_numpy()
+                if flags.any():
+                    df[c] = df[c].where(flags == 0)
+    return df
+
+
+def table_flags(table, columns: list[str]) -> dict:
+    """
+    {컬럼: 플래그 배열} (수치 컬럼으로 저장된 것만)
+    """
+    names = set(table.column_names)
+    return {
+        c: table.column(c + FLAGS_SUFFIX).to_numpy()
+        for c in columns if c + FLAGS_SUFFIX in names
+    }
+
+
+# =========================================================
+# 4. 헤더 행 기준 컬럼 선택 (사이드카가 없을 때)
+# =========================================================
+def header_names(path: str, encoding: str | None = None) -> dict:
+    """
+    {정리된 헤더: 원본 헤더} (헤더 행만 읽음, 정리 후 같은 이름이면 앞 컬럼)
+    """
+    names = {}
+    for c in pd.read_csv(path, encoding=encoding, nrows=0).columns:
+        names.setdefault(normalize_header(c), c)
+    return names
+
+
+def read_csv_columns(path: str, encoding: str | None, columns: list[str]) -> pd.DataFrame:
+    """
+    정리된 이름 기준으로 필요한 컬럼만 파싱 (없는 컬럼은 무시)
+    dtype 은 모두 문자열 → 타입 추론 없음, 수치 해석은 parse_numeric 에서
+    """
+    names = header_names(path, encoding)
+    columns = [c for c in dict.fromkeys(columns) if c in names]
+    use = [names[c] for c in columns]
+
+    df = pd.read_csv(path, encoding=encoding, usecols=use, dtype=dict.fromkeys(use, str))
+    df.columns = [normalize_header(c) for c in df.columns]
+    return df[columns]
+
+
+# =========================================================
+# 5. 읽기 경로 공용 진입점
+# =========================================================
+def load_frame(
+    data_path: str,
+    read_raw,
+    columns: list[str] | None = None,
+    sha256: str | None = None,
+    read_columns=None,
+    typed: bool = False,
+):
+    """
+    (DataFrame, 디스크에서 읽은 바이트 수)
+    - 유효한 사이드카: memory-map 으로 columns 만 변환
+      (typed=False: 원본 보기와 같은 값, typed=True: 수치 항목은 해석된 값 → table_frame)
+    - 없거나 원본이 바뀜: read_raw() 로 원본 파싱 → 사이드카 기록 → 사이드카에서 다시 읽기
+    - pyarrow 없음: read_columns(columns) 가 있으면 필요한 컬럼만 파싱
+    - 그 외 기록 실패: read_raw() 결과 그대로 (헤더 정리 / 컬럼 선택은 호출 측)
+    """
+    table = open_sidecar(data_path)
+    if table is None:
+        if pa is None and columns is not None and read_columns is not None:
+            return read_columns(columns), os.path.getsize(data_path)
+        df = read_raw()
+        if write_sidecar(data_path, df, sha256) is None:
+            return df, os.path.getsize(data_path)
+        table = open_sidecar(data_path)
+        if table is None:
+            return df, os.path.getsize(data_path)
+
+    stored = _stored_columns(table, columns, typed)
+    df = table_frame(table, columns, typed)
+    return df, sum(table.column(c).nbytes for c in stored.values())
@@ -0,0 +1,102 @@
+import codecs
+
+
+# 판별 시 읽는 앞부분 크기 (카탈로그에 기록이 없는 파일만, 결과는 기록해 다시 판별하지 않음)
+SAMPLE_BYTES = 64 * 1024
+
+# 후보 순서: UTF-8 → CP949 (제공기관 엑셀 저장 기본값) → latin-1 (항상 성공)
+CANDIDATES = ("utf-8", "cp949")
+FALLBACK = "latin-1"
+
+
+# =========================================================
+# 1. 점진 판별기
+# =========================================================
+class EncodingProbe:
+    """
+    바이트 조각을 차례로 넣으면서 후보 인코딩 유효성을 동시에 확인
+    (파일을 한 번만 읽는 경로에서 해시 계산 등과 함께 사용)
+    """
+
+    def __init__(self):
+        self._decoders = {
+            enc: codecs.getincrementaldecoder(enc)() for enc in CANDIDATES
+        }
+        self._head = b""
+
+    def feed(self, chunk: bytes) -> None:
+        if len(self._head) < 3:
+            self._head += chunk[:3 - len(self._head)]
+        for enc, decoder in list(self._decoders.items()):
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                del self._decoders[enc]
+
+    @property
+    def settled(self) -> bool:
+        """
+        더 읽어도 결과가 바뀌지 않음 (BOM 확인 또는 후보 모두 탈락)
+        """
+        return self._head.startswith(codecs.BOM_UTF8) or not self._decoders
+
+    def result(self, final: bool = True) -> str:
+        """
+        final=False: 앞부분만 본 경우 (끝에 잘린 멀티바이트 문자는 무시)
+        """
+        if self._head.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+
+        for enc in CANDIDATES:
+            decoder = self._decoders.get(enc)
+            if decoder is None:
+                continue
+            if final:
+                try:
+                    decoder.decode(b"", final=True)
+                except UnicodeDecodeError:
+                    continue
+            return enc
+        return FALLBACK
+
+
+# =========================================================
+# 2. 파일 판별
+# =========================================================
+def detect_encoding(path: str, sample_bytes: int = SAMPLE_BYTES) -> str:
+    """
+    앞부분 표본으로 판별 (BOM → UTF-8 유효성 → CP949)
+    표본 뒤에서 어긋나는 파일은 read_with_fallback 이 1회 보정
+    """
+    probe = EncodingProbe()
+    with open(path, "rb") as f:
+        chunk = f.read(sample_bytes)
+        probe.feed(chunk)
+        at_end = len(chunk) < sample_bytes or not f.read(1)
+    return probe.result(final=at_end)
+
+
+def _next_candidates(encoding: str) -> list[str]:
+    """
+    encoding 으로 디코딩 실패 시 시도할 순서 (마지막은 항상 성공하는 latin-1)
+    """
+    base = "utf-8" if encoding == "utf-8-sig" else encoding
+    if base in CANDIDATES:
+        rest = list(CANDIDATES[CANDIDATES.index(base) + 1:])
+    else:
+        rest = [enc for enc in CANDIDATES if enc != base]
+    return rest + ([FALLBACK] if base != FALLBACK else [])
+
+
+def read_with_fallback(read, encoding: str):
+    """
+    read(encoding) 실행 → 표본 뒤쪽에서 디코딩에 실패하면 다음 후보로 다시 읽음
+    반환: (read 결과, 실제 사용한 인코딩)
+    """
+    error = None
+    for enc in [encoding] + _next_candidates(encoding):
+        try:
+            return read(enc), enc
+        except UnicodeDecodeError as e:
+            error = e
+    raise error
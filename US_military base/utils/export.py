@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import pandas as pd
+import xlsxwriter
+
+
+# 한 번에 파이썬 객체로 바꾸는 행 수 (constant_memory 모드는 행 순서대로만 기록)
+XLSX_CHUNK_ROWS = 10_000
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+# =========================================================
+# 1. 시트 기록 (행 단위 스트리밍)
+# =========================================================
+def _write_sheet(book, name: str, df: pd.DataFrame, chunk_rows: int) -> None:
+    sheet = book.add_worksheet(name)
+    header = book.add_format({"bold": True})
+    sheet.write_row(0, 0, [str(c) for c in df.columns], header)
+
+    r = 1
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].astype(object)
+        # NaN / NA → 빈 칸
+        for row in chunk.where(pd.notna(chunk), None).itertuples(index=False, name=None):
+            sheet.write_row(r, 0, row)
+            r += 1
+
+
+def write_xlsx(target, sheets: dict, chunk_rows: int = XLSX_CHUNK_ROWS) -> None:
+    """
+    {시트 이름: DataFrame} → XLSX (constant_memory: 행을 쓰는 즉시 임시 파일로 내보냄)
+    """
+    book = xlsxwriter.Workbook(target, {"constant_memory": True})
+    try:
+        for name, df in sheets.items():
+            _write_sheet(book, name, df, chunk_rows)
+    finally:
+        book.close()
+
+
+# =========================================================
+# 2. 다운로드용 바이트
+# =========================================================
+def xlsx_bytes(sheets: dict, chunk_rows: int = XLSX_CHUNK_ROWS) -> bytes:
+    """
+    임시 파일에 기록 후 한 번에 읽음 (작성 중에는 시트 전체를 메모리에 두지 않음)
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_xlsx(path, sheets, chunk_rows)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
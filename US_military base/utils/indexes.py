@@ -0,0 +1,270 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.materialize import source_version
+
+
+# 형식이 바뀌면 올림 → 이전 인덱스는 다시 생성
+INDEX_VERSION = 1
+
+# 데이터 파일 옆 행 인덱스
+INDEX_SUFFIX = ".index.pkl"
+
+# 값 목록(posting list) 인덱스 컬럼 / 채취일 / 깊이 컬럼
+CATEGORY_FIELDS = ["조사구역", "토지이용도", "지점명", "시료명", "심도"]
+DATE_FIELD = "시료채취일"
+DEPTH_FIELD = "깊이"
+
+# 깊이 구간 폭 (m, 시료 상단 깊이 기준)
+DEPTH_BIN_M = 0.5
+
+# URL 파라미터 → 인덱스 컬럼 (site 는 지점명 / 시료명 둘 다 검색)
+FILTER_ARGS = {
+    "area": ["조사구역"],
+    "land_use": ["토지이용도"],
+    "site": ["지점명", "시료명"],
+    "depth_level": ["심도"],
+}
+RANGE_ARGS = {"date": ("date_from", "date_to"), "depth": ("depth_min", "depth_max")}
+
+
+# =========================================================
+# 1. 값 해석 (채취일 / 깊이)
+# =========================================================
+def parse_days(s: pd.Series) -> np.ndarray:
+    """
+    "2025.10.15" / "2025-10-15" / "2025/10/15" → 1970-01-01 기준 일 수 (해석 불가 = NaN)
+    고유값 단위로 1번만 해석
+    """
+    codes, uniques = pd.factorize(s)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    text = text.str.replace(r"[./]", "-", regex=True).str.replace(r"-$", "", regex=True)
+    dates = pd.to_datetime(text, errors="coerce", format="mixed")
+    days = (dates - pd.Timestamp("1970-01-01")).dt.days.to_numpy(dtype=float)
+    return np.append(days, np.nan)[codes]
+
+
+def parse_depth_top(s: pd.Series) -> np.ndarray:
+    """
+    "0.15-0.3" → 0.15 (구간 상단), "1.0" → 1.0, 해석 불가 = NaN
+    """
+    codes, uniques = pd.factorize(s)
+    tops = []
+    for v in uniques:
+        m = re.match(r"\s*(\d+(?:\.\d+)?)", str(v))
+        tops.append(float(m.group(1)) if m else np.nan)
+    return np.append(np.array(tops, dtype=float), np.nan)[codes]
+
+
+def _day(value: str | None) -> float | None:
+    if not value:
+        return None
+    days = parse_days(pd.Series([value]))[0]
+    return None if np.isnan(days) else float(days)
+
+
+def _float(value: str | None) -> float | None:
+    try:
+        return float(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+# =========================================================
+# 2. 행 인덱스
+# =========================================================
+def _postings(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    정수 키 (-1 = 결측) → (키 순 행 위치, 키별 시작 위치) CSR 형태
+    키마다 행 위치는 오름차순, 결측 행은 앞쪽 (어느 키 구간에도 속하지 않음)
+    """
+    order = np.argsort(keys, kind="stable").astype(np.int64)
+    n_keys = int(keys.max()) + 1 if len(keys) else 0
+    offsets = np.searchsorted(keys[order], np.arange(n_keys + 1))
+    return order, offsets
+
+
+class RowIndex:
+    """
+    파일 1개의 행 위치 인덱스 (수집 시 1회 생성, 데이터 파일 옆에 저장)
+
+    - 값 목록: CATEGORY_FIELDS 값 → 행 위치 (값 → 정수 코드 → CSR)
+    - 채취일: 일 수 기준 정렬된 행 위치 → 구간은 searchsorted 2번
+    - 깊이: 상단 깊이 DEPTH_BIN_M 구간 → 행 위치, 경계 구간만 실제 값 비교
+    - 조건 결합은 행 위치 배열 교집합 → 전체 행 불리언 스캔 없음
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.format = INDEX_VERSION
+        self.n_rows = len(df)
+
+        self.categories = {}
+        for c in CATEGORY_FIELDS:
+            if c not in df.columns:
+                continue
+            s = df[c]
+            codes, uniques = pd.factorize(s.where(s.isna(), s.astype(str)))
+            order, offsets = _postings(codes)
+            lookup = {str(v): i for i, v in enumerate(uniques)}
+            self.categories[c] = (lookup, order, offsets)
+
+        self.date_order = self.date_days = None
+        if DATE_FIELD in df.columns:
+            days = parse_days(df[DATE_FIELD])
+            valid = np.flatnonzero(~np.isnan(days))
+            order = valid[np.argsort(days[valid], kind="stable")]
+            self.date_order, self.date_days = order.astype(np.int64), days[order]
+
+        self.depth_top = self.depth_order = self.depth_offsets = None
+        if DEPTH_FIELD in df.columns:
+            top = parse_depth_top(df[DEPTH_FIELD])
+            bins = np.where(np.isnan(top), -1, np.floor(np.nan_to_num(top) / DEPTH_BIN_M)).astype(np.int64)
+            order, offsets = _postings(bins)
+            self.depth_top = top
+            self.depth_order = order
+            self.depth_offsets = offsets
+
+    # -----------------------------
+    # 조건별 행 위치 (오름차순)
+    # -----------------------------
+    def category_rows(self, field: str, values) -> np.ndarray:
+        if field not in self.categories:
+            return np.empty(0, dtype=np.int64)
+        lookup, order, offsets = self.categories[field]
+        parts = [
+            order[offsets[code]:offsets[code + 1]]
+            for code in (lookup.get(str(v)) for v in values) if code is not None
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def date_rows(self, start: float | None, end: float | None) -> np.ndarray:
+        if self.date_order is None:
+            return np.empty(0, dtype=np.int64)
+        lo = 0 if start is None else np.searchsorted(self.date_days, start, side="left")
+        hi = len(self.date_days) if end is None else np.searchsorted(self.date_days, end, side="right")
+        return np.sort(self.date_order[lo:hi])
+
+    def depth_rows(self, low: float | None, high: float | None) -> np.ndarray:
+        if self.depth_order is None:
+            return np.empty(0, dtype=np.int64)
+        n_bins = len(self.depth_offsets) - 1
+        first = 0 if low is None else max(int(np.floor(low / DEPTH_BIN_M)), 0)
+        last = n_bins - 1 if high is None else min(int(np.floor(high / DEPTH_BIN_M)), n_bins - 1)
+        if first > last:
+            return np.empty(0, dtype=np.int64)
+
+        rows = self.depth_order[self.depth_offsets[first]:self.depth_offsets[last + 1]]
+        # 양 끝 구간에 걸친 행만 실제 상단 깊이로 확인
+        top = self.depth_top[rows]
+        keep = np.ones(len(rows), dtype=bool)
+        if low is not None:
+            keep &= top >= low
+        if high is not None:
+            keep &= top <= high
+        return np.sort(rows[keep])
+
+    def select(self, filters: dict) -> np.ndarray | None:
+        """
+        filters: parse_filter_args 결과 → 모든 조건을 만족하는 행 위치 (조건 없음 = None)
+        """
+        if not filters:
+            return None
+
+        sets = []
+        for name, fields in FILTER_ARGS.items():
+            if name in filters:
+                parts = [self.category_rows(f, filters[name]) for f in fields]
+                sets.append(parts[0] if len(parts) == 1 else np.union1d(*parts))
+        if "date" in filters:
+            sets.append(self.date_rows(*filters["date"]))
+        if "depth" in filters:
+            sets.append(self.depth_rows(*filters["depth"]))
+
+        # 작은 집합부터 교집합
+        sets.sort(key=len)
+        rows = sets[0]
+        for other in sets[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+# =========================================================
+# 3. 요청 파라미터
+# =========================================================
+def parse_filter_args(args) -> dict:
+    """
+    ?area=&land_use=&site=&depth_level= (여러 개 가능, OR)
+    &date_from=&date_to= (채취일, 양 끝 포함) &depth_min=&depth_max= (상단 깊이 m)
+    args: Flask request.args (MultiDict)
+    """
+    filters = {}
+    for name in FILTER_ARGS:
+        values = tuple(v for v in args.getlist(name) if v)
+        if values:
+            filters[name] = values
+
+    date = (_day(args.get("date_from")), _day(args.get("date_to")))
+    if date != (None, None):
+        filters["date"] = date
+    depth = (_float(args.get("depth_min")), _float(args.get("depth_max")))
+    if depth != (None, None):
+        filters["depth"] = depth
+    return filters
+
+
+def filter_params(args) -> list[tuple[str, str]]:
+    """
+    요청에 있던 필터 파라미터 (링크 / 숨김 입력으로 그대로 전달)
+    """
+    names = list(FILTER_ARGS) + [n for pair in RANGE_ARGS.values() for n in pair]
+    return [(n, v) for n in names for v in args.getlist(n) if v]
+
+
+def filter_key(filters: dict) -> tuple:
+    return tuple(sorted(filters.items()))
+
+
+# =========================================================
+# 4. 저장 / 로딩
+# =========================================================
+def index_path(data_path: str) -> str:
+    return f"{data_path}{INDEX_SUFFIX}"
+
+
+def save_index(data_path: str, index: RowIndex) -> None:
+    payload = {"source": source_version(data_path), "index": index}
+    tmp = index_path(data_path) + ".tmp"
+    pd.to_pickle(payload, tmp)
+    os.replace(tmp, index_path(data_path))
+
+
+def load_index(data_path: str) -> RowIndex | None:
+    """
+    데이터 파일이 저장 시점과 같을 때만 반환 (아니면 None → 호출 측에서 생성)
+    """
+    path = index_path(data_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        payload = pd.read_pickle(path)
+    except Exception:
+        return None
+    if payload.get("source") != source_version(data_path):
+        return None
+    if getattr(payload["index"], "format", None) != INDEX_VERSION:
+        return None
+    return payload["index"]
+
+
+def remove_index(data_path: str) -> None:
+    try:
+        os.remove(index_path(data_path))
+    except FileNotFoundError:
+        pass
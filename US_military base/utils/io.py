@@ -1,23 +1,59 @@
-import os, json, pandas as pd
+import os, pandas as pd
+
+from utils.catalog import Catalog
+from utils.columnar import load_frame, read_csv_columns
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 META_FILE = os.path.join(BASE_DIR, "datasets.json")
+CATALOG_DB = os.path.join(BASE_DIR, "datasets.db")
+
+# datasets.json → SQLite 카탈로그 (최초 1회 자동 이관)
+CATALOG = Catalog(CATALOG_DB, legacy_json=META_FILE, data_dir=DATA_DIR)
 
 def load_datasets():
-    if os.path.exists(META_FILE):
-        with open(META_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    return CATALOG.all()
+
+def store_dataset(dataset_id, record, stats, src_path, ext):
+    """
+    내용 해시 위치로 옮겨 등록 (같은 내용은 기존 파일 공유)
+    """
+    return CATALOG.add_blob(dataset_id, record, stats, src_path, ext)
 
-def save_datasets(d):
-    with open(META_FILE, "w", encoding="utf-8") as f:
-        json.dump(d, f, ensure_ascii=False, indent=2)
+def remove_dataset(dataset_id):
+    """
+    (삭제된 항목, 파일 삭제 여부) → 다른 데이터셋이 같은 파일을 쓰면 파일은 유지
+    """
+    return CATALOG.release(dataset_id)
 
-def read_table(path):
+def read_encoded(path, read, encoding=None):
+    """
+    read(encoding) 실행: 카탈로그 기록값 → 없으면 앞부분 표본으로 판별 후 기록
+    뒤쪽에서 디코딩에 실패하면 다음 후보로 1회 다시 읽고 기록
+    """
+    return CATALOG.read_encoded(os.path.relpath(path, DATA_DIR), read, encoding)
+
+def read_table(path, encoding=None):
+    """
+    encoding: 카탈로그에 기록된 값 (없으면 앞부분 표본으로 1회 판별)
+    """
     if path.endswith(".xlsx"):
         return pd.read_excel(path)
-    try:
-        return pd.read_csv(path, encoding="utf-8")
-    except:
-        return pd.read_csv(path, encoding="cp949")
+    return read_encoded(path, lambda enc: pd.read_csv(path, encoding=enc), encoding)
+
+
+def load_table(path, encoding=None, sha256=None, columns=None):
+    """
+    화면 / 분석용 읽기: 열 단위 사이드카 우선 (헤더 정리 + 수치 항목 해석 완료)
+    사이드카가 없거나 원본이 바뀌었으면 read_table 로 파싱 후 생성
+    columns: 정리된 헤더 이름 기준 필요한 컬럼만 (None: 전체)
+    """
+    read_columns = None
+    if not path.endswith(".xlsx"):
+        read_columns = lambda cols: read_encoded(
+            path, lambda enc: read_csv_columns(path, enc, cols), encoding
+        )
+    return load_frame(
+        path, lambda: read_table(path, encoding), columns=columns, sha256=sha256,
+        read_columns=read_columns
+    )[0]
@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 기본 설정
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 8
+
+# 완료된 작업 상태 보관 개수 (오래된 것부터 제거)
+KEEP_FINISHED = 200
+
+
+class QueueFull(RuntimeError):
+    """
+    대기 작업이 한도에 도달 (호출 측에서 503 / 재시도 안내)
+    """
+
+
+# =========================================================
+# 1. 작업 상태
+# =========================================================
+class Job:
+    """
+    status: queued → running → done | failed
+    progress: 0.0 ~ 1.0, stage: 현재 단계 설명
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = "queued"
+        self.stage = "대기"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    def update(self, stage: str, progress: float | None = None) -> None:
+        self.stage = stage
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "result": self.result,
+            "error": self.error,
+            "elapsed": round((self.finished or time.time()) - self.created, 3),
+        }
+
+
+# =========================================================
+# 2. 수집(ingestion) 큐
+# =========================================================
+class IngestQueue:
+    """
+    업로드 후처리(검증 / 정규화 / 사전 계산)를 요청 밖 스레드 풀에서 실행
+
+    - workers: 동시에 처리하는 작업 수
+    - max_pending: 대기 + 실행 중 작업 한도 (넘으면 QueueFull → back-pressure)
+    - 작업 상태는 프로세스 메모리에 보관 (상태 조회는 같은 프로세스에서)
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._jobs = OrderedDict()   # id -> Job
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, func, *args, **kwargs) -> Job:
+        """
+        func(job, *args, **kwargs) 를 실행, 반환값은 job.result
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull(f"처리 대기 작업이 많습니다 (최대 {self.max_pending}건)")
+
+        job = Job(name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+
+        try:
+            self._pool.submit(self._run, job, func, args, kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        return job
+
+    def _run(self, job: Job, func, args, kwargs) -> None:
+        job.status = "running"
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.update("완료", 1.0)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            self._slots.release()
+
+    def _trim(self) -> None:
+        finished = [
+            k for k, j in self._jobs.items() if j.status in ("done", "failed")
+        ]
+        for k in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self._jobs[k]
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(j.status in ("queued", "running") for j in self._jobs.values())
+
+    def full(self) -> bool:
+        return self.pending() >= self.max_pending
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending(),
+        }
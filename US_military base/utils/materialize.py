@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+
+
+# 저장 형식 / 계산 입력이 바뀌면 올림 → 이전 결과는 무시
+# (2: 열 단위 사이드카에서 헤더 정리 + 검출한계 처리된 값으로 계산)
+# (3: 기준종류별 초과 지점수 컬럼)
+SUMMARY_VERSION = 3
+
+# =========================================================
+# 1. 저장 위치 / 버전
+# =========================================================
+def summary_path(data_path: str) -> str:
+    """
+    데이터 파일 옆에 저장되는 전체 항목 분석 결과
+    """
+    return f"{data_path}.summary.pkl"
+
+
+def source_version(data_path: str) -> tuple:
+    st = os.stat(data_path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+# =========================================================
+# 2. 저장 / 로딩
+# =========================================================
+def save_summary(data_path: str, standards_version: tuple, items: list[str], results: dict) -> None:
+    """
+    results: {이름: DataFrame} (항목별 1행, 전체 항목 기준)
+    """
+    payload = {
+        "format": SUMMARY_VERSION,
+        "source": source_version(data_path),
+        "standards": standards_version,
+        "items": list(items),
+        "results": results,
+    }
+    tmp = summary_path(data_path) + ".tmp"
+    pd.to_pickle(payload, tmp)
+    os.replace(tmp, summary_path(data_path))
+
+
+def load_summary(data_path: str, standards_version: tuple, items: list[str]) -> dict | None:
+    """
+    저장된 결과가 현재 데이터/기준표와 일치하고 요청 항목을 모두 포함할 때만 반환
+    (아니면 None → 호출 측에서 직접 계산)
+    """
+    path = summary_path(data_path)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        payload = pd.read_pickle(path)
+    except Exception:
+        return None
+
+    if payload.get("format") != SUMMARY_VERSION:
+        return None
+    if payload.get("source") != source_version(data_path):
+        return None
+    if payload.get("standards") != standards_version:
+        return None
+    if not set(items) <= set(payload["items"]):
+        return None
+
+    return payload["results"]
+
+
+def remove_summary(data_path: str) -> None:
+    try:
+        os.remove(summary_path(data_path))
+    except FileNotFoundError:
+        pass
+
+
+# =========================================================
+# 3. 항목 부분집합
+# =========================================================
+def slice_items(frame: pd.DataFrame, items: list[str]) -> pd.DataFrame:
+    """
+    항목별 1행 결과에서 요청 항목 행만 요청 순서대로 추출
+    """
+    pos = {item: i for i, item in enumerate(frame["항목"])}
+    return frame.iloc[[pos[i] for i in items]].reset_index(drop=True)
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+# 라우트별 지연 분위수 계산에 쓰는 최근 요청 수
+LATENCY_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+_NOOP = nullcontext()
+
+
+# =========================================================
+# 1. 수집기
+# =========================================================
+class Metrics:
+    """
+    단계별 시간 / 라우트별 지연 / 캐시 적중 / 읽은 바이트 수집
+
+    - stage(name): 현재 요청의 단계 시간 누적 (Server-Timing 헤더로 전송)
+    - 요청 밖(업로드 후처리 스레드 등)의 단계는 전체 합계에만 반영
+    - enabled=False: 모든 기록이 바로 반환 → 계측 비용 없음
+    """
+
+    def __init__(self, enabled: bool = True, window: int = LATENCY_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self._latency = {}       # route -> deque[초] (분위수용 최근 요청)
+        self._latency_total = {} # route -> [건수, 합계 초] (누적)
+        self._requests = {}      # (route, status) -> 건수
+        self._stages = {}        # stage -> [건수, 합계 초]
+        self._bytes_read = 0
+        self._caches = {}        # name -> stats() 를 가진 객체
+
+    # -----------------------------
+    # 기록
+    # -----------------------------
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        timings = getattr(self._local, "timings", None)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+        with self._lock:
+            entry = self._stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_bytes_read(self, nbytes: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._bytes_read += nbytes
+
+    def register_cache(self, name: str, cache) -> None:
+        """
+        cache.stats() 의 hits / misses 를 수집 시점에 읽음
+        """
+        self._caches[name] = cache
+
+    # -----------------------------
+    # 요청 시작 / 종료
+    # -----------------------------
+    def begin_request(self) -> None:
+        self._local.timings = {}
+        self._local.start = time.perf_counter()
+
+    def end_request(self, route: str, status: int) -> dict:
+        """
+        현재 요청 기록 마감 → {단계: 초} (total 포함)
+        """
+        timings = getattr(self._local, "timings", None)
+        start = getattr(self._local, "start", None)
+        self._local.timings = None
+        if timings is None or start is None:
+            return {}
+
+        total = time.perf_counter() - start
+        timings["total"] = total
+        with self._lock:
+            self._latency.setdefault(route, deque(maxlen=self.window)).append(total)
+            acc = self._latency_total.setdefault(route, [0, 0.0])
+            acc[0] += 1
+            acc[1] += total
+            key = (route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+        return timings
+
+    @staticmethod
+    def server_timing(timings: dict) -> str:
+        """
+        {단계: 초} → Server-Timing 헤더 값 (ms)
+        """
+        return ", ".join(f"{name};dur={sec * 1000:.2f}" for name, sec in timings.items())
+
+    def install(self, app, route_name: str = "/metrics") -> None:
+        """
+        Flask 앱에 요청 훅 / 수집 라우트 등록 (비활성이면 아무것도 등록하지 않음)
+        """
+        if not self.enabled:
+            return
+
+        from flask import Response, request
+
+        @app.before_request
+        def _metrics_begin():
+            self.begin_request()
+
+        @app.after_request
+        def _metrics_end(response):
+            rule = request.url_rule.rule if request.url_rule else "unmatched"
+            timings = self.end_request(rule, response.status_code)
+            if timings:
+                response.headers["Server-Timing"] = self.server_timing(timings)
+            return response
+
+        @app.route(route_name)
+        def metrics():
+            return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+    # -----------------------------
+    # Prometheus 텍스트 형식
+    # -----------------------------
+    def render(self) -> str:
+        with self._lock:
+            latency = {r: sorted(v) for r, v in self._latency.items()}
+            latency_total = {r: list(v) for r, v in self._latency_total.items()}
+            requests = dict(self._requests)
+            stages = {k: list(v) for k, v in self._stages.items()}
+            bytes_read = self._bytes_read
+
+        lines = [
+            "# HELP datahub_request_duration_seconds 라우트별 응답 시간 (최근 요청 기준 분위수)",
+            "# TYPE datahub_request_duration_seconds summary",
+        ]
+        for route, values in sorted(latency.items()):
+            label = f'route="{_escape(route)}"'
+            for q in QUANTILES:
+                lines.append(
+                    f'datahub_request_duration_seconds{{{label},quantile="{q}"}} {_quantile(values, q):.6f}'
+                )
+            count, total = latency_total[route]
+            lines.append(f"datahub_request_duration_seconds_sum{{{label}}} {total:.6f}")
+            lines.append(f"datahub_request_duration_seconds_count{{{label}}} {count}")
+
+        lines += [
+            "# HELP datahub_requests_total 라우트 / 상태 코드별 요청 수",
+            "# TYPE datahub_requests_total counter",
+        ]
+        for (route, status), n in sorted(requests.items()):
+            lines.append(f'datahub_requests_total{{route="{_escape(route)}",status="{status}"}} {n}')
+
+        lines += [
+            "# HELP datahub_stage_seconds 처리 단계별 누적 시간",
+            "# TYPE datahub_stage_seconds summary",
+        ]
+        for name, (count, total) in sorted(stages.items()):
+            lines.append(f'datahub_stage_seconds_sum{{stage="{_escape(name)}"}} {total:.6f}')
+            lines.append(f'datahub_stage_seconds_count{{stage="{_escape(name)}"}} {count}')
+
+        lines += [
+            "# HELP datahub_bytes_read_total 디스크에서 읽은 데이터 파일 바이트 수",
+            "# TYPE datahub_bytes_read_total counter",
+            f"datahub_bytes_read_total {bytes_read}",
+        ]
+
+        lines += [
+            "# HELP datahub_cache_requests_total 캐시 조회 수 (result=hit|miss)",
+            "# TYPE datahub_cache_requests_total counter",
+        ]
+        ratios = []
+        for name, cache in sorted(self._caches.items()):
+            s = cache.stats()
+            lines.append(f'datahub_cache_requests_total{{cache="{name}",result="hit"}} {s["hits"]}')
+            lines.append(f'datahub_cache_requests_total{{cache="{name}",result="miss"}} {s["misses"]}')
+            ratios.append((name, s))
+
+        lines += [
+            "# HELP datahub_cache_hit_ratio 캐시 적중률",
+            "# TYPE datahub_cache_hit_ratio gauge",
+        ]
+        for name, s in ratios:
+            lines.append(f'datahub_cache_hit_ratio{{cache="{name}"}} {s["hit_ratio"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# 2. 형식 도우미
+# =========================================================
+def _quantile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    pos = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[pos]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,133 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+# 정규화 결과 범주 (category dtype 순서)
+SURVEY_TYPES = ["A", "B"]
+REGIONS = ["1지역", "2지역", "3지역"]
+
+# 수치 해석 플래그 (uint8 비트)
+FLAG_BELOW_DL = 1        # 검출한계 미만 ("<0.01", ND, 불검출)
+FLAG_UNPARSEABLE = 2     # 값이 있는데 수치로 읽을 수 없음
+
+# 값이 없음을 뜻하는 표기 / 불검출 표기 (NFKC + 대문자 기준)
+BLANK_MARKERS = {"", "-", "NAN"}
+ND_MARKERS = {"ND", "N.D.", "N.D", "불검출"}
+
+
+# =========================================================
+# 1. 헤더 정리
+# =========================================================
+def normalize_header(name) -> str:
+    """
+    "Cd\\n(mg/kg)" → "Cd(mg/kg)" (엑셀 줄바꿈 헤더 정리)
+    """
+    return (
+        str(name).strip()
+        .replace("\n", "")
+        .replace("\r", "")
+    )
+
+
+# =========================================================
+# 2. 고유값 단위 정규화
+# =========================================================
+def map_unique(s: pd.Series, func, categories: list[str]) -> pd.Series:
+    """
+    고유값마다 func 를 1번만 적용하고 결과를 코드로 전체 행에 전파
+    반환: category dtype Series (categories 밖의 결과 / None → NaN)
+    """
+    codes, uniques = pd.factorize(s)
+
+    pos = {c: i for i, c in enumerate(categories)}
+    lookup = np.array(
+        [pos.get(func(v), -1) for v in uniques]
+        # factorize 결측(code = -1) → 마지막 칸
+        + [pos.get(func(np.nan), -1)],
+        dtype=np.int64
+    )
+
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[codes], categories=categories),
+        index=s.index
+    )
+
+
+# =========================================================
+# 3. 수치 정규화 (검출한계 인식)
+# =========================================================
+def _parse_text(v) -> tuple[float, int]:
+    """
+    문자열 1개 → (값, 플래그)
+    전각 문자(NFKC), "<0.01"(검출한계 값 + 미만 표시), ND / 불검출, 천 단위 쉼표
+    """
+    text = unicodedata.normalize("NFKC", str(v)).strip()
+    key = text.upper()
+    if key in BLANK_MARKERS:
+        return np.nan, 0
+    if key in ND_MARKERS:
+        return np.nan, FLAG_BELOW_DL
+
+    flag = FLAG_BELOW_DL if text.startswith("<") else 0
+    text = text.lstrip("<>=").strip().replace(",", "")
+    try:
+        value = float(text)
+    except ValueError:
+        return np.nan, FLAG_UNPARSEABLE
+    if not np.isfinite(value):
+        return np.nan, FLAG_UNPARSEABLE
+    return value, flag
+
+
+def parse_numeric(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (값 float64 배열, 플래그 uint8 배열)
+    검출한계 미만은 값 = 검출한계 (ND 는 NaN), 플래그로 구분
+
+    고유값 단위로 1번만 해석: 일반 숫자는 pd.to_numeric 으로 한 번에,
+    나머지(기호 / 쉼표 / 전각 등)만 개별 해석
+    """
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s.to_numpy(dtype=float, na_value=np.nan, copy=True), np.zeros(len(s), dtype=np.uint8)
+
+    codes, uniques = pd.factorize(s)
+    uniques = np.asarray(uniques, dtype=object)
+
+    values = np.full(len(uniques) + 1, np.nan)
+    flags = np.zeros(len(uniques) + 1, dtype=np.uint8)
+
+    fast = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype=float)
+    ok = np.isfinite(fast)
+    values[:-1][ok] = fast[ok]
+    for i in np.flatnonzero(~ok):
+        values[i], flags[i] = _parse_text(uniques[i])
+
+    # factorize 결측(code = -1) → 마지막 칸 (NaN, 플래그 없음)
+    return values[codes], flags[codes]
+
+
+def normalize_numeric_series(s: pd.Series) -> pd.Series:
+    """
+    분석용 수치 컬럼: 검출한계 미만 / ND / 해석 불가 → NaN
+    (검출한계 값이 측정값으로 집계되어 기준 초과·최고값에 섞이지 않도록)
+    """
+    values, flags = parse_numeric(s)
+    values[flags != 0] = np.nan
+    return pd.Series(values, index=s.index, name=s.name)
+
+
+def numeric_flag_summary(flags: dict) -> pd.DataFrame:
+    """
+    {컬럼: 플래그 배열} → 컬럼별 검출한계 미만 / 해석 불가 칸 수 (로그 화면)
+    """
+    rows = [
+        {
+            "항목": c,
+            "검출한계 미만": int(np.count_nonzero(f & FLAG_BELOW_DL)),
+            "해석 불가": int(np.count_nonzero(f & FLAG_UNPARSEABLE)),
+        }
+        for c, f in flags.items()
+    ]
+    return pd.DataFrame(rows, columns=["항목", "검출한계 미만", "해석 불가"])
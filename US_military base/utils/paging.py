@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+# =========================================================
+# 1. 요청 파라미터
+# =========================================================
+def parse_page_args(args) -> dict:
+    """
+    ?page=&page_size=&sort=&order=&filter=컬럼:값 (filter 는 여러 개 가능)
+    args: Flask request.args (MultiDict)
+    """
+    def _int(name, default):
+        try:
+            return int(args.get(name, default))
+        except (TypeError, ValueError):
+            return default
+
+    filters = []
+    for f in args.getlist("filter"):
+        col, sep, value = f.partition(":")
+        if sep and value:
+            filters.append((col, value))
+
+    return {
+        "page": max(_int("page", 1), 1),
+        "page_size": min(max(_int("page_size", DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE),
+        "sort": args.get("sort") or None,
+        "order": "desc" if args.get("order") == "desc" else "asc",
+        "filters": filters,
+    }
+
+
+def page_url(base: str, params: dict, **overrides) -> str:
+    """
+    현재 파라미터를 유지한 채 일부만 바꾼 URL
+    """
+    p = {**params, **overrides}
+    query = [("page", p["page"]), ("page_size", p["page_size"])]
+    if p["sort"]:
+        query += [("sort", p["sort"]), ("order", p["order"])]
+    query += [("filter", f"{c}:{v}") for c, v in p["filters"]]
+    return f"{base}?{urlencode(query)}"
+
+
+# 페이지 이동 / 정렬 / 필터 폼 (render_template_string 에 이어 붙여 사용)
+# 필요 변수: columns, params, meta, prev_url, next_url
+PAGER_HTML = """
+<form method="get">
+  정렬
+  <select name="sort">
+    <option value="">(원본 순서)</option>
+    {% for c in columns %}
+      <option value="{{ c }}" {% if c == params.sort %}selected{% endif %}>{{ c }}</option>
+    {% endfor %}
+  </select>
+  <select name="order">
+    <option value="asc">오름차순</option>
+    <option value="desc" {% if params.order == "desc" %}selected{% endif %}>내림차순</option>
+  </select>
+  | 필터(컬럼:값)
+  {% for c, v in params.filters %}
+    <input name="filter" value="{{ c }}:{{ v }}">
+  {% endfor %}
+  <input name="filter" placeholder="지점명:UJS">
+  | 페이지 크기 <input name="page_size" value="{{ params.page_size }}" size="4">
+  <button>적용</button>
+</form>
+<p>
+  {{ meta.start }}–{{ meta.end }} / {{ meta.filtered_rows }}행
+  {% if meta.filtered_rows != meta.total_rows %}(전체 {{ meta.total_rows }}행){% endif %}
+  |
+  {% if prev_url %}<a href="{{ prev_url }}">◀ 이전</a>{% else %}◀ 이전{% endif %}
+  {{ meta.page }} / {{ meta.pages }}
+  {% if next_url %}<a href="{{ next_url }}">다음 ▶</a>{% else %}다음 ▶{% endif %}
+</p>
+"""
+
+
+def pager_context(base: str, columns, params: dict, meta: dict) -> dict:
+    """
+    PAGER_HTML 렌더링 변수
+    """
+    return {
+        "columns": list(columns),
+        "params": params,
+        "meta": meta,
+        "prev_url": page_url(base, params, page=meta["page"] - 1) if meta["page"] > 1 else None,
+        "next_url": page_url(base, params, page=meta["page"] + 1) if meta["page"] < meta["pages"] else None,
+    }
+
+
+# =========================================================
+# 2. 정렬 / 필터 결과(행 위치) 캐시
+# =========================================================
+def _sorted_positions(s: pd.Series, ascending: bool) -> np.ndarray:
+    s = s.reset_index(drop=True)
+    try:
+        ordered = s.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # 숫자/문자 혼합 컬럼 → 문자열 기준 정렬
+        ordered = s.astype(str).sort_values(ascending=ascending, kind="stable")
+    return ordered.index.to_numpy()
+
+
+class PagedView:
+    """
+    캐시된 DataFrame 위에서 정렬·필터 후 행 위치 배열만 보관
+    → 페이지마다 해당 구간(iloc)만 잘라서 렌더링
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._orders = OrderedDict()   # (dataset key, sort, order, filters) -> positions
+        self._lock = threading.Lock()
+
+    def positions(self, key, df: pd.DataFrame, params: dict) -> np.ndarray:
+        filters = tuple(f for f in params["filters"] if f[0] in df.columns)
+        sort = params["sort"] if params["sort"] in df.columns else None
+        cache_key = (key, sort, params["order"], filters)
+
+        with self._lock:
+            if cache_key in self._orders:
+                self._orders.move_to_end(cache_key)
+                return self._orders[cache_key]
+
+        if sort is None:
+            pos = np.arange(len(df))
+        else:
+            pos = _sorted_positions(df[sort], params["order"] == "asc")
+
+        for col, value in filters:
+            hit = df[col].astype(str).str.contains(value, case=False, regex=False, na=False)
+            pos = pos[hit.to_numpy()[pos]]
+
+        with self._lock:
+            self._orders[cache_key] = pos
+            while len(self._orders) > self.max_entries:
+                self._orders.popitem(last=False)
+        return pos
+
+    def page(self, key, df: pd.DataFrame, params: dict) -> tuple[pd.DataFrame, dict]:
+        """
+        (현재 페이지 DataFrame, 페이지 메타) 반환
+        """
+        pos = self.positions(key, df, params)
+
+        size = params["page_size"]
+        pages = max((len(pos) + size - 1) // size, 1)
+        page = min(params["page"], pages)
+        start = (page - 1) * size
+
+        window = df.iloc[pos[start:start + size]]
+        meta = {
+            "total_rows": len(df),
+            "filtered_rows": len(pos),
+            "page": page,
+            "pages": pages,
+            "start": start + 1 if len(pos) else 0,
+            "end": min(start + size, len(pos)),
+        }
+        return window, meta
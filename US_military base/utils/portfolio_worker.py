@@ -0,0 +1,68 @@
+"""
+포트폴리오 분석 작업 단위 (프로세스 풀에서 실행)
+Flask 앱 / 카탈로그를 import 하지 않음 → spawn 된 프로세스는 분석에 필요한 모듈만 읽음
+"""
+import time
+
+import pandas as pd
+
+from utils.columnar import open_sidecar, data_columns, table_frame, header_names, read_csv_columns
+from utils.encoding import detect_encoding, read_with_fallback
+from utils.materialize import load_summary, slice_items
+from utils.region_analysis import prepared_columns, prepare_frame, analyze_surveys
+from utils.standards import get_standards
+
+
+# =========================================================
+# 1. 읽기
+# =========================================================
+def slice_result(frame: pd.DataFrame, items: list[str]) -> pd.DataFrame:
+    """
+    저장된 전체 결과에서 항목 행 추출
+    analyze_regions 와 같은 방식으로 다시 구성 (None/NaN 표시 dtype 일치)
+    """
+    rows = slice_items(frame, items).astype(object).where(pd.notna, None)
+    return pd.DataFrame(rows.to_dict("records")).where(pd.notna, None)
+
+
+def read_item_columns(path: str, items: list[str], encoding: str) -> pd.DataFrame:
+    """
+    사이드카가 없을 때: 헤더 행만 읽어 정리된 이름을 맞춘 뒤 필요한 컬럼만 파싱
+    """
+    columns = prepared_columns(list(header_names(path, encoding)), items)
+    return read_csv_columns(path, encoding, columns)
+
+
+def read_prepared(path: str, items: list[str], encoding: str | None = None) -> tuple:
+    """
+    조사구분 / 지역 / 지점 + items 컬럼만 읽어 정규화 → (DataFrame, 사용한 인코딩)
+    encoding: 카탈로그에 기록된 값 (없으면 앞부분 표본으로 판별)
+    """
+    table = open_sidecar(path)
+    if table is not None:
+        df = table_frame(table, prepared_columns(data_columns(table), items))
+    else:
+        df, encoding = read_with_fallback(
+            lambda enc: read_item_columns(path, items, enc), encoding or detect_encoding(path)
+        )
+    return prepare_frame(df, items), encoding
+
+
+# =========================================================
+# 2. 작업 단위
+# =========================================================
+def analyze_file(path: str, items: list[str], standard_file: str, encoding: str | None = None) -> tuple:
+    """
+    ((개황 A, 정밀 B), 계산 시간, 사용한 인코딩)
+    업로드 시 저장된 전체 항목 결과가 유효하면 행만 추출
+    → 인코딩이 바뀌었으면 (판별 / 보정) 호출 측에서 카탈로그에 기록
+    """
+    start = time.perf_counter()
+    std = get_standards(standard_file)
+    stored = load_summary(path, std.version, items)
+    if stored is not None:
+        result = (slice_result(stored["A"], items), slice_result(stored["B"], items))
+    else:
+        df, encoding = read_prepared(path, items, encoding)
+        result = analyze_surveys(df, items, std)
+    return result, time.perf_counter() - start, encoding
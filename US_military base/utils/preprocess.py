@@ -1,6 +1,8 @@
 import pandas as pd
 import streamlit as st
 
+from utils.normalize import map_unique, normalize_numeric_series, SURVEY_TYPES, REGIONS
+
 ITEM_GROUPS = {
     "중금속": ["Cd(mg/kg)", "Cu(mg/kg)", "As(mg/kg)", "Hg(mg/kg)",
             "Pb(mg/kg)", "Cr6+(mg/kg)", "Zn(mg/kg)", "Ni(mg/kg)"],
@@ -11,28 +13,40 @@ ITEM_GROUPS = {
 }
 ALL_ITEMS = [i for g in ITEM_GROUPS.values() for i in g]
 
-def normalize_numeric_series(s):
-    return pd.to_numeric(
-        s.astype(str).str.replace(r"[^0-9eE\.\+\-]", "", regex=True),
-        errors="coerce"
-    )
+def normalize_survey_type(v):
+    if "개황" in str(v): return "A"
+    if "정밀" in str(v): return "B"
+    return None
+
+def normalize_region(v):
+    if "1" in str(v): return "1지역"
+    if "2" in str(v): return "2지역"
+    if "3" in str(v): return "3지역"
+    return None
 
-def preprocess_dataframe(df):
+def find_region_column(df):
+    return next((c for c in df.columns if "지목" in c or "지역" in c), None)
+
+def preprocess_dataframe(df, items=None):
+    """
+    items: 수치 정규화할 항목 (None: ALL_ITEMS, 없는 컬럼은 건너뜀)
+    """
     survey_col = next((c for c in df.columns if "조사" in c), None)
-    df["_조사"] = "A" if survey_col is None else df[survey_col].apply(
-        lambda v: "A" if "개황" in str(v) else "B" if "정밀" in str(v) else None
+    # 고유값 단위 정규화 → category dtype
+    df["_조사"] = (
+        pd.Series("A", index=df.index, dtype=pd.CategoricalDtype(SURVEY_TYPES))
+        if survey_col is None
+        else map_unique(df[survey_col], normalize_survey_type, SURVEY_TYPES)
     )
 
-    region_col = next((c for c in df.columns if "지목" in c or "지역" in c), None)
+    region_col = find_region_column(df)
     if region_col is None:
         st.error("❌ 지역 컬럼을 찾을 수 없습니다.")
         st.stop()
 
-    df["_지역"] = df[region_col].apply(
-        lambda v: "1지역" if "1" in str(v) else "2지역" if "2" in str(v) else "3지역" if "3" in str(v) else None
-    )
+    df["_지역"] = map_unique(df[region_col], normalize_region, REGIONS)
 
-    for c in ALL_ITEMS:
+    for c in ALL_ITEMS if items is None else items:
         if c in df.columns:
             df[c] = normalize_numeric_series(df[c])
 
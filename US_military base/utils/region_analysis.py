@@ -0,0 +1,223 @@
+import pandas as pd
+
+from utils.normalize import map_unique, normalize_numeric_series, REGIONS, SURVEY_TYPES
+from utils.materialize import save_summary
+
+
+# =========================================================
+# 항목 그룹 정의 (화면 구성 / 업로드 수치 검증)
+# =========================================================
+ITEM_GROUPS = {
+    "중금속": [
+        "Cd(mg/kg)", "Cu(mg/kg)", "As(mg/kg)", "Hg(mg/kg)",
+        "Pb(mg/kg)", "Cr6+(mg/kg)", "Zn(mg/kg)", "Ni(mg/kg)"
+    ],
+    "유류": [
+        "Benzene", "Toluene", "Ethylbenzene", "Xylene", "TPH"
+    ],
+    "유기용제": [
+        "TCE", "PCE", "1,2DCA (1,2-디클로로에탄)"
+    ],
+    "기타": [
+        "F(mg/kg)", "PCBs(mg/kg)", "CN(mg/kg)", "Phenol(mg/kg)",
+        "Pentachlorophenol(mg/kg)", "Dioxin", "pH"
+    ]
+}
+
+# 분석에 쓰는 컬럼 (조사구분 컬럼 + 항목은 이름으로 찾음)
+PREPARED_COLUMNS = ["지목(1/2/3)", "시료명", "지점명"]
+
+
+# =========================================================
+# 1. 조사구분 / 지역 정규화
+# =========================================================
+def get_survey_column(df: pd.DataFrame) -> str | None:
+    for c in df.columns:
+        if "조사구분" in c:
+            return c
+    return None
+
+
+def normalize_survey_type(v) -> str | None:
+    if pd.isna(v):
+        return None
+    v = str(v)
+    if "개황" in v:
+        return "A"
+    if "정밀" in v or "상세" in v:
+        return "B"
+    return None
+
+
+def normalize_region(v) -> str | None:
+    if pd.isna(v):
+        return None
+    v = str(v)
+    if "1" in v:
+        return "1지역"
+    if "2" in v:
+        return "2지역"
+    if "3" in v:
+        return "3지역"
+    return None
+
+
+def prepared_columns(columns, items) -> list[str]:
+    """
+    조사구분 / 지역 / 지점 + 항목 컬럼 (원래 컬럼 순서 유지)
+    """
+    survey_col = next((c for c in columns if "조사구분" in c), None)
+    items = set(items)
+    return [c for c in columns if c == survey_col or c in PREPARED_COLUMNS or c in items]
+
+
+def prepare_frame(df: pd.DataFrame, items) -> pd.DataFrame:
+    """
+    헤더 정리된 DataFrame → _조사 / _지역 (category) + 항목 수치 정규화 (df 를 직접 수정)
+    """
+    # 고유값 단위 정규화 → category dtype
+    df["_조사"] = map_unique(df[get_survey_column(df)], normalize_survey_type, SURVEY_TYPES)
+    df["_지역"] = map_unique(df["지목(1/2/3)"], normalize_region, REGIONS)
+
+    for c in items:
+        if c in df.columns:
+            df[c] = normalize_numeric_series(df[c])
+    return df
+
+
+# =========================================================
+# 2. 지역별 분석 (지점수 / 최고 / 기준종류별 초과 지점수)
+# =========================================================
+def exceed_label(level: str) -> str:
+    """
+    기준종류별 초과 지점수 컬럼 이름
+    (우려40 → 우려40초과_지점수, 우려기준 → 우려초과_지점수, 대책기준 → 대책초과_지점수)
+    """
+    return f"{level.replace('기준', '')}초과_지점수"
+
+
+def get_site_series(df: pd.DataFrame) -> pd.Series | None:
+    if "시료명" in df.columns:
+        return df["시료명"].astype(str)
+    if "지점명" in df.columns:
+        return df["지점명"].astype(str)
+    return None
+
+
+def analyze_regions(df: pd.DataFrame, items: list[str], std) -> pd.DataFrame:
+    """
+    항목 × 지역 결과표 (std: utils.standards.CompiledStandards)
+    """
+    site = get_site_series(df)
+    present = [i for i in dict.fromkeys(items) if i in df.columns]
+
+    # 지점 → 정수 코드 (지점 컬럼이 없으면 행 자체가 지점)
+    if site is not None:
+        codes, _ = pd.factorize(site)
+        site_codes = pd.Series(codes, index=df.index, dtype=float).where(codes >= 0)
+    else:
+        site_codes = pd.Series(range(len(df)), index=df.index, dtype=float)
+
+    values = df[present].apply(pd.to_numeric, errors="coerce")
+    numeric = values.to_numpy(dtype=float)
+
+    # 지역별 집계 1회: 지점수 / 항목별 최고 / 기준종류 × 항목별 초과 지점수
+    frame = pd.DataFrame({"site": site_codes}, index=df.index)
+    agg = {"site": "nunique"}
+    for j, item in enumerate(present):
+        frame[f"max_{j}"] = values[item]
+        agg[f"max_{j}"] = "max"
+
+    # 기준종류별 (행 × 항목) 비교
+    for l, level in enumerate(std.levels):
+        thresholds = (
+            std.threshold_table(level)
+            .reindex(index=df["_지역"], columns=present)
+            .to_numpy()
+        )
+        exceed = numeric > thresholds
+        for j in range(len(present)):
+            frame[f"ex_{l}_{j}"] = site_codes.where(exceed[:, j])
+            agg[f"ex_{l}_{j}"] = "nunique"
+
+    stats = frame.groupby(df["_지역"], observed=True).agg(agg).reindex(REGIONS)
+    positions = {item: j for j, item in enumerate(present)}
+
+    out = []
+    for item in items:
+        r = {"항목": item}
+        j = positions.get(item)
+
+        for region in REGIONS:
+            g = stats.loc[region]
+            if j is None:
+                r[f"{region}_지점수"] = 0
+                r[f"{region}_최고"] = None
+                for level in std.levels:
+                    r[f"{region}_{exceed_label(level)}"] = 0
+                continue
+
+            top = g[f"max_{j}"]
+            r[f"{region}_지점수"] = 0 if pd.isna(g["site"]) else int(g["site"])
+            r[f"{region}_최고"] = None if pd.isna(top) else float(top)
+            for l, level in enumerate(std.levels):
+                count = g[f"ex_{l}_{j}"]
+                r[f"{region}_{exceed_label(level)}"] = 0 if pd.isna(count) else int(count)
+
+        out.append(r)
+
+    return pd.DataFrame(out).where(pd.notna, None)
+
+
+def analyze_surveys(df: pd.DataFrame, items: list[str], std) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (개황 A, 정밀 B) 결과표
+    """
+    return (
+        analyze_regions(df[df["_조사"] == "A"], items, std),
+        analyze_regions(df[df["_조사"] == "B"], items, std),
+    )
+
+
+def aggregate_result(agg, survey: str, items: list[str]) -> pd.DataFrame:
+    """
+    누적 집계(utils.aggregates.Aggregates) → analyze_regions 와 같은 형식의 표
+    """
+    out = []
+    for item in items:
+        r = {"항목": item}
+        for region in REGIONS:
+            if item not in agg.present:
+                r[f"{region}_지점수"] = 0
+                r[f"{region}_최고"] = None
+                for level in agg.levels:
+                    r[f"{region}_{exceed_label(level)}"] = 0
+                continue
+            r[f"{region}_지점수"] = agg.site_count(survey, region)
+            r[f"{region}_최고"] = agg.max_value(survey, region, item)
+            for level in agg.levels:
+                r[f"{region}_{exceed_label(level)}"] = agg.exceed_site_count(survey, region, level, item)
+        out.append(r)
+    return pd.DataFrame(out).where(pd.notna, None)
+
+
+# =========================================================
+# 3. 업로드 시점 사전 계산 결과
+# =========================================================
+def analysis_items(std) -> list[str]:
+    """
+    업로드 시 미리 계산해 두는 항목 (기준표 항목 + 화면 항목 그룹)
+    """
+    items = list(std.items)
+    items += [i for g in ITEM_GROUPS.values() for i in g]
+    return list(dict.fromkeys(items))
+
+
+def materialize_analysis(data_path: str, df: pd.DataFrame, std) -> None:
+    """
+    전체 항목 (A, B) 결과를 데이터 파일 옆에 저장 (df 는 prepare_frame 결과)
+    → 이후 항목 선택은 저장된 결과에서 행만 잘라 씀
+    """
+    items = analysis_items(std)
+    A, B = analyze_surveys(df, items, std)
+    save_summary(data_path, std.version, items, {"A": A, "B": B})
@@ -0,0 +1,120 @@
+import time
+
+import streamlit as st
+
+from utils.analysis import analyze_survey_partitions, summary_items, exceed_detail
+from utils.export import xlsx_bytes
+from utils.io import load_table
+from utils.materialize import load_summary
+from utils.preprocess import preprocess_dataframe, ALL_ITEMS
+from utils.standards import REGISTRY
+
+
+# 캐시 한도 (서버 프로세스 공유)
+CACHE_TTL = 60 * 60          # 초
+RAW_MAX_ENTRIES = 8          # 데이터셋 수
+ANALYSIS_MAX_ENTRIES = 32    # (데이터셋, 기준표 버전) 수
+EXPORT_MAX_ENTRIES = 8       # (데이터셋, 항목, 기준표 버전) 수
+
+
+# =========================================================
+# 1. 단계별 적중 / 시간 기록 (세션 단위)
+# =========================================================
+def run_stage(name: str, func, *args, cached: bool = True, **kwargs):
+    """
+    func(..., _probe=[]) 실행 후 적중 여부 / 소요 시간 기록
+    (캐시 함수 본문이 실행되면 _probe 에 표시 → 미적중)
+    cached=False: 캐시 없는 단계 (항상 미적중으로 기록)
+    """
+    probe = []
+    start = time.perf_counter()
+    if cached:
+        result = func(*args, _probe=probe, **kwargs)
+    else:
+        result = func(*args, **kwargs)
+        probe.append(1)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    stats = st.session_state.setdefault("stage_stats", {})
+    entry = stats.setdefault(name, {"hits": 0, "misses": 0, "last": "", "last_ms": 0.0})
+    if probe:
+        entry["misses"] += 1
+        entry["last"] = "miss"
+    else:
+        entry["hits"] += 1
+        entry["last"] = "hit"
+    entry["last_ms"] = round(elapsed, 2)
+    return result
+
+
+def stage_stats() -> dict:
+    return st.session_state.get("stage_stats", {})
+
+
+# =========================================================
+# 2. 캐시 단계 (키: 파일 내용 해시)
+# =========================================================
+@st.cache_resource
+def standards_registry():
+    """
+    기준표 레지스트리 (파일 변경 시에만 재컴파일)
+    """
+    return REGISTRY
+
+
+@st.cache_data(max_entries=RAW_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def load_raw(sha256: str, _path: str, _encoding: str | None, _probe: list):
+    _probe.append(1)
+    return load_table(_path, _encoding, sha256)
+
+
+@st.cache_data(max_entries=RAW_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def load_prepared(sha256: str, _df_raw, _probe: list):
+    _probe.append(1)
+    # 원본 캐시 항목을 건드리지 않도록 복사본에서 전처리
+    return preprocess_dataframe(_df_raw.copy())
+
+
+@st.cache_data(max_entries=ANALYSIS_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def full_analysis(
+    sha256: str,
+    standard_csv: str,
+    standards_version: tuple,
+    survey_col: str,
+    _df,
+    _data_path: str,
+    _probe: list
+) -> dict:
+    """
+    전체 항목 A / B / A+B 결과 (업로드 시 저장된 결과가 있으면 그대로 사용)
+    항목 선택이 바뀌어도 재계산 없이 slice_survey_partitions 로 잘라 씀
+    """
+    _probe.append(1)
+    items = summary_items(ALL_ITEMS, standards_registry().get(standard_csv))
+
+    stored = load_summary(_data_path, standards_version, items)
+    if stored is not None:
+        return stored
+    return analyze_survey_partitions(_df, items, standard_csv, survey_col=survey_col)
+
+
+@st.cache_data(max_entries=EXPORT_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def export_xlsx(
+    sha256: str,
+    items: tuple,
+    standards_version: tuple,
+    standard_csv: str,
+    survey_col: str,
+    _results: dict,
+    _df
+) -> bytes:
+    """
+    A / B / A+B 결과 + 초과 시료 상세 → XLSX 바이트
+    (다운로드 버튼을 누를 때만 호출, 같은 키는 다시 만들지 않음)
+    """
+    return xlsx_bytes({
+        "개황(A)": _results["A"],
+        "정밀(B)": _results["B"],
+        "통합(A+B)": _results["A+B"],
+        "초과시료": exceed_detail(_df, list(items), standard_csv, survey_col),
+    })
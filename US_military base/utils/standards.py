@@ -0,0 +1,163 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.encoding import detect_encoding, read_with_fallback
+from utils.normalize import normalize_header
+
+
+# 분석에 쓰는 기준 종류 (표시 순서)
+LEVELS = ["우려40", "우려기준", "대책기준"]
+
+
+# =========================================================
+# 1. 기준표 파싱
+# =========================================================
+def resolve_standard_path(filename: str) -> str:
+    """
+    상대 경로는 utils 폴더 기준으로 해석
+    """
+    if os.path.isabs(filename):
+        return filename
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, filename)
+
+
+def canonical_level(label) -> str | None:
+    """
+    기준표 2열 표기 → LEVELS 중 하나
+    ("우려 40% 또는 70%" → "우려40")
+    """
+    if pd.isna(label):
+        return None
+    label = str(label).strip()
+    if "40" in label:
+        return "우려40"
+    if "대책" in label:
+        return "대책기준"
+    if "우려" in label:
+        return "우려기준"
+    return None
+
+
+def _read_standard_csv(path: str) -> pd.DataFrame:
+    return read_with_fallback(lambda enc: pd.read_csv(path, encoding=enc), detect_encoding(path))[0]
+
+
+# =========================================================
+# 2. 컴파일된 기준표
+# =========================================================
+class CompiledStandards:
+    """
+    (지역 × 기준종류 × 항목) float 배열, 기준 없음 = NaN
+    """
+
+    def __init__(self, regions: list[str], items: list[str], values: np.ndarray, version: tuple):
+        self.regions = regions
+        self.levels = list(LEVELS)
+        self.items = items
+        self.values = values
+        self.version = version
+
+        self._region_pos = {r: i for i, r in enumerate(regions)}
+        self._item_pos = {c: i for i, c in enumerate(items)}
+
+        # 기존 analysis API 호환용 {(지역, 기준종류, 항목): 기준값}
+        self.std_map = {
+            (region, level, item): float(values[r, l, i])
+            for r, region in enumerate(regions)
+            for l, level in enumerate(self.levels)
+            for i, item in enumerate(items)
+            if not np.isnan(values[r, l, i])
+        }
+
+    @classmethod
+    def from_csv(cls, path: str) -> "CompiledStandards":
+        st = os.stat(path)
+        df = _read_standard_csv(path)
+        df.columns = [normalize_header(c) for c in df.columns]
+
+        # 병합 셀로 비어 있는 지역은 위 행 값으로 채움
+        region = df.iloc[:, 0].ffill().map(
+            lambda v: None if pd.isna(v) else str(v).strip()
+        )
+        level = df.iloc[:, 1].map(canonical_level)
+        items = list(df.columns[2:])
+        numeric = df[items].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+        regions = [r for r in dict.fromkeys(region) if r]
+        values = np.full((len(regions), len(LEVELS), len(items)), np.nan)
+
+        region_pos = {r: i for i, r in enumerate(regions)}
+        level_pos = {l: i for i, l in enumerate(LEVELS)}
+        for row, (r, l) in enumerate(zip(region, level)):
+            if r in region_pos and l in level_pos:
+                values[region_pos[r], level_pos[l]] = numeric[row]
+
+        return cls(regions, items, values, (st.st_mtime_ns, st.st_size))
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get(self, region: str, level: str, item: str) -> float:
+        r = self._region_pos.get(region)
+        i = self._item_pos.get(item)
+        if r is None or i is None or level not in self.levels:
+            return np.nan
+        return float(self.values[r, self.levels.index(level), i])
+
+    def threshold_table(self, level: str) -> pd.DataFrame:
+        """
+        단일 기준종류의 (지역 × 항목) 기준표
+        """
+        return pd.DataFrame(
+            self.values[:, self.levels.index(level), :],
+            index=self.regions,
+            columns=self.items
+        )
+
+    def to_nested(self) -> dict:
+        """
+        {지역: {기준종류: {항목: 기준값}}} (app_upgrade STANDARDS 형태)
+        """
+        return {
+            region: {
+                level: self.threshold_table(level).loc[region].to_dict()
+                for level in self.levels
+            }
+            for region in self.regions
+        }
+
+
+# =========================================================
+# 3. 레지스트리 (파일 변경 시에만 재컴파일)
+# =========================================================
+class StandardsRegistry:
+    def __init__(self):
+        self._compiled = {}   # abspath -> CompiledStandards
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> CompiledStandards:
+        path = os.path.abspath(resolve_standard_path(filename))
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"기준표 파일을 찾을 수 없습니다: {path}")
+
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            compiled = self._compiled.get(path)
+            if compiled is None or compiled.version != version:
+                compiled = CompiledStandards.from_csv(path)
+                self._compiled[path] = compiled
+            return compiled
+
+
+REGISTRY = StandardsRegistry()
+
+
+def get_standards(filename: str) -> CompiledStandards:
+    return REGISTRY.get(filename)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import re
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from utils.encoding import EncodingProbe
+from utils.normalize import normalize_header, parse_numeric, FLAG_UNPARSEABLE
+
+
+# 기본 한도
+UPLOAD_MAX_BYTES = 200 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+VALIDATE_CHUNK_ROWS = 10_000
+
+# 수치 컬럼에서 허용하는 해석 불가 값 (누적 기준: 개수 또는 비율 중 큰 쪽)
+# 예시 데이터에도 "s" 같은 단발성 오기가 있어 소량은 통과시킴
+NUMERIC_BAD_RATIO = 0.05
+NUMERIC_BAD_ALLOWANCE = 10
+
+class UploadRejected(ValueError):
+    """
+    업로드 검증 실패 (status: 응답 코드)
+    """
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# =========================================================
+# 1. 헤더 매칭
+# =========================================================
+def _compact(name) -> str:
+    return re.sub(r"\s+", "", normalize_header(name))
+
+
+def match_columns(columns, names: list[str]) -> dict:
+    """
+    {요청 이름: 실제 컬럼} (공백/줄바꿈 무시, 앞부분 일치)
+    "시료명" → "시 료 명", "지목" → "지목\\n(1/2/3)"
+    """
+    compact = [(_compact(c), c) for c in columns]
+    found = {}
+    for name in names:
+        key = _compact(name)
+        for c_key, c in compact:
+            if c_key.startswith(key):
+                found[name] = c
+                break
+    return found
+
+
+# =========================================================
+# 2. 수치 해석 가능 여부
+# =========================================================
+def unparseable_mask(s: pd.Series) -> np.ndarray:
+    """
+    값이 있는데 수치로 읽을 수 없는 칸 (전각 문자, "<0.01", ND, 천 단위 쉼표 허용)
+    """
+    _, flags = parse_numeric(s)
+    return (flags & FLAG_UNPARSEABLE) != 0
+
+
+# =========================================================
+# 3. 스트리밍 저장 + 검증
+# =========================================================
+def _spool(stream, tmp_path: str, max_bytes: int, chunk_bytes: int) -> dict:
+    """
+    업로드 스트림을 조각 단위로 임시 파일에 기록
+    (크기 / 해시 / 인코딩 판별을 같은 패스에서 처리)
+    """
+    h = hashlib.sha256()
+    probe = EncodingProbe()
+    size = 0
+
+    with open(tmp_path, "wb") as f:
+        while True:
+            chunk = stream.read(chunk_bytes)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(
+                    f"파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)", 413
+                )
+            probe.feed(chunk)
+            h.update(chunk)
+            f.write(chunk)
+
+    if size == 0:
+        raise UploadRejected("빈 파일입니다")
+
+    return {"size": size, "sha256": h.hexdigest(), "encoding": probe.result()}
+
+
+def _validate_rows(
+    path: str,
+    encoding: str,
+    required: list[str],
+    numeric: list[str],
+    chunk_rows: int,
+    bad_ratio: float,
+    progress=None,
+) -> dict:
+    """
+    헤더 → 수치 컬럼 순으로 검사, 처음 실패한 조각에서 중단
+    progress(검사한 행 수): 조각마다 호출
+    """
+    try:
+        columns = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+    except UnicodeDecodeError:
+        raise UploadRejected(f"파일 인코딩을 읽을 수 없습니다 ({encoding})")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise UploadRejected(f"CSV 형식 오류: {e}")
+
+    missing = [name for name in required if name not in match_columns(columns, [name])]
+    if missing:
+        raise UploadRejected(f"필수 컬럼 없음: {', '.join(missing)}")
+
+    numeric_cols = list(dict.fromkeys(match_columns(columns, numeric).values()))
+    usecols = numeric_cols or [columns[0]]
+
+    rows = 0
+    filled = dict.fromkeys(numeric_cols, 0)
+    bad = dict.fromkeys(numeric_cols, 0)
+
+    try:
+        reader = pd.read_csv(
+            path, encoding=encoding, dtype=str, usecols=usecols, chunksize=chunk_rows
+        )
+        for chunk in reader:
+            for c in numeric_cols:
+                mask = unparseable_mask(chunk[c])
+                filled[c] += int(chunk[c].notna().sum())
+                bad[c] += int(mask.sum())
+                if bad[c] > max(bad_ratio * filled[c], NUMERIC_BAD_ALLOWANCE):
+                    row = rows + int(np.flatnonzero(mask)[0]) + 2   # 헤더 = 1행
+                    value = chunk[c].iloc[int(np.flatnonzero(mask)[0])]
+                    raise UploadRejected(
+                        f"수치로 읽을 수 없는 값: {normalize_header(c)} {row}행 '{value}'"
+                    )
+            rows += len(chunk)
+            if progress:
+                progress(rows)
+    except UnicodeDecodeError:
+        raise UploadRejected(f"파일 인코딩을 읽을 수 없습니다 ({encoding}, {rows + 2}행 부근)")
+    except pd.errors.ParserError as e:
+        raise UploadRejected(f"CSV 형식 오류: {e}")
+
+    return {"row_count": rows, "columns": [normalize_header(c) for c in columns]}
+
+
+def _discard(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def spool_upload(
+    stream,
+    dest_path: str,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+) -> tuple[str, dict]:
+    """
+    1단계 (요청 안): 스트림을 임시 파일로 기록 + 크기 제한
+    반환: (임시 경로, size / sha256 / encoding)
+    """
+    # 같은 이름 동시 업로드가 서로 덮지 않도록 임시 파일은 업로드마다 구분
+    tmp_path = f"{dest_path}.{uuid.uuid4().hex}.upload"
+    try:
+        return tmp_path, _spool(stream, tmp_path, max_bytes, chunk_bytes)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def validate_spooled(
+    tmp_path: str,
+    dest_path: str | None,
+    stats: dict,
+    required: list[str] = (),
+    numeric: list[str] = (),
+    chunk_rows: int = VALIDATE_CHUNK_ROWS,
+    bad_ratio: float = NUMERIC_BAD_RATIO,
+    progress=None,
+) -> dict:
+    """
+    2단계 (요청 밖에서도 가능): 조각 단위 검증 → 통과 시에만 dest_path 로 교체
+    (실패한 업로드가 기존 파일을 덮지 않음, dest_path=None 이면 임시 파일 유지)
+    """
+    try:
+        stats = {**stats, **_validate_rows(
+            tmp_path, stats["encoding"], list(required), list(numeric),
+            chunk_rows, bad_ratio, progress
+        )}
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+    if dest_path is not None:
+        os.replace(tmp_path, dest_path)
+    return stats
+
+
+def save_validated_csv(
+    stream,
+    dest_path: str,
+    required: list[str] = (),
+    numeric: list[str] = (),
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+    chunk_rows: int = VALIDATE_CHUNK_ROWS,
+    bad_ratio: float = NUMERIC_BAD_RATIO,
+) -> dict:
+    """
+    업로드 CSV 를 메모리에 올리지 않고 저장 + 검증 (1, 2단계 연속 실행)
+    - 반환: 카탈로그 통계 (size, sha256, encoding, row_count, columns)
+    - 실패: UploadRejected
+    """
+    tmp_path, stats = spool_upload(stream, dest_path, max_bytes, chunk_bytes)
+    return validate_spooled(
+        tmp_path, dest_path, stats, required, numeric, chunk_rows, bad_ratio
+    )
@@ -1,7 +1,7 @@
-from flask import Flask, render_template_string, request, redirect, url_for
+from flask import Flask, render_template_string, request, redirect, url_for, jsonify
 import pandas as pd
 import os
-import json
+import sys
 
 app = Flask(__name__)
 
@@ -11,35 +11,179 @@ app = Flask(__name__)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 META_FILE = os.path.join(BASE_DIR, "datasets.json")
+STANDARD_FILE = os.path.join(BASE_DIR, "example_table2.csv")
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 공용 유틸 (US_military base/utils)
+sys.path.insert(0, os.path.join(BASE_DIR, "US_military base"))
+from utils.cache import FrameCache
+from utils.catalog import Catalog
+from utils.normalize import normalize_header
+from utils.paging import PagedView, PAGER_HTML, parse_page_args, pager_context
+from utils.materialize import remove_summary
+from utils.columnar import load_frame, remove_sidecar, header_names
+from utils.upload import spool_upload, validate_spooled, UploadRejected
+from utils.aggregates import update_dataset_aggregates, remove_aggregates
+from utils.indexes import RowIndex, save_index, remove_index
+from utils.jobs import IngestQueue, QueueFull
+from utils.standards import get_standards
+# 업로드 시 분석 결과 사전 계산 (분석 화면: app_upgrade 와 같은 결과 형식)
+from utils.region_analysis import (
+    ITEM_GROUPS, prepared_columns, prepare_frame, analysis_items, materialize_analysis
+)
+
+# =========================
+# 업로드 검증 설정
+# =========================
+UPLOAD_MAX_BYTES = 200 * 1024 * 1024
+REQUIRED_COLUMNS = ["조사구분", "지목", "시료명"]
+NUMERIC_COLUMNS = [i for g in ITEM_GROUPS.values() for i in g]
+
+# 업로드 후처리 워커 수 / 대기 한도 (넘으면 503)
+INGEST_WORKERS = 2
+INGEST_MAX_PENDING = 8
+
 # =========================
 # CSV 안전 로딩 함수
 # =========================
+def read_encoded(path, read):
+    """
+    read(encoding) 실행: 카탈로그 기록값 → 없으면 앞부분 표본으로 판별 후 기록
+    뒤쪽에서 디코딩에 실패하면 다음 후보로 1회 다시 읽고 기록
+    """
+    return CATALOG.read_encoded(os.path.relpath(path, DATA_DIR), read)
+
 def read_csv_safe(path):
-    try:
-        return pd.read_csv(path, encoding="utf-8")
-    except UnicodeDecodeError:
-        return pd.read_csv(path, encoding="cp949")
+    return read_encoded(path, lambda enc: pd.read_csv(path, encoding=enc))
 
 # =========================
-# 메타데이터 로드/저장
+# 원본 캐시 (파싱 1회 → 페이지 이동은 구간만 렌더링)
 # =========================
-def load_datasets():
-    if os.path.exists(META_FILE):
-        with open(META_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+DATASET_CACHE = FrameCache()
+RAW_VIEWS = PagedView()
 
-def save_datasets(datasets):
-    with open(META_FILE, "w", encoding="utf-8") as f:
-        json.dump(datasets, f, ensure_ascii=False, indent=2)
+def _load_raw(path):
+    # 열 단위 사이드카 우선 (없거나 원본이 바뀌었으면 원본 파싱 후 생성)
+    df, _ = load_frame(path, lambda: read_csv_safe(path))
+    df.columns = [normalize_header(c) for c in df.columns]
+    return df
+
+def load_raw(path):
+    """헤더만 정리된 원본 (읽기 전용)"""
+    return DATASET_CACHE.get_or_load(path, _load_raw)
+
+def load_analysis_frame(path):
+    """원본에서 분석 컬럼만 골라 조사구분 / 지역 / 수치 정규화 (전체 항목)"""
+    items = analysis_items(get_standards(STANDARD_FILE))
+    df = load_raw(path)
+    return prepare_frame(df[prepared_columns(df.columns, items)].copy(), items)
+
+def base_columns(file):
+    """통계가 없는 (이관된) 데이터셋: 원본 파일 헤더 행만 읽어 정리된 컬럼 이름"""
+    path = os.path.join(DATA_DIR, file)
+    return read_encoded(path, lambda enc: list(header_names(path, enc)))
+
+def forget_file(file):
+    """참조가 끊겨 삭제된 파일의 캐시 / 파생 파일 정리"""
+    path = os.path.join(DATA_DIR, file)
+    DATASET_CACHE.invalidate(path)
+    remove_summary(path)
+    remove_sidecar(path)
+    remove_index(path)
 
 # =========================
-# 서버 시작 시 메타데이터 로드
+# 메타데이터 카탈로그 (SQLite, datasets.json 은 최초 1회 자동 이관)
 # =========================
-DATASETS = load_datasets()
+CATALOG_DB = os.path.join(BASE_DIR, "datasets.db")
+CATALOG = Catalog(CATALOG_DB, legacy_json=META_FILE, data_dir=DATA_DIR)
+
+# =========================
+# 업로드 후처리 큐 (검증 → 정규화 → 사전 계산 → 등록)
+# =========================
+INGEST = IngestQueue(workers=INGEST_WORKERS, max_pending=INGEST_MAX_PENDING)
+
+def ingest_upload(job, tmp_path, stats, dataset_id, record):
+    # 이미 저장된 내용이면 검증 / 파싱 / 사전 계산 모두 생략 (기존 blob 공유)
+    # 기존 blob 에 행 수 / 컬럼 통계가 없으면 (이관 항목) 검증해서 채움
+    if not CATALOG.known_blob(stats["sha256"]):
+        job.update("검증", 0.05)
+        stats = validate_spooled(
+            tmp_path, None, stats,
+            required=REQUIRED_COLUMNS,
+            numeric=NUMERIC_COLUMNS,
+            progress=lambda rows: job.update(f"검증 ({rows:,}행)")
+        )
+
+    # 내용 해시 위치로 옮기고 등록
+    job.update("등록", 0.4)
+    stored = CATALOG.add_blob(dataset_id, record, stats, tmp_path, ".csv")
+    path = os.path.join(DATA_DIR, stored["file"])
+
+    # 같은 id 로 다시 올려 참조가 끊긴 이전 파일(추가 회차 포함) 정리
+    for file in stored["released"]:
+        forget_file(file)
+    remove_aggregates(DATA_DIR, dataset_id)
+
+    if not stored["deduped"]:
+        job.update("정규화", 0.5)
+        df = load_raw(path)
+
+        # 조사구역 / 채취일 / 깊이 / 토지이용도 / 지점 행 인덱스
+        job.update("인덱스", 0.6)
+        save_index(path, RowIndex(df))
+
+        # 전체 항목 분석 결과 저장 (분석 컬럼이 없는 파일은 건너뜀)
+        job.update("사전 계산", 0.7)
+        try:
+            materialize_analysis(path, load_analysis_frame(path), get_standards(STANDARD_FILE))
+        except (KeyError, TypeError, ValueError):
+            remove_summary(path)
+
+    return {
+        "dataset_id": dataset_id,
+        "row_count": stored["stats"].get("row_count"),
+        "deduped": stored["deduped"],
+    }
+
+def append_upload(job, tmp_path, stats, dataset_id):
+    # 새 행만 검증 (기존 회차는 다시 읽지 않음)
+    job.update("검증", 0.05)
+    stats = validate_spooled(
+        tmp_path, None, stats,
+        required=REQUIRED_COLUMNS,
+        numeric=NUMERIC_COLUMNS,
+        progress=lambda rows: job.update(f"검증 ({rows:,}행)")
+    )
+
+    job.update("등록", 0.4)
+    stored = CATALOG.add_partition(dataset_id, stats, tmp_path, ".csv")
+    if stored is None:
+        raise LookupError(f"데이터셋 없음: {dataset_id}")
+
+    if not stored["duplicate"]:
+        # 새 파티션만 정규화 → 누적 집계에 반영
+        job.update("정규화", 0.5)
+        path = os.path.join(DATA_DIR, stored["file"])
+        save_index(path, RowIndex(load_raw(path)))
+
+        job.update("집계 갱신", 0.7)
+        try:
+            std = get_standards(STANDARD_FILE)
+            update_dataset_aggregates(
+                DATA_DIR, dataset_id,
+                [os.path.join(DATA_DIR, f) for f in CATALOG.partition_files(dataset_id)],
+                std, analysis_items(std), load_analysis_frame
+            )
+        except (KeyError, TypeError, ValueError):
+            remove_aggregates(DATA_DIR, dataset_id)
+
+    return {
+        "dataset_id": dataset_id,
+        "partition": stored["seq"],
+        "row_count": stats.get("row_count"),
+        "duplicate": stored["duplicate"],
+    }
 
 # =========================
 # 데이터셋 목록 페이지
@@ -70,20 +214,29 @@ def home():
         {% endfor %}
     </ul>
     """
-    return render_template_string(html, datasets=DATASETS)
+    return render_template_string(html, datasets=CATALOG.all())
 
 # =========================
 # 데이터셋 상세 페이지
 # =========================
 @app.route("/dataset/<dataset_id>")
 def dataset_detail(dataset_id):
-    if dataset_id not in DATASETS:
+    dataset = CATALOG.get(dataset_id)
+    if dataset is None:
         return "Dataset not found", 404
 
-    dataset = DATASETS[dataset_id]
-    data_path = os.path.join(DATA_DIR, dataset["file"])
+    # 원본 + 추가 조사 회차 (추가 순서대로 이어 붙임)
+    paths = [os.path.join(DATA_DIR, f) for f in CATALOG.partition_files(dataset_id)]
+    if len(paths) == 1:
+        df = load_raw(paths[0])
+        key = FrameCache.file_key(paths[0])
+    else:
+        df = pd.concat([load_raw(p) for p in paths], ignore_index=True)
+        key = tuple(FrameCache.file_key(p) for p in paths)
 
-    df = read_csv_safe(data_path)
+    # 현재 페이지 구간만 렌더링
+    params = parse_page_args(request.args)
+    window, meta = RAW_VIEWS.page(key, df, params)
 
     html = """
     <h1>{{ dataset.name }}</h1>
@@ -91,15 +244,22 @@ def dataset_detail(dataset_id):
     <p><strong>Provider:</strong> {{ dataset.provider }}</p>
     <p><strong>License:</strong> {{ dataset.license }}</p>
 
-    <a href="/">← Back</a>
+    <p><strong>Rounds:</strong> {{ rounds }}</p>
+
+    <a href="/">← Back</a> |
+    <a href="/dataset/{{ dataset_id }}/append">➕ Append Sampling Round</a>
     <hr>
+    """ + PAGER_HTML + """
     {{ table | safe }}
     """
 
     return render_template_string(
         html,
         dataset=dataset,
-        table=df.to_html(index=False)
+        dataset_id=dataset_id,
+        rounds=len(paths),
+        table=window.to_html(index=False),
+        **pager_context(f"/dataset/{dataset_id}", df.columns, params, meta)
     )
 
 # =========================
@@ -118,21 +278,43 @@ def upload():
 
         dataset_id = os.path.splitext(file.filename)[0]
         save_path = os.path.join(DATA_DIR, file.filename)
-        file.save(save_path)
 
-        read_csv_safe(save_path)
+        # 대기 작업이 가득 차면 파일을 받기 전에 거절
+        if INGEST.full():
+            return "Server is busy, try again later", 503, {"Retry-After": "30"}
+
+        # 요청 안에서는 임시 파일 기록(크기 제한)만 → 나머지는 큐에서 처리
+        try:
+            tmp_path, stats = spool_upload(file.stream, save_path, max_bytes=UPLOAD_MAX_BYTES)
+        except UploadRejected as e:
+            return str(e), e.status
 
-        DATASETS[dataset_id] = {
+        # file 은 등록 시 blob 경로로 채움
+        record = {
             "name": name,
             "description": "Uploaded dataset",
             "provider": provider,
             "source": "User upload",
             "license": license_,
-            "file": file.filename
+            "original_file": file.filename
         }
+        try:
+            job = INGEST.submit(
+                dataset_id, ingest_upload, tmp_path, stats, dataset_id, record
+            )
+        except QueueFull:
+            os.remove(tmp_path)
+            return "Server is busy, try again later", 503, {"Retry-After": "30"}
 
-        save_datasets(DATASETS)
-        return redirect(url_for("home"))
+        html = """
+        <h1>⏳ Processing {{ name }}</h1>
+        <p>Job ID: <code>{{ job_id }}</code></p>
+        <a href="/jobs/{{ job_id }}">Status</a> |
+        <a href="/">← Back</a>
+        """
+        return render_template_string(html, name=name, job_id=job.id), 202, {
+            "Location": f"/jobs/{job.id}"
+        }
 
     html = """
     <h1>➕ Upload New Dataset</h1>
@@ -147,24 +329,96 @@ def upload():
     """
     return render_template_string(html)
 
+# =========================
+# 추가 조사 회차 업로드 (기존 데이터셋에 행 추가)
+# =========================
+@app.route("/dataset/<dataset_id>/append", methods=["GET", "POST"])
+def append(dataset_id):
+    dataset = CATALOG.get(dataset_id)
+    if dataset is None:
+        return "Dataset not found", 404
+
+    if request.method == "POST":
+        file = request.files.get("file")
+        if not file or not file.filename.endswith(".csv"):
+            return "Only CSV files are allowed", 400
+
+        if INGEST.full():
+            return "Server is busy, try again later", 503, {"Retry-After": "30"}
+
+        try:
+            tmp_path, stats = spool_upload(
+                file.stream, os.path.join(DATA_DIR, file.filename), max_bytes=UPLOAD_MAX_BYTES
+            )
+        except UploadRejected as e:
+            return str(e), e.status
+
+        # 헤더가 기존 회차와 다르면 이어 붙일 수 없음 (헤더 행만 읽어 바로 거절)
+        try:
+            header = pd.read_csv(tmp_path, encoding=stats["encoding"], nrows=0).columns
+        except (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError):
+            os.remove(tmp_path)
+            return "Cannot read CSV header", 400
+        columns = [normalize_header(c) for c in header]
+        expected = dataset["stats"]["columns"] or base_columns(dataset["file"])
+        if set(columns) != set(expected):
+            os.remove(tmp_path)
+            return "Columns do not match the existing dataset", 400
+
+        try:
+            job = INGEST.submit(
+                f"{dataset_id}+", append_upload, tmp_path, stats, dataset_id
+            )
+        except QueueFull:
+            os.remove(tmp_path)
+            return "Server is busy, try again later", 503, {"Retry-After": "30"}
+
+        html = """
+        <h1>⏳ Appending to {{ name }}</h1>
+        <p>Job ID: <code>{{ job_id }}</code></p>
+        <a href="/jobs/{{ job_id }}">Status</a> |
+        <a href="/dataset/{{ dataset_id }}">← Back</a>
+        """
+        return render_template_string(
+            html, name=dataset["name"], job_id=job.id, dataset_id=dataset_id
+        ), 202, {"Location": f"/jobs/{job.id}"}
+
+    html = """
+    <h1>➕ Append Sampling Round: {{ name }}</h1>
+    <p>Same columns as the existing dataset. Only the new rows are validated.</p>
+    <form method="post" enctype="multipart/form-data">
+        <p>CSV File:<br><input type="file" name="file" required></p>
+        <button type="submit">Append</button>
+    </form>
+    <a href="/dataset/{{ dataset_id }}">← Back</a>
+    """
+    return render_template_string(html, name=dataset["name"], dataset_id=dataset_id)
+
+# =========================
+# 업로드 작업 상태
+# =========================
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = INGEST.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
 # =========================
 # ❌ 데이터셋 삭제
 # =========================
 @app.route("/delete/<dataset_id>", methods=["POST"])
 def delete_dataset(dataset_id):
-    if dataset_id not in DATASETS:
+    # 메타데이터 삭제 (같은 내용을 쓰는 다른 데이터셋이 없으면 파일도 삭제)
+    dataset, released = CATALOG.release(dataset_id)
+    if dataset is None:
         return "Dataset not found", 404
 
-    dataset = DATASETS[dataset_id]
-
-    # CSV 파일 삭제
-    file_path = os.path.join(DATA_DIR, dataset["file"])
-    if os.path.exists(file_path):
-        os.remove(file_path)
-
-    # 메타데이터 삭제
-    del DATASETS[dataset_id]
-    save_datasets(DATASETS)
+    if released:
+        forget_file(dataset["file"])
+    for file in dataset["released_partitions"]:
+        forget_file(file)
+    remove_aggregates(DATA_DIR, dataset_id)
 
     return redirect(url_for("home"))
 
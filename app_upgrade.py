@@ -1,7 +1,14 @@
-from flask import Flask, render_template_string, request, redirect, Response
+from flask import Flask, render_template_string, request, redirect, Response, jsonify, abort
 import pandas as pd
+import numpy as np
 import os
-import json
+import sys
+import time
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlencode
 
 app = Flask(__name__)
 
@@ -15,34 +22,47 @@ STANDARD_FILE = os.path.join(BASE_DIR, "example_table2.csv")
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# =========================
-# 항목 그룹 정의
-# =========================
-ITEM_GROUPS = {
-    "중금속": [
-        "Cd(mg/kg)", "Cu(mg/kg)", "As(mg/kg)", "Hg(mg/kg)",
-        "Pb(mg/kg)", "Cr6+(mg/kg)", "Zn(mg/kg)", "Ni(mg/kg)"
-    ],
-    "유류": [
-        "Benzene", "Toluene", "Ethylbenzene", "Xylene", "TPH"
-    ],
-    "유기용제": [
-        "TCE", "PCE", "1,2DCA (1,2-디클로로에탄)"
-    ],
-    "기타": [
-        "F(mg/kg)", "PCBs(mg/kg)", "CN(mg/kg)", "Phenol(mg/kg)",
-        "Pentachlorophenol(mg/kg)", "Dioxin", "pH"
-    ]
-}
+# 공용 유틸 (US_military base/utils)
+sys.path.insert(0, os.path.join(BASE_DIR, "US_military base"))
+from utils.cache import FrameCache
+from utils.catalog import Catalog
+from utils.columnar import (
+    load_frame, open_sidecar, data_columns, table_frame, table_flags
+)
+from utils.standards import get_standards
+from utils.normalize import parse_numeric, numeric_flag_summary, SURVEY_TYPES, REGIONS
+from utils.paging import PagedView, PAGER_HTML, parse_page_args, pager_context, page_url
+from utils.materialize import load_summary
+from utils.metrics import Metrics
+from utils.aggregates import update_dataset_aggregates
+from utils.region_analysis import (
+    ITEM_GROUPS, prepared_columns, prepare_frame,
+    analyze_regions, analyze_surveys, aggregate_result, analysis_items, exceed_label
+)
+from utils.portfolio_worker import analyze_file, read_item_columns, slice_result
+from utils.indexes import RowIndex, load_index, save_index, parse_filter_args, filter_params, filter_key
+
+# 전처리 DataFrame 캐시 메모리 예산
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# CSV 다운로드 스트리밍 단위 (행)
+CSV_CHUNK_ROWS = 1000
+
+# 단계별 시간 / 지연 분위수 / 캐시 적중 수집 (/metrics, Server-Timing)
+# False 면 요청 훅을 등록하지 않음 → 계측 비용 없음
+METRICS_ENABLED = True
+
+# JSON API 응답 캐시 정책 (ETag 로 재검증 → 바뀌지 않았으면 304)
+API_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+# 포트폴리오(전체 데이터셋) 분석 프로세스 수
+PORTFOLIO_WORKERS = os.cpu_count() or 2
 
 # =========================
 # CSV 로딩
 # =========================
-def read_csv_safe(path):
-    try:
-        return pd.read_csv(path, encoding="utf-8")
-    except UnicodeDecodeError:
-        return pd.read_csv(path, encoding="cp949")
+def read_csv_safe(path, encoding):
+    return pd.read_csv(path, encoding=encoding)
 
 def normalize_columns(df):
     df.columns = (
@@ -54,125 +74,396 @@ def normalize_columns(df):
     return df
 
 # =========================
-# 조사구분 / 지역
-# =========================
-def get_survey_column(df):
-    for c in df.columns:
-        if "조사구분" in c:
-            return c
-    return None
-
-def normalize_survey_type(v):
-    if pd.isna(v):
-        return None
-    v = str(v)
-    if "개황" in v:
-        return "A"
-    if "정밀" in v or "상세" in v:
-        return "B"
-    return None
-
-def normalize_region(v):
-    if pd.isna(v):
-        return None
-    v = str(v)
-    if "1" in v:
-        return "1지역"
-    if "2" in v:
-        return "2지역"
-    if "3" in v:
-        return "3지역"
-    return None
-
-# =========================
-# 숫자 정규화
-# =========================
-def normalize_numeric_series(s):
-    cleaned = (
-        s.astype(str)
-         .str.replace("－", "", regex=False)
-         .str.replace(r"[^0-9eE\.\+\-]", "", regex=True)
-         .str.strip()
-         .replace("", pd.NA)
-    )
-    return pd.to_numeric(cleaned, errors="coerce")
+# 기준 로딩 (컴파일된 기준표 레지스트리)
+# =========================
+def load_standards(path=STANDARD_FILE):
+    """
+    (지역 × 기준종류 × 항목) 기준 배열
+    파일이 바뀔 때만 다시 파싱 → 요청마다 stat 1회
+    """
+    return get_standards(path)
 
 # =========================
-# 기준 로딩
+# 메타데이터
 # =========================
-def load_standards(path):
-    df = normalize_columns(read_csv_safe(path))
-    standards = {}
-    for _, r in df.iterrows():
-        region = str(r.iloc[0]).strip()
-        criteria_raw = str(r.iloc[1]).strip()
-        if not region or not criteria_raw:
-            continue
-        criteria = "우려40" if "40" in criteria_raw else "우려기준"
-        standards.setdefault(region, {})
-        standards[region].setdefault(criteria, {})
-        for col in df.columns[2:]:
-            standards[region][criteria][col] = r[col]
-    return standards
-
-STANDARDS = load_standards(STANDARD_FILE) if os.path.exists(STANDARD_FILE) else {}
+# app.py 와 같은 SQLite 카탈로그 공유 → 업로드/삭제가 재시작 없이 반영
+CATALOG_DB = os.path.join(BASE_DIR, "datasets.db")
+CATALOG = Catalog(CATALOG_DB, legacy_json=META_FILE, data_dir=DATA_DIR)
 
 # =========================
-# 메타데이터
+# 데이터셋 캐시 (파싱 1회 → 모든 라우트 공유)
 # =========================
-def load_datasets():
-    if os.path.exists(META_FILE):
-        with open(META_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+DATASET_CACHE = FrameCache(max_bytes=CACHE_MAX_BYTES)
+
+METRICS = Metrics(enabled=METRICS_ENABLED)
+METRICS.register_cache("dataset", DATASET_CACHE)
+METRICS.install(app)
+
+# 원본 보기 정렬/필터 결과 (행 위치) 캐시
+RAW_VIEWS = PagedView()
+
+def dataset_path(dataset_id):
+    dataset = CATALOG.get(dataset_id)
+    if dataset is None:
+        abort(404)
+    return os.path.join(DATA_DIR, dataset["file"])
+
+def dataset_paths(dataset_id):
+    """[원본 파일, 추가 조사 회차 파일 ...] (추가 순서)"""
+    files = CATALOG.partition_files(dataset_id)
+    if not files:
+        abort(404)
+    return [os.path.join(DATA_DIR, f) for f in files]
+
+def view_key(paths):
+    """원본 보기 캐시 키 (파티션 전체)"""
+    if len(paths) == 1:
+        return FrameCache.file_key(paths[0])
+    return tuple(FrameCache.file_key(p) for p in paths)
+
+def read_encoded(path, read):
+    """
+    read(encoding) 실행: 카탈로그 기록값 → 없으면 앞부분 표본으로 판별 후 기록
+    뒤쪽에서 디코딩에 실패하면 다음 후보로 1회 다시 읽고 기록
+    """
+    return CATALOG.read_encoded(os.path.relpath(path, DATA_DIR), read)
+
+def _read_source(path):
+    return read_encoded(path, lambda enc: read_csv_safe(path, enc))
+
+def _read_columns(path, items):
+    """
+    사이드카가 없을 때: 헤더 행만 읽어 정리된 이름을 맞춘 뒤 필요한 컬럼만 파싱
+    """
+    return read_encoded(path, lambda enc: read_item_columns(path, items, enc))
+
+def _load_raw(path):
+    """열 단위 사이드카에서 읽음 (없거나 원본이 바뀌었으면 원본 파싱 후 생성)"""
+    with METRICS.stage("read"):
+        df, nbytes = load_frame(path, lambda: _read_source(path))
+        df = normalize_columns(df)
+    METRICS.add_bytes_read(nbytes)
+    return df
 
-DATASETS = load_datasets()
+def _load_prepared(path, items=None):
+    """
+    items: 읽을 항목 (None: 사전 계산 항목 전체 = 기준표 항목 + 화면 항목 그룹)
+    조사구분 / 지역 / 지점 + items 컬럼만 읽음
+    """
+    items = analysis_items(load_standards()) if items is None else list(items)
+    table = open_sidecar(path)
+    raw = DATASET_CACHE.peek(path, stage="raw")
+
+    with METRICS.stage("read"):
+        if table is not None:
+            # memory-map 에서 필요한 컬럼만 변환 (수치 항목은 이미 해석됨)
+            columns = prepared_columns(data_columns(table), items)
+            df = table_frame(table, columns)
+            nbytes = sum(table.column(c).nbytes for c in columns)
+        elif raw is not None:
+            df = raw[prepared_columns(raw.columns, items)].copy()
+            nbytes = 0
+        else:
+            df = _read_columns(path, items)
+            nbytes = os.path.getsize(path)
+    METRICS.add_bytes_read(nbytes)
+
+    with METRICS.stage("normalize"):
+        return prepare_frame(df, items)
+
+def load_raw(path):
+    """헤더만 정리된 원본 (읽기 전용)"""
+    return DATASET_CACHE.get_or_load(path, _load_raw, stage="raw")
+
+def load_flags(path, items):
+    """
+    {항목: 해석 플래그} (사이드카에 저장된 값 우선, 없으면 원본 값 해석)
+    """
+    table = open_sidecar(path)
+    stored = table_flags(table, items) if table is not None else {}
+    df = load_raw(path)
+
+    flags = {}
+    for c in items:
+        if c in stored:
+            flags[c] = stored[c]
+        elif c in df.columns:
+            flags[c] = parse_numeric(df[c])[1]
+    return flags
+
+def _load_row_index(path):
+    index = load_index(path)
+    if index is None:
+        # 수집 시 만들지 못한 파일 (이전 업로드 등) → 1번 생성 후 저장
+        index = RowIndex(load_raw(path))
+        save_index(path, index)
+    return index
+
+def load_row_index(path):
+    """조사구역 / 채취일 / 깊이 / 토지이용도 / 지점 행 인덱스"""
+    return DATASET_CACHE.get_or_load(path, _load_row_index, stage="index")
+
+def select_partitions(paths, loader, filters):
+    """
+    파티션별 loader 결과에서 필터 조건 행만 인덱스로 골라 이어 붙임
+    (조건이 없으면 load_partitions 와 같음)
+    """
+    if not filters:
+        return load_partitions(paths, loader)
+    frames = [loader(p).iloc[load_row_index(p).select(filters)] for p in paths]
+    return pd.concat(frames, ignore_index=True)
+
+def load_partition_flags(paths, items):
+    """파티션별 load_flags 를 항목마다 이어 붙임"""
+    parts = [load_flags(p, items) for p in paths]
+    return {
+        c: np.concatenate([f[c] for f in parts if c in f])
+        for c in items if any(c in f for f in parts)
+    }
+
+def load_prepared(path, items=None):
+    """
+    조사구분/지역/수치 정규화까지 끝난 DataFrame (읽기 전용)
+    items 를 주면 그 항목 컬럼만 읽음 (전체 결과가 캐시에 있으면 그대로 사용)
+    → 항목별 결과는 분석 캐시에 보관되므로 여기서는 캐시하지 않음
+    """
+    version = load_standards().version
+    if items is not None:
+        cached = DATASET_CACHE.peek(path, stage="prepared", version=version)
+        return cached if cached is not None else _load_prepared(path, items)
+    return DATASET_CACHE.get_or_load(path, _load_prepared, stage="prepared", version=version)
+
+def load_partitions(paths, loader):
+    """
+    파티션별 loader 결과를 이어 붙임 (파티션 1개면 캐시 항목 그대로)
+    원본 보기 / 로그 페이지용 → 분석은 누적 집계 사용
+    """
+    if len(paths) == 1:
+        return loader(paths[0])
+    return pd.concat([loader(p) for p in paths], ignore_index=True)
 
 # =========================
 # 분석 로직
 # =========================
-def get_site_series(df):
-    if "시료명" in df.columns:
-        return df["시료명"].astype(str)
-    if "지점명" in df.columns:
-        return df["지점명"].astype(str)
-    return None
-
-def is_exceed(row, item, region):
-    v = row[item]
-    if pd.isna(v):
-        return False
-    std = STANDARDS.get(region, {}).get("우려기준", {}).get(item)
-    try:
-        return v > float(std)
-    except:
-        return False
-
 def analyze_dataset(df, items):
-    site = get_site_series(df)
-    out = []
+    """항목 × 지역 결과표 (현재 기준표)"""
+    return analyze_regions(df, items, load_standards())
 
-    for item in items:
-        r = {"항목": item}
+# =========================
+# 분석 결과 캐시 (분석 페이지 ↔ 다운로드 공유)
+# =========================
+def compute_analysis(path, items):
+    """
+    (개황 A, 정밀 B) 분석 결과 계산
+    업로드 시 저장된 전체 항목 결과가 유효하면 행만 추출
+    """
+    with METRICS.stage("summary"):
+        stored = load_summary(path, load_standards().version, items)
+        if stored is not None:
+            return (slice_result(stored["A"], items), slice_result(stored["B"], items))
+
+    # 선택 항목 컬럼만 읽음
+    df = load_prepared(path, items)
+    with METRICS.stage("analyze"):
+        return analyze_surveys(df, items, load_standards())
 
-        if item not in df.columns:
-            for region in ["1지역", "2지역", "3지역"]:
-                r[f"{region}_지점수"] = 0
-                r[f"{region}_최고"] = None
-                r[f"{region}_우려초과_지점수"] = 0
-            out.append(r)
-            continue
+# =========================
+# 추가 조사 회차 (파티션별 누적 집계)
+# =========================
+def dataset_aggregates(dataset_id, paths):
+    """
+    파티션 순서대로 누적한 집계
+    저장된 집계 이후 추가된 파티션만 전처리 / 반영 → 새 행 수에 비례
+    """
+    std = load_standards()
+    with METRICS.stage("analyze"):
+        return update_dataset_aggregates(
+            DATA_DIR, dataset_id, paths, std, analysis_items(std), load_prepared
+        )
+
+def compute_partitioned(dataset_id, paths, items):
+    agg = dataset_aggregates(dataset_id, paths)
+    with METRICS.stage("summary"):
+        return (aggregate_result(agg, "A", items), aggregate_result(agg, "B", items))
+
+def compute_filtered(paths, items, filters):
+    """필터 조건 행만 (인덱스로 선택) 분석"""
+    df = select_partitions(paths, lambda path: load_prepared(path, items), filters)
+    with METRICS.stage("analyze"):
+        return analyze_surveys(df, items, load_standards())
+
+def analysis_results(dataset_id, items, filters=None):
+    """
+    (개황 A, 정밀 B) 분석 결과 (읽기 전용)
+    (데이터셋 파일, 기준표 버전, 항목) 단위로 캐시
+    추가 조사 회차가 있으면 (데이터셋, 파티션 목록) 단위 → 누적 집계에서 계산
+    filters(parse_filter_args): 조건에 맞는 행만 분석 (조건별로 캐시)
+    """
+    paths = dataset_paths(dataset_id)
+    if filters:
+        return DATASET_CACHE.get_or_load(
+            paths[-1], lambda _: compute_filtered(paths, items, filters),
+            stage=("analysis", dataset_id, tuple(items), filter_key(filters)),
+            version=(load_standards().version, view_key(paths))
+        )
+    if len(paths) == 1:
+        return DATASET_CACHE.get_or_load(
+            paths[0], lambda path: compute_analysis(path, items),
+            stage=("analysis", tuple(items)), version=load_standards().version
+        )
+    return DATASET_CACHE.get_or_load(
+        paths[-1], lambda _: compute_partitioned(dataset_id, paths, items),
+        stage=("analysis", dataset_id, tuple(items)),
+        version=(load_standards().version, view_key(paths))
+    )
+
+def make_etag(*key):
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
 
-        for region in ["1지역", "2지역", "3지역"]:
-            sub = df[df["_지역"] == region]
-            r[f"{region}_지점수"] = site.loc[sub.index].nunique() if site is not None else len(sub)
-            r[f"{region}_최고"] = None if sub[item].isna().all() else float(sub[item].max())
-            ex = sub[sub.apply(lambda x: is_exceed(x, item, region), axis=1)]
-            r[f"{region}_우려초과_지점수"] = site.loc[ex.index].nunique() if site is not None else len(ex)
+def analysis_etag(dataset_id, items, filters=None):
+    key = (view_key(dataset_paths(dataset_id)), load_standards().version, tuple(items))
+    if filters:
+        key += (filter_key(filters),)
+    return make_etag(*key)
 
-        out.append(r)
+# =========================
+# 포트폴리오 분석 (전체 데이터셋 → 1개 표)
+# =========================
+_PORTFOLIO_POOL = None
+_PORTFOLIO_POOL_LOCK = threading.Lock()
+
+def portfolio_pool():
+    """
+    PORTFOLIO_WORKERS 개 프로세스 풀 1개 (처음 사용할 때 생성 → 종료하지 않고 재사용)
+    요청별 프로세스 수는 portfolio_map 에서 제한
+    (spawn: 요청 처리 스레드가 잡고 있는 잠금을 fork 로 복제하지 않음)
+    """
+    global _PORTFOLIO_POOL
+    with _PORTFOLIO_POOL_LOCK:
+        if _PORTFOLIO_POOL is None:
+            _PORTFOLIO_POOL = ProcessPoolExecutor(
+                max_workers=PORTFOLIO_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _PORTFOLIO_POOL
+
+def portfolio_map(tasks, workers):
+    """
+    tasks: analyze_file 인자 목록 → 결과 (같은 순서)
+    한 요청이 동시에 넣는 작업은 workers 개까지 (하나가 끝나면 다음 작업 제출)
+    """
+    pool = portfolio_pool()
+    outputs = [None] * len(tasks)
+    queue = list(enumerate(tasks))[::-1]
+    running = {}
+    while queue or running:
+        while queue and len(running) < workers:
+            i, args = queue.pop()
+            running[pool.submit(analyze_file, *args)] = i
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            outputs[running.pop(future)] = future.result()
+    return outputs
+
+def portfolio_table(results, datasets, levels):
+    """
+    데이터셋별 (A, B) 결과 → 긴 형식 1개 표
+    (데이터셋, 조사구분, 항목, 지역, 지점수, 최고, 기준종류별 초과 지점수)
+    levels: 기준표 기준종류 (우려40 / 우려기준 / 대책기준)
+    """
+    exceed = [exceed_label(level) for level in levels]
+    frames = []
+    for dataset_id, pair in results.items():
+        for survey, frame in zip(SURVEY_TYPES, pair):
+            for region in REGIONS:
+                part = pd.DataFrame({
+                    "데이터셋": dataset_id,
+                    "데이터셋명": datasets[dataset_id]["name"],
+                    "조사구분": survey,
+                    "항목": frame["항목"],
+                    "지역": region,
+                    "지점수": frame[f"{region}_지점수"],
+                    "최고": frame[f"{region}_최고"],
+                    **{c: frame[f"{region}_{c}"] for c in exceed},
+                })
+                frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=[
+            "데이터셋", "데이터셋명", "조사구분", "항목", "지역",
+            "지점수", "최고", *exceed
+        ])
+    return pd.concat(frames, ignore_index=True)
+
+def portfolio_analysis(items, workers=PORTFOLIO_WORKERS, serial=False, use_cache=True):
+    """
+    등록된 모든 데이터셋 분석 → (병합 표, 실행 정보)
+
+    - 이 프로세스에 캐시된 결과는 그대로 사용, 나머지만 프로세스 풀로 분산
+    - 같은 파일(내용이 같은 blob)을 쓰는 데이터셋은 1번만 계산
+    - serial_s: 데이터셋별 계산 시간 합 (직렬 실행 기준선)
+    """
+    start = time.perf_counter()
+    datasets = CATALOG.all()
+    version = load_standards().version
+    stage = ("analysis", tuple(items))
+
+    results, pending = {}, {}
+    for dataset_id, ds in datasets.items():
+        path = os.path.join(DATA_DIR, ds["file"])
+        if not os.path.exists(path):
+            continue
+        # 추가 조사 회차가 있으면 누적 집계 (새 파티션만 계산)
+        if len(CATALOG.partition_files(dataset_id)) > 1:
+            results[dataset_id] = analysis_results(dataset_id, items)
+            continue
+        cached = DATASET_CACHE.peek(path, stage=stage, version=version) if use_cache else None
+        if cached is not None:
+            results[dataset_id] = cached
+        else:
+            pending.setdefault(path, []).append(dataset_id)
+    cached_count = len(results)
+
+    task_seconds = 0.0
+    paths = list(pending)
+    workers = min(max(1, workers), PORTFOLIO_WORKERS)
+    tasks = [
+        (path, items, STANDARD_FILE, CATALOG.encoding_of(os.path.relpath(path, DATA_DIR)))
+        for path in paths
+    ]
+    if serial or workers <= 1 or len(paths) <= 1:
+        outputs = [analyze_file(*args) for args in tasks]
+    else:
+        outputs = portfolio_map(tasks, workers)
+
+    for (path, _, _, recorded), (result, seconds, encoding) in zip(tasks, outputs):
+        task_seconds += seconds
+        if encoding is not None and encoding != recorded:
+            CATALOG.set_encoding(os.path.relpath(path, DATA_DIR), encoding)
+        if use_cache:
+            DATASET_CACHE.put(FrameCache.file_key(path, stage, version), result)
+        for dataset_id in pending[path]:
+            results[dataset_id] = result
+
+    # 카탈로그 순서 유지
+    results = {k: results[k] for k in datasets if k in results}
+    wall = time.perf_counter() - start
+
+    info = {
+        "datasets": len(results),
+        "computed": len(paths),
+        "cached": cached_count,
+        "workers": 1 if serial else workers,
+        "wall_s": round(wall, 4),
+        "serial_s": round(task_seconds, 4),
+        "speedup": round(task_seconds / wall, 2) if wall > 0 and task_seconds > 0 else None,
+    }
+    return portfolio_table(results, datasets, load_standards().levels), info
 
-    return pd.DataFrame(out).where(pd.notna, None)
+def iter_csv(df, chunk_rows=CSV_CHUNK_ROWS):
+    """헤더 → 행 구간 순서로 CSV 텍스트 생성 (전체 문자열을 만들지 않음)"""
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False)
 
 # =========================
 # 홈
@@ -191,45 +482,47 @@ def home():
       </li>
     {% endfor %}
     </ul>
-    """, datasets=DATASETS)
+    """, datasets=CATALOG.all())
 
 # =========================
 # 원본
 # =========================
 @app.route("/dataset/<dataset_id>")
 def dataset_detail(dataset_id):
-    df = normalize_columns(read_csv_safe(os.path.join(DATA_DIR, DATASETS[dataset_id]["file"])))
+    paths = dataset_paths(dataset_id)
+    df = load_partitions(paths, load_raw)
+
+    # 페이지 구간만 렌더링 (정렬/필터 결과는 RAW_VIEWS 에 캐시)
+    params = parse_page_args(request.args)
+    window, meta = RAW_VIEWS.page(view_key(paths), df, params)
+
     return render_template_string("""
     <a href="/">🏠 Data Hub 홈으로</a>
     <h2>원본 데이터</h2>
+    """ + PAGER_HTML + """
     {{ table|safe }}
-    """, table=df.to_html(index=False))
+    """,
+    table=window.to_html(index=False),
+    **pager_context(f"/dataset/{dataset_id}", df.columns, params, meta)
+    )
 
 # =========================
 # 분석
 # =========================
 @app.route("/dataset/<dataset_id>/analysis")
 def dataset_analysis(dataset_id):
-    df = normalize_columns(read_csv_safe(os.path.join(DATA_DIR, DATASETS[dataset_id]["file"])))
-
-    survey_col = get_survey_column(df)
-    df["_조사"] = df[survey_col].apply(normalize_survey_type)
-    df["_지역"] = df["지목(1/2/3)"].apply(normalize_region)
-
-    all_items = list(STANDARDS["1지역"]["우려기준"].keys())
-    for c in all_items:
-        if c in df.columns:
-            df[c] = normalize_numeric_series(df[c])
+    all_items = list(load_standards().items)
 
     selected = request.args.getlist("items")
     use_items = selected if selected else all_items
+    filters = parse_filter_args(request.args)
 
-    df_A = df[df["_조사"] == "A"]
-    df_B = df[df["_조사"] == "B"]
+    A, B = analysis_results(dataset_id, use_items, filters)
 
-    A = analyze_dataset(df_A, use_items)
-    B = analyze_dataset(df_B, use_items)
+    with METRICS.stage("render"):
+        return render_analysis_page(dataset_id, use_items, A, B, filter_params(request.args))
 
+def render_analysis_page(dataset_id, use_items, A, B, filter_args=()):
     return render_template_string("""
     <a href="/">🏠 Data Hub 홈으로</a>
     <h2>📊 분석</h2>
@@ -258,7 +551,16 @@ def dataset_analysis(dataset_id):
           {% endfor %}
         </tr>
       </table>
-      <br>
+      <p>
+        조사구역 <input name="area" value="{{ f.area }}" size="8">
+        토지이용도 <input name="land_use" value="{{ f.land_use }}" size="8">
+        지점/시료명 <input name="site" value="{{ f.site }}" size="10">
+        심도 <input name="depth_level" value="{{ f.depth_level }}" size="3">
+        | 채취일 <input name="date_from" value="{{ f.date_from }}" placeholder="2025-10-01" size="10">
+        ~ <input name="date_to" value="{{ f.date_to }}" placeholder="2025-12-31" size="10">
+        | 깊이(m) <input name="depth_min" value="{{ f.depth_min }}" size="4">
+        ~ <input name="depth_max" value="{{ f.depth_max }}" size="4">
+      </p>
       <button>선택 항목 보기</button>
     </form>
 
@@ -266,6 +568,9 @@ def dataset_analysis(dataset_id):
       {% for item in selected %}
         <input type="hidden" name="items" value="{{ item }}">
       {% endfor %}
+      {% for name, value in filter_args %}
+        <input type="hidden" name="{{ name }}" value="{{ value }}">
+      {% endfor %}
       <button type="submit">📥 CSV 다운로드</button>
     </form>
 
@@ -288,6 +593,8 @@ def dataset_analysis(dataset_id):
     ITEM_GROUPS=ITEM_GROUPS,
     selected=use_items,
     dataset_id=dataset_id,
+    filter_args=filter_args,
+    f=dict(filter_args),
     A=A.to_html(index=False),
     B=B.to_html(index=False)
     )
@@ -297,37 +604,34 @@ def dataset_analysis(dataset_id):
 # =========================
 @app.route("/dataset/<dataset_id>/download")
 def dataset_download(dataset_id):
-    df = normalize_columns(read_csv_safe(os.path.join(DATA_DIR, DATASETS[dataset_id]["file"])))
-
-    survey_col = get_survey_column(df)
-    df["_조사"] = df[survey_col].apply(normalize_survey_type)
-    df["_지역"] = df["지목(1/2/3)"].apply(normalize_region)
-
-    all_items = list(STANDARDS["1지역"]["우려기준"].keys())
-    for c in all_items:
-        if c in df.columns:
-            df[c] = normalize_numeric_series(df[c])
+    all_items = list(load_standards().items)
 
     selected = request.args.getlist("items")
     use_items = selected if selected else all_items
+    filters = parse_filter_args(request.args)
 
-    df_A = df[df["_조사"] == "A"]
-    df_B = df[df["_조사"] == "B"]
+    # 같은 (데이터셋, 기준표, 항목, 필터) → 같은 ETag → 304
+    etag = analysis_etag(dataset_id, use_items, filters)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
 
-    result_A = analyze_dataset(df_A, use_items)
-    result_B = analyze_dataset(df_B, use_items)
+    # 분석 페이지에서 계산한 결과 재사용 (캐시 원본은 수정하지 않음)
+    result_A, result_B = analysis_results(dataset_id, use_items, filters)
+    result_A = result_A.copy()
+    result_B = result_B.copy()
 
     result_A.insert(0, "조사구분", "개황(A)")
     result_B.insert(0, "조사구분", "정밀(B)")
 
     final_df = pd.concat([result_A, result_B], ignore_index=True)
-    csv_data = final_df.to_csv(index=False, encoding="utf-8-sig")
 
+    # generator → chunked 전송
     return Response(
-        csv_data,
+        iter_csv(final_df),
         mimetype="text/csv; charset=utf-8",
         headers={
-            "Content-Disposition": f"attachment; filename={dataset_id}_analysis.csv"
+            "Content-Disposition": f"attachment; filename={dataset_id}_analysis.csv",
+            "ETag": f'"{etag}"',
         }
     )
 
@@ -337,10 +641,15 @@ def dataset_download(dataset_id):
 # =========================
 @app.route("/dataset/<dataset_id>/log")
 def dataset_log(dataset_id):
-    df = normalize_columns(read_csv_safe(os.path.join(DATA_DIR, DATASETS[dataset_id]["file"])))
-    df["_지역"] = df["지목(1/2/3)"].apply(normalize_region)
+    paths = dataset_paths(dataset_id)
+    df = load_partitions(paths, load_prepared)
     fail = df[df["_지역"].isna()]
 
+    # 원본 값 기준 검출한계 미만 / 해석 불가 칸 수 (분석에서는 NaN 처리)
+    items = list(load_standards().items)
+    flags = numeric_flag_summary(load_partition_flags(paths, items))
+    flags = flags[(flags["검출한계 미만"] > 0) | (flags["해석 불가"] > 0)]
+
     return render_template_string("""
     <a href="/">🏠 Data Hub 홈으로</a>
     <h2>⚠ 로그 (지역 매칭 실패)</h2>
@@ -349,11 +658,165 @@ def dataset_log(dataset_id):
     {% else %}
       <p>문제 없음</p>
     {% endif %}
+
+    <h2>⚠ 수치 값 (검출한계 미만 / 해석 불가)</h2>
+    {% if f %}
+      {{ f|safe }}
+    {% else %}
+      <p>문제 없음</p>
+    {% endif %}
     """,
     t=fail[["지목(1/2/3)"]].drop_duplicates().to_html(index=False)
-      if not fail.empty else None
+      if not fail.empty else None,
+    f=flags.to_html(index=False) if not flags.empty else None
+    )
+
+# =========================
+# 포트폴리오 (전체 데이터셋)
+# =========================
+@app.route("/portfolio")
+def portfolio():
+    all_items = list(load_standards().items)
+
+    selected = request.args.getlist("items")
+    use_items = selected if selected else all_items
+    # 요청 값은 1 ~ PORTFOLIO_WORKERS 범위로 제한 (프로세스 수 상한)
+    workers = request.args.get("workers", PORTFOLIO_WORKERS, type=int)
+    workers = min(max(1, workers), PORTFOLIO_WORKERS)
+
+    table, info = portfolio_analysis(use_items, workers=workers)
+
+    if request.args.get("format") == "csv":
+        return Response(
+            iter_csv(table),
+            mimetype="text/csv; charset=utf-8",
+            headers={"Content-Disposition": "attachment; filename=portfolio_analysis.csv"}
+        )
+
+    return render_template_string("""
+    <a href="/">🏠 Data Hub 홈으로</a>
+    <h2>📊 전체 데이터셋 분석</h2>
+    <p>
+      데이터셋 {{ info.datasets }}개 (계산 {{ info.computed }} / 캐시 {{ info.cached }}) ·
+      프로세스 {{ info.workers }}개 ·
+      소요 {{ info.wall_s }}초 (직렬 기준 {{ info.serial_s }}초, {{ info.speedup }}배)
+    </p>
+    <a href="{{ csv_url }}">📥 CSV 다운로드</a>
+    <hr>
+    {{ table|safe }}
+    """,
+    info=info,
+    csv_url="/portfolio?" + urlencode(
+        {"items": selected, "workers": workers, "format": "csv"}, doseq=True
+    ),
+    table=table.to_html(index=False)
     )
 
+# =========================
+# JSON API (ETag / 조건부 요청)
+# =========================
+def api_response(etag, build):
+    """
+    If-None-Match 가 ETag 와 같으면 304 (build 호출 없음)
+    아니면 build() 결과를 JSON 으로 (ETag / Cache-Control 포함)
+    """
+    headers = {"ETag": f'"{etag}"', "Cache-Control": API_CACHE_CONTROL}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    response = jsonify(build())
+    response.headers.update(headers)
+    return response
+
+def api_error(message, status):
+    return jsonify({"error": message}), status
+
+def json_records(df):
+    """DataFrame → 행 dict 목록 (NaN → null)"""
+    return df.astype(object).where(pd.notna(df), None).to_dict("records")
+
+@app.route("/api/datasets")
+def api_datasets():
+    datasets = CATALOG.all()
+    partitions = CATALOG.partition_stats()
+
+    out = []
+    for k, ds in datasets.items():
+        extra = partitions.get(k, {"partitions": 0, "row_count": 0})
+        rows = ds["stats"]["row_count"]
+        out.append({
+            "id": k,
+            "name": ds["name"],
+            "provider": ds.get("provider"),
+            "license": ds.get("license"),
+            "sha256": ds["stats"]["sha256"],
+            "row_count": None if rows is None else rows + extra["row_count"],
+            "rounds": 1 + extra["partitions"],
+        })
+    return api_response(make_etag(out), lambda: {"datasets": out})
+
+@app.route("/api/datasets/<dataset_id>/analysis")
+def api_dataset_analysis(dataset_id):
+    if CATALOG.get(dataset_id) is None:
+        return api_error("Dataset not found", 404)
+
+    items = request.args.getlist("items") or list(load_standards().items)
+    survey = request.args.get("survey")
+    if survey is not None and survey not in SURVEY_TYPES:
+        return api_error(f"survey must be one of {', '.join(SURVEY_TYPES)}", 400)
+    surveys = [survey] if survey else SURVEY_TYPES
+    filters = parse_filter_args(request.args)
+
+    def build():
+        results = dict(zip(SURVEY_TYPES, analysis_results(dataset_id, items, filters)))
+        return {
+            "dataset": dataset_id,
+            "items": items,
+            "filters": dict(filter_params(request.args)),
+            "results": {s: json_records(results[s]) for s in surveys},
+        }
+
+    etag = make_etag(
+        view_key(dataset_paths(dataset_id)), load_standards().version, tuple(items), tuple(surveys),
+        filter_key(filters)
+    )
+    return api_response(etag, build)
+
+@app.route("/api/datasets/<dataset_id>/rows")
+def api_dataset_rows(dataset_id):
+    if CATALOG.get(dataset_id) is None:
+        return api_error("Dataset not found", 404)
+
+    paths = dataset_paths(dataset_id)
+    params = parse_page_args(request.args)
+    filters = parse_filter_args(request.args)
+
+    def build():
+        # 조사구역 / 채취일 / 깊이 등은 인덱스로 행 선택 후 정렬 / 페이지
+        df = select_partitions(paths, load_raw, filters)
+        window, meta = RAW_VIEWS.page((view_key(paths), filter_key(filters)), df, params)
+        next_url = None
+        if meta["page"] < meta["pages"]:
+            next_url = page_url(f"/api/datasets/{dataset_id}/rows", params, page=meta["page"] + 1)
+            if filters:
+                next_url += "&" + urlencode(filter_params(request.args))
+        return {
+            "dataset": dataset_id,
+            "columns": [str(c) for c in df.columns],
+            "rows": json_records(window),
+            "page": meta,
+            "next": next_url,
+        }
+
+    etag = make_etag(view_key(paths), sorted(params.items()), filter_key(filters))
+    return api_response(etag, build)
+
+# =========================
+# 캐시 통계
+# =========================
+@app.route("/cache/stats")
+def cache_stats():
+    return jsonify(DATASET_CACHE.stats())
+
 # =========================
 # 실행
 # =========================
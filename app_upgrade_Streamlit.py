@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
 import os
-import json
-from io import BytesIO
+import sys
 from datetime import datetime
 
 # =========================
@@ -15,6 +14,28 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 META_FILE = os.path.join(BASE_DIR, "datasets.json")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 공용 유틸 (US_military base/utils)
+sys.path.insert(0, os.path.join(BASE_DIR, "US_military base"))
+from utils.normalize import map_unique, normalize_numeric_series, SURVEY_TYPES, REGIONS
+from utils.catalog import Catalog, dataset_stats, frame_stats, file_sha256
+from utils.export import xlsx_bytes, XLSX_MIME
+from utils.columnar import load_frame, remove_sidecar
+from utils.materialize import remove_summary
+from utils.indexes import remove_index
+from utils.aggregates import remove_aggregates
+
+# datasets.json → SQLite 카탈로그 (최초 1회 자동 이관)
+CATALOG = Catalog(os.path.join(BASE_DIR, "datasets.db"), legacy_json=META_FILE, data_dir=DATA_DIR)
+
+
+def forget_files(files):
+    """참조가 끊겨 삭제된 파일의 파생 파일 (요약 / 사이드카 / 행 인덱스) 정리"""
+    for file in files:
+        path = os.path.join(DATA_DIR, file)
+        remove_summary(path)
+        remove_sidecar(path)
+        remove_index(path)
+
 # =========================
 # 항목 그룹 (도메인 정의)
 # =========================
@@ -31,28 +52,14 @@ ALL_ITEMS = [i for g in ITEM_GROUPS.values() for i in g]
 # =========================
 # 공통 유틸
 # =========================
-def load_datasets():
-    if os.path.exists(META_FILE):
-        with open(META_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def save_datasets(d):
-    with open(META_FILE, "w", encoding="utf-8") as f:
-        json.dump(d, f, ensure_ascii=False, indent=2)
-
-def read_table(path):
+def read_table(path, encoding=None):
+    """
+    encoding: 카탈로그에 기록된 값 (없으면 앞부분 표본으로 판별 후 기록)
+    """
     if path.endswith(".xlsx"):
         return pd.read_excel(path)
-    try:
-        return pd.read_csv(path, encoding="utf-8")
-    except:
-        return pd.read_csv(path, encoding="cp949")
-
-def normalize_numeric_series(s):
-    return pd.to_numeric(
-        s.astype(str).str.replace(r"[^0-9eE\.\+\-]", "", regex=True),
-        errors="coerce"
+    return CATALOG.read_encoded(
+        os.path.relpath(path, DATA_DIR), lambda enc: pd.read_csv(path, encoding=enc), encoding
     )
 
 def get_survey_column(df):
@@ -85,7 +92,7 @@ def normalize_region(v):
 # =========================
 def render_dataset_manager():
     st.sidebar.title("🗂 데이터 관리")
-    datasets = load_datasets()
+    datasets = CATALOG.all()
 
     # ➕ 업로드
     st.sidebar.subheader("➕ 데이터 추가")
@@ -94,11 +101,16 @@ def render_dataset_manager():
         name = st.sidebar.text_input("데이터 이름", uploaded.name)
         if st.sidebar.button("업로드 저장"):
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fname = f"{ts}{os.path.splitext(uploaded.name)[1]}"
-            with open(os.path.join(DATA_DIR, fname), "wb") as f:
+            ext = os.path.splitext(uploaded.name)[1].lower()
+            path = os.path.join(DATA_DIR, f"{ts}.upload{ext}")
+            with open(path, "wb") as f:
                 f.write(uploaded.getbuffer())
-            datasets[ts] = {"name": name, "file": fname}
-            save_datasets(datasets)
+            stats = dataset_stats(path)
+            # 같은 내용이 이미 있으면 파싱 없이 기존 파일 공유
+            if not CATALOG.known_blob(stats["sha256"]):
+                stats.update(frame_stats(read_table(path, stats["encoding"])))
+            stored = CATALOG.add_blob(ts, {"name": name}, stats, path, ext)
+            forget_files(stored["released"])
             st.experimental_rerun()
 
     # ❌ 삭제
@@ -111,12 +123,11 @@ def render_dataset_manager():
         )
         if st.sidebar.checkbox("⚠ 정말 삭제"):
             if st.sidebar.button("삭제 실행"):
-                try:
-                    os.remove(os.path.join(DATA_DIR, datasets[did]["file"]))
-                except:
-                    pass
-                datasets.pop(did)
-                save_datasets(datasets)
+                # 같은 내용을 쓰는 다른 데이터셋이 없을 때만 파일 삭제
+                record, released = CATALOG.release(did)
+                remove_aggregates(DATA_DIR, did)
+                if record is not None:
+                    forget_files(([record["file"]] if released else []) + record["released_partitions"])
                 st.experimental_rerun()
 
     return datasets
@@ -140,14 +151,19 @@ def render_dataset_selector(datasets):
 # =========================
 def preprocess_dataframe(df):
     survey_col = get_survey_column(df)
-    df["_조사"] = "A" if survey_col is None else df[survey_col].apply(normalize_survey_type)
+    # 고유값 단위 정규화 → category dtype
+    df["_조사"] = (
+        pd.Series("A", index=df.index, dtype=pd.CategoricalDtype(SURVEY_TYPES))
+        if survey_col is None
+        else map_unique(df[survey_col], normalize_survey_type, SURVEY_TYPES)
+    )
 
     region_col = get_region_column(df)
     if region_col is None:
         st.error("❌ 지역 컬럼을 찾을 수 없습니다.")
         st.stop()
 
-    df["_지역"] = df[region_col].apply(normalize_region)
+    df["_지역"] = map_unique(df[region_col], normalize_region, REGIONS)
 
     for c in ALL_ITEMS:
         if c in df.columns:
@@ -193,7 +209,7 @@ def analyze_dataset(df, items):
     out = []
     for item in items:
         r = {"항목": item}
-        for region in ["1지역", "2지역", "3지역"]:
+        for region in REGIONS:
             sub = df[df["_지역"] == region]
             r[f"{region}_지점수"] = len(sub)
             r[f"{region}_최고"] = (
@@ -216,17 +232,18 @@ def render_analysis_result(A, B):
 # =========================
 # 🧩 컴포넌트 7: 다운로드
 # =========================
-def render_xlsx_download(A, B, dataset_id):
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        A.to_excel(writer, index=False, sheet_name="개황(A)")
-        B.to_excel(writer, index=False, sheet_name="정밀(B)")
+@st.cache_data(max_entries=8, show_spinner=False)
+def export_xlsx(sha256, items, _A, _B):
+    """(내용 해시, 항목) 단위로 1번만 생성"""
+    return xlsx_bytes({"개황(A)": _A, "정밀(B)": _B})
 
+def render_xlsx_download(A, B, dataset_id, sha256, items):
+    # 버튼을 누를 때만 생성
     st.download_button(
         "📥 XLSX 다운로드",
-        data=buffer.getvalue(),
+        data=lambda: export_xlsx(sha256, tuple(items), A, B),
         file_name=f"{dataset_id}_analysis.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
     )
 
 # =========================
@@ -238,7 +255,13 @@ def main():
     datasets = render_dataset_manager()
     dataset_id = render_dataset_selector(datasets)
 
-    df = read_table(os.path.join(DATA_DIR, datasets[dataset_id]["file"]))
+    data_path = os.path.join(DATA_DIR, datasets[dataset_id]["file"])
+    stats = datasets[dataset_id]["stats"]
+
+    sha256 = stats["sha256"] or file_sha256(data_path)
+
+    # 열 단위 사이드카 우선 (없거나 원본이 바뀌었으면 원본 파싱 후 생성)
+    df, _ = load_frame(data_path, lambda: read_table(data_path, stats["encoding"]), sha256=sha256)
     st.subheader("📄 원본 데이터")
     st.dataframe(df, use_container_width=True)
 
@@ -249,6 +272,6 @@ def main():
     B = analyze_dataset(df[df["_조사"] == "B"], selected_items)
 
     render_analysis_result(A, B)
-    render_xlsx_download(A, B, dataset_id)
+    render_xlsx_download(A, B, dataset_id, sha256, selected_items)
 
 main()
@@ -0,0 +1,207 @@
+"""
+분석 파이프라인 벤치마크 (합성 데이터 기준, 시간 / 최대 메모리 → JSON)
+
+    python benchmarks/run.py --rows 1000 --rows 100000 --out bench_new.json
+    python benchmarks/run.py --compare bench_old.json bench_new.json
+
+- 같은 (행 수, seed) 데이터는 benchmarks/.data 에 1회 생성 후 재사용
+- 각 단계 입력은 측정 밖에서 준비 → 단계 자체만 측정
+- 시간: perf_counter 반복 측정 (최소 / 중앙값)
+- 메모리: tracemalloc 별도 1회 실행의 최대 할당량 (측정 오버헤드가 시간에 섞이지 않도록)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "benchmarks", ".data")
+STANDARD_CSV = os.path.join(ROOT, "example_table2.csv")
+
+sys.path.insert(0, os.path.join(ROOT, "US_military base"))
+sys.path.insert(0, ROOT)
+from synth import write_csv
+from utils.io import read_table, load_table
+from utils.columnar import available as sidecar_available, write_sidecar, header_names, read_csv_columns
+from utils.encoding import detect_encoding
+from utils.normalize import map_unique, REGIONS
+from utils.preprocess import preprocess_dataframe, normalize_numeric_series, ALL_ITEMS
+from utils.analysis import analyze_exceedance, analyze_survey_partitions, exceed_detail
+from utils.export import xlsx_bytes
+from utils.region_analysis import normalize_region
+import app_upgrade
+
+DEFAULT_ROWS = [1_000, 100_000]
+DEFAULT_REPEAT = 3
+
+
+# =========================================================
+# 1. 데이터
+# =========================================================
+def dataset_path(rows: int, seed: int) -> str:
+    """
+    합성 파일 경로 (없으면 생성)
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synth_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(path, rows, seed)
+    return path
+
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = [str(c).replace("\n", "").strip() for c in df.columns]
+    return df
+
+
+# =========================================================
+# 2. 측정 단계
+# =========================================================
+def build_cases(path: str) -> list[tuple[str, callable]]:
+    """
+    (이름, 인자 없는 함수) 목록 → 각 함수 입력은 여기서 미리 준비
+    """
+    raw = read_table(path)
+    normalized = _normalized(raw)
+    prepared = preprocess_dataframe(normalized.copy())
+    items = [i for i in ALL_ITEMS if i in prepared.columns]
+
+    upgrade = normalized.copy()
+    upgrade["_지역"] = map_unique(upgrade["지목"], normalize_region, REGIONS)
+    upgrade_items = list(app_upgrade.load_standards().items)
+
+    results = analyze_survey_partitions(prepared, items, STANDARD_CSV)
+    sheets = dict(results)
+
+    # 항목 2개 선택 시 읽는 컬럼 (조사구분 / 지역 / 지점 + 항목)
+    encoding = detect_encoding(path)
+    projected = [
+        c for c in header_names(path, encoding)
+        if "조사구분" in c or c in ("지목", "시료명", "지점명")
+    ] + ["Cd(mg/kg)", "Pb(mg/kg)"]
+
+    cases = [
+        ("read_table", lambda: read_table(path)),
+        ("read_csv_columns", lambda: read_csv_columns(path, encoding, projected)),
+        ("preprocess_dataframe", lambda: preprocess_dataframe(normalized.copy())),
+        ("normalize_numeric_series", lambda: [normalize_numeric_series(normalized[c]) for c in items]),
+        ("analyze_exceedance", lambda: analyze_exceedance(prepared, items, STANDARD_CSV)),
+        ("app_upgrade.analyze_dataset", lambda: app_upgrade.analyze_dataset(upgrade, upgrade_items)),
+        ("xlsx_export", lambda: xlsx_bytes({
+            **sheets, "초과시료": exceed_detail(prepared, items, STANDARD_CSV)
+        })),
+    ]
+
+    # 열 단위 사이드카 읽기 (pyarrow 가 있을 때만, 생성은 측정 밖)
+    if sidecar_available():
+        write_sidecar(path, raw)
+        cases.insert(1, ("load_table_sidecar", lambda: load_table(path)))
+    return cases
+
+
+def measure(func, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "peak_mb": round(peak / 1024 / 1024, 3),
+        "repeat": repeat,
+    }
+
+
+# =========================================================
+# 3. 실행 정보 / 비교
+# =========================================================
+def run_meta(seed: int) -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": seed,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(old_path: str, new_path: str) -> pd.DataFrame:
+    """
+    (단계, 행 수)별 두 결과 비교 (ratio < 1 → 빨라짐 / 줄어듦)
+    """
+    def load(p):
+        with open(p, encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f)["results"]).set_index(["case", "rows"])
+
+    old, new = load(old_path), load(new_path)
+    table = old[["median_s", "peak_mb"]].join(
+        new[["median_s", "peak_mb"]], lsuffix="_old", rsuffix="_new", how="outer"
+    )
+    table["time_ratio"] = (table["median_s_new"] / table["median_s_old"]).round(3)
+    table["mem_ratio"] = (table["peak_mb_new"] / table["peak_mb_old"]).round(3)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 파이프라인 벤치마크")
+    parser.add_argument("--rows", type=int, action="append", help="행 수 (반복 가능)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--case", action="append", help="측정할 단계 (기본: 전체)")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="두 결과 JSON 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        with pd.option_context("display.width", 200, "display.max_columns", None):
+            print(compare(*args.compare))
+        return
+
+    results = []
+    for rows in args.rows or DEFAULT_ROWS:
+        path = dataset_path(rows, args.seed)
+        for name, func in build_cases(path):
+            if args.case and name not in args.case:
+                continue
+            r = {"case": name, "rows": rows, **measure(func, args.repeat)}
+            results.append(r)
+            print(f"{name:<28} {rows:>10,} rows  {r['median_s']:>9.4f}s  {r['peak_mb']:>9.1f} MB")
+
+    report = {"meta": run_meta(args.seed), "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
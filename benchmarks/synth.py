@@ -0,0 +1,145 @@
+"""
+합성 토양 조사 데이터 생성기 (US_military base/data/example2.csv 스키마)
+
+    python benchmarks/synth.py --rows 1000000 --out /tmp/synth_1m.csv
+
+- 헤더 / 항목별 측정 비율은 예시 파일에서 그대로 가져옴
+- 항목 값은 기준표(우려기준) 기준 로그정규 분포 → 일부 초과
+- 실제 제공 파일처럼 "－", "<0.01", "ND", 천 단위 쉼표 값 섞음
+- 조각 단위로 기록 → 1천 ~ 1천만 행까지 메모리 일정
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_FILE = os.path.join(ROOT, "US_military base", "data", "example2.csv")
+STANDARD_FILE = os.path.join(ROOT, "example_table2.csv")
+
+sys.path.insert(0, os.path.join(ROOT, "US_military base"))
+from utils.normalize import normalize_header
+from utils.standards import get_standards
+
+# 예시 파일에서 비어 있는 항목도 조금은 값이 있도록 하는 최소 측정 비율
+MIN_FILL = 0.05
+
+# 지점당 평균 시료 수 (예시: 490 시료 / 130 지점)
+SAMPLES_PER_SITE = 3.8
+
+DEPTHS = ["0-0.15", "0.15-0.3", "0.3-0.6", "0.6-1.0", "1.0-2.0", "2.0-2.5", "2.5-3.0", "3.0-4.0"]
+REGION_LABELS = ["1지역", "2지역", "3지역"]
+DATES = pd.date_range("2025-03-01", "2025-12-31", freq="D").strftime("%Y.%m.%d").to_numpy()
+
+
+# =========================================================
+# 1. 스키마
+# =========================================================
+def load_schema():
+    """
+    (전체 헤더, 항목 헤더, 항목별 측정 비율, 항목별 중앙값)
+    """
+    sample = pd.read_csv(SCHEMA_FILE, dtype=str)
+    columns = list(sample.columns)
+    items = columns[columns.index("시료명") + 1:]
+
+    std = get_standards(STANDARD_FILE)
+    concern = std.threshold_table("우려기준")
+
+    fill, median = {}, {}
+    for c in items:
+        fill[c] = max(float(sample[c].notna().mean()), MIN_FILL)
+        key = normalize_header(c)
+        base = concern.iloc[0].get(key, np.nan) if key in concern.columns else np.nan
+        # 기준이 없는 항목(pH 등)은 임의 규모
+        median[c] = 0.2 * base if np.isfinite(base) else 7.0
+    return columns, items, fill, median
+
+
+# =========================================================
+# 2. 조각 생성
+# =========================================================
+def _messy(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    수치 → 제공 파일 형태의 문자열 (결측 / 불검출 / 전각 기호 / 쉼표 포함)
+    """
+    text = np.char.mod("%.3g", values).astype(object)
+    roll = rng.random(len(values))
+
+    text[roll < 0.01] = "－"                               # 전각 하이픈 (미측정)
+    below = (roll >= 0.01) & (roll < 0.03)
+    text[below] = "<0.01"                                  # 검출한계 미만
+    text[(roll >= 0.03) & (roll < 0.035)] = "ND"
+    big = (roll >= 0.035) & (values >= 1000)
+    text[big] = [f"{v:,.0f}" for v in values[big]]         # 천 단위 쉼표
+    return text
+
+
+def generate_chunk(start: int, n: int, schema, rng: np.random.Generator) -> pd.DataFrame:
+    columns, items, fill, median = schema
+
+    rows = np.arange(start, start + n)
+    site = (rows / SAMPLES_PER_SITE).astype(np.int64)
+    depth = rng.integers(1, len(DEPTHS) + 1, n)
+    region = rng.integers(0, len(REGION_LABELS), n)
+
+    site_name = np.char.add("SYN-A", np.char.zfill(site.astype(str), 6))
+    frame = {
+        "NO": rows + 1,
+        "조사구분": np.where(rng.random(n) < 0.6, "A", "B"),
+        "조사구역": "합성구역",
+        "시료채취일": DATES[rng.integers(0, len(DATES), n)],
+        "시료구분": np.where(rng.random(n) < 0.85, "최초", "추가"),
+        "심도": depth,
+        "깊이": np.array(DEPTHS)[depth - 1],
+        "토지이용도": "법정지목",
+        "지목": np.array(REGION_LABELS)[region],
+        "원래지목": np.array(REGION_LABELS)[rng.integers(0, len(REGION_LABELS), n)],
+        "지점명": site_name,
+        "시료명": np.char.add(np.char.add(site_name, "-"), np.char.zfill(depth.astype(str), 2)),
+    }
+
+    for c in items:
+        # 측정된 칸만 값 생성 / 문자열 변환
+        measured = np.flatnonzero(rng.random(n) < fill[c])
+        text = np.full(n, None, dtype=object)
+        text[measured] = _messy(rng.lognormal(np.log(median[c]), 1.2, len(measured)), rng)
+        frame[c] = text
+
+    return pd.DataFrame(frame, columns=columns)
+
+
+# =========================================================
+# 3. 파일 기록
+# =========================================================
+def write_csv(path: str, rows: int, seed: int = 0, chunk_rows: int = 200_000) -> str:
+    """
+    rows 행짜리 합성 파일 기록 (UTF-8 BOM, 예시 파일과 같은 형식)
+    """
+    schema = load_schema()
+    rng = np.random.default_rng(seed)
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_chunk(start, min(chunk_rows, rows - start), schema, rng)
+            chunk.to_csv(f, index=False, header=(start == 0))
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 토양 조사 데이터 생성")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    write_csv(args.out, args.rows, args.seed)
+    print(f"{args.rows:,} rows → {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+등록된 모든 데이터셋 기준 초과 분석 → 1개 표 (CLI)
+
+    python portfolio.py --workers 4 --out portfolio.csv
+    python portfolio.py --items "Cd(mg/kg)" --items "Pb(mg/kg)" --compare
+"""
+import argparse
+import json
+
+from app_upgrade import (
+    portfolio_analysis,
+    load_standards,
+    PORTFOLIO_WORKERS
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 데이터셋 기준 초과 분석")
+    parser.add_argument("--items", action="append", help="분석 항목 (반복 가능, 기본: 기준표 전체)")
+    parser.add_argument(
+        "--workers", type=int, default=PORTFOLIO_WORKERS,
+        help="동시 작업 프로세스 수 (최대 PORTFOLIO_WORKERS)"
+    )
+    parser.add_argument("--out", help="결과 CSV 경로 (없으면 요약만 출력)")
+    parser.add_argument(
+        "--compare", action="store_true",
+        help="캐시 없이 병렬 / 직렬을 각각 실행해 실제 소요 시간 비교"
+    )
+    args = parser.parse_args()
+
+    items = args.items or list(load_standards().items)
+
+    if args.compare:
+        table, info = portfolio_analysis(items, workers=args.workers, use_cache=False)
+        _, serial = portfolio_analysis(items, serial=True, use_cache=False)
+        info["serial_wall_s"] = serial["wall_s"]
+        info["measured_speedup"] = (
+            round(serial["wall_s"] / info["wall_s"], 2) if info["wall_s"] > 0 else None
+        )
+    else:
+        table, info = portfolio_analysis(items, workers=args.workers)
+
+    if args.out:
+        table.to_csv(args.out, index=False, encoding="utf-8-sig")
+
+    print(json.dumps(info, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 공용 유틸 (US_military base/utils) — 앱과 같은 방식으로 경로 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "US_military base"))
+# Flask 앱 모듈 (app_upgrade 등)
+sys.path.insert(1, ROOT)
+
+from utils.standards import get_standards
+
+# 저장소 예시 기준표 (지역 병합 셀, "우려 40% 또는 70%" 표기, 줄바꿈 헤더)
+STANDARD_CSV = os.path.join(ROOT, "example_table2.csv")
+
+# 기준 초과 / 검출한계 미만 / 해석 불가 값을 모두 포함하도록 고른 항목
+ITEMS = ["Pb(mg/kg)", "Cu(mg/kg)", "Zn(mg/kg)", "TPH"]
+
+# 지역 × 기준종류별 기준값 (지역마다 행을 모두 채운 형식, "－" = 기준 없음)
+STANDARD_ROWS = [
+    ("1지역", "우려40", [80, 60, 120, 200]),
+    ("1지역", "우려기준", [200, 150, 300, 500]),
+    ("1지역", "대책기준", [600, 450, 900, 1500]),
+    ("2지역", "우려40", [140, 175, 210, 280]),
+    ("2지역", "우려기준", [400, 500, 600, 800]),
+    ("2지역", "대책기준", [1200, 1500, 1800, 2400]),
+    ("3지역", "우려40", [490, 700, 700, 1400]),
+    ("3지역", "우려기준", [700, 2000, 2000, 2000]),
+    ("3지역", "대책기준", [2100, 6000, 5000, "－"]),
+]
+
+
+@pytest.fixture
+def standard_csv(tmp_path):
+    path = tmp_path / "standards.csv"
+    rows = [",".join(["지역", "기준"] + ITEMS)]
+    rows += [",".join([region, level] + [str(v) for v in values]) for region, level, values in STANDARD_ROWS]
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def std(standard_csv):
+    return get_standards(standard_csv)
+
+
+def survey_frame(n_rows: int, seed: int = 0, null_sites: bool = True) -> pd.DataFrame:
+    """
+    업로드 원본과 같은 형태의 (헤더 정리된) 조사 결과
+    조사구분 / 지역 / 시료명 결측, "<0.01" / "ND" / "1,191" 같은 표기 포함
+    조사구역 / 시료채취일 / 심도 / 깊이 / 토지이용도 (행 필터 색인용)
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(choices, p=None):
+        return rng.choice(np.array(choices, dtype=object), n_rows, p=p)
+
+    dates = pd.date_range("2025-03-01", "2025-06-30", freq="D").strftime("%Y.%m.%d")
+    df = pd.DataFrame({
+        "조사구분": pick(["개황조사", "정밀조사", "상세조사", None], p=[0.45, 0.3, 0.15, 0.1]),
+        "조사구역": pick(["가", "나", "다", None], p=[0.4, 0.3, 0.25, 0.05]),
+        "시료채취일": pick(list(dates) + ["미기재", None]),
+        "심도": pick(["표토", "심토", None], p=[0.5, 0.45, 0.05]),
+        "깊이": pick(["0-0.15", "0.15-0.3", "0.3-0.6", "1.0-2.0", "2.5", "-", None]),
+        "토지이용도": pick(["주거", "공장", "임야", None], p=[0.4, 0.3, 0.25, 0.05]),
+        "지목(1/2/3)": pick(["1", "2", "3", "기타", None], p=[0.35, 0.3, 0.25, 0.05, 0.05]),
+        "지점명": [f"P{i:03d}" for i in rng.integers(0, 40, n_rows)],
+        "시료명": [f"S{i:03d}" for i in rng.integers(0, 60, n_rows)],
+    })
+    if null_sites:
+        df.loc[rng.random(n_rows) < 0.15, "시료명"] = None
+
+    for item in ITEMS:
+        values = rng.lognormal(4.5, 1.4, n_rows).round(2).astype(object)
+        text = np.array([f"{v:,}" for v in values], dtype=object)
+        special = rng.random(n_rows)
+        text[special < 0.05] = "<0.01"
+        text[(special >= 0.05) & (special < 0.08)] = "ND"
+        text[(special >= 0.08) & (special < 0.1)] = None
+        df[item] = text
+    return df
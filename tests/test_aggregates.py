@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ITEMS, survey_frame
+from utils.aggregates import Aggregates, load_aggregates, save_aggregates
+from utils.region_analysis import aggregate_result, analyze_surveys, prepare_frame
+
+
+def partitioned(parts, std):
+    agg = Aggregates(std.version, ITEMS, std.levels)
+    for i, part in enumerate(parts):
+        agg.update(prepare_frame(part.copy(), ITEMS), std, (f"part{i}",))
+    return agg
+
+
+def split(df, sizes):
+    bounds = np.cumsum([0] + sizes)
+    return [df.iloc[a:b].reset_index(drop=True) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def expected(df, std):
+    return analyze_surveys(prepare_frame(df.copy(), ITEMS), ITEMS, std)
+
+
+@pytest.mark.parametrize("null_sites", [True, False])
+@pytest.mark.parametrize("sizes", [[600], [300, 300], [50, 400, 1, 149]])
+def test_partitioned_matches_concatenated(std, sizes, null_sites):
+    df = survey_frame(sum(sizes), seed=len(sizes), null_sites=null_sites)
+    agg = partitioned(split(df, sizes), std)
+
+    for survey, frame in zip(("A", "B"), expected(df, std)):
+        pd.testing.assert_frame_equal(aggregate_result(agg, survey, ITEMS), frame)
+
+
+def test_partitioned_without_site_columns(std):
+    df = survey_frame(400, seed=7).drop(columns=["지점명", "시료명"])
+    agg = partitioned(split(df, [150, 250]), std)
+
+    for survey, frame in zip(("A", "B"), expected(df, std)):
+        pd.testing.assert_frame_equal(aggregate_result(agg, survey, ITEMS), frame)
+
+
+def test_null_site_is_not_a_site(std):
+    df = pd.DataFrame({
+        "조사구분": ["개황조사"] * 3,
+        "지목(1/2/3)": ["1"] * 3,
+        "시료명": ["S1", None, None],
+        "Pb(mg/kg)": ["10", "999", "998"],
+    })
+    agg = partitioned([df], std)
+
+    assert agg.site_count("A", "1지역") == 1
+    assert agg.exceed_site_count("A", "1지역", "우려기준", "Pb(mg/kg)") == 0
+    assert agg.exceed_samples[("A", "1지역", "우려기준", "Pb(mg/kg)")] == 2
+    assert agg.max_value("A", "1지역", "Pb(mg/kg)") == 999.0
+
+
+def test_same_site_across_partitions_counted_once(std):
+    a = pd.DataFrame({
+        "조사구분": ["개황조사"], "지목(1/2/3)": ["1"], "시료명": ["S1"], "Pb(mg/kg)": ["500"],
+    })
+    agg = partitioned([a, a.assign(**{"Pb(mg/kg)": ["600"]})], std)
+
+    assert agg.site_count("A", "1지역") == 1
+    assert agg.exceed_site_count("A", "1지역", "우려기준", "Pb(mg/kg)") == 1
+    assert agg.max_value("A", "1지역", "Pb(mg/kg)") == 600.0
+
+
+def test_load_requires_matching_prefix(std, tmp_path):
+    df = survey_frame(100)
+    agg = partitioned(split(df, [60, 40]), std)
+    path = str(tmp_path / "agg.pkl")
+    save_aggregates(path, agg)
+
+    parts = [("part0",), ("part1",)]
+    assert load_aggregates(path, std.version, ITEMS, parts + [("part2",)]) is not None
+    assert load_aggregates(path, std.version, ITEMS, parts[:1]) is None
+    assert load_aggregates(path, std.version, ITEMS, [("other",), ("part1",)]) is None
+    assert load_aggregates(path, ("other",), ITEMS, parts) is None
+    assert load_aggregates(path, std.version, ITEMS + ["Cd(mg/kg)"], parts) is None
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ITEMS, survey_frame
+from utils.analysis import (
+    analyze_exceedance, analyze_survey_partitions, exceed_detail, materialize_survey_partitions,
+    slice_survey_partitions
+)
+from utils.materialize import load_summary
+from utils.preprocess import preprocess_dataframe
+from utils.standards import LEVELS, get_standards
+
+
+# =========================================================
+# 기준 구현 (행 단위 반복, 벡터화 이전 동작)
+# =========================================================
+def reference_summarize(df, items, std_map, level):
+    site_col = "시료명" if "시료명" in df.columns else "지점명" if "지점명" in df.columns else None
+    rows = []
+    for item in items:
+        if item not in df.columns:
+            rows.append({"항목": item, "지점수": 0, "시료수": 0})
+            continue
+        hits = [
+            r for _, r in df.iterrows()
+            if std_map.get((r["_지역"], level, item)) is not None
+            and pd.notna(r[item]) and r[item] > std_map[(r["_지역"], level, item)]
+        ]
+        ex = pd.DataFrame(hits)
+        rows.append({
+            "항목": item,
+            "지점수": (ex[site_col].nunique() if site_col else len(ex)) if hits else 0,
+            "시료수": len(ex),
+        })
+    return pd.DataFrame(rows)
+
+
+def reference_exceedance(df, items, standard_csv):
+    if df.empty:
+        return pd.DataFrame({"항목": items})
+    std_map = get_standards(standard_csv).std_map
+    merged = None
+    for level in LEVELS:
+        tmp = reference_summarize(df, items, std_map, level).rename(
+            columns={"지점수": f"{level}_지점수", "시료수": f"{level}_시료수"}
+        )
+        merged = tmp if merged is None else merged.merge(tmp, on="항목", how="outer")
+    counts = [c for c in merged.columns if c != "항목"]
+    merged[counts] = merged[counts].fillna(0).astype(int)
+    return merged
+
+
+def prepared(n_rows, seed=0, **kwargs):
+    return preprocess_dataframe(survey_frame(n_rows, seed, **kwargs))
+
+
+# =========================================================
+# 기준 초과 집계
+# =========================================================
+@pytest.mark.parametrize("seed", [0, 1])
+def test_analyze_exceedance_matches_reference(standard_csv, seed):
+    df = prepared(300, seed)
+    items = ITEMS + ["Cd(mg/kg)"]   # 없는 컬럼 포함
+
+    result = analyze_exceedance(df, items, standard_csv)
+    expected = reference_exceedance(df, items, standard_csv)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert (expected.filter(like="_시료수") > 0).any().all()   # 기준마다 초과 시료 있음
+
+
+def test_analyze_exceedance_without_site_columns(standard_csv):
+    df = prepared(200, 3).drop(columns=["시료명", "지점명"])
+    pd.testing.assert_frame_equal(
+        analyze_exceedance(df, ITEMS, standard_csv),
+        reference_exceedance(df, ITEMS, standard_csv),
+        check_dtype=False
+    )
+
+
+def test_analyze_exceedance_by_sample_name_with_missing_names(standard_csv):
+    df = prepared(200, 4, null_sites=True)
+    sub = df[df["_조사"] == "A"]
+    pd.testing.assert_frame_equal(
+        analyze_exceedance(sub, ITEMS, standard_csv),
+        reference_exceedance(sub, ITEMS, standard_csv),
+        check_dtype=False
+    )
+
+
+def test_analyze_exceedance_empty_frame(standard_csv):
+    df = prepared(10).iloc[:0]
+    pd.testing.assert_frame_equal(analyze_exceedance(df, ITEMS, standard_csv), pd.DataFrame({"항목": ITEMS}))
+
+
+# =========================================================
+# 조사구분별 (A / B / A+B)
+# =========================================================
+def test_survey_partitions_match_separate_runs(standard_csv):
+    df = prepared(400, 5)
+    results = analyze_survey_partitions(df, ITEMS, standard_csv, survey_col="_조사")
+
+    expected = {
+        "A": reference_exceedance(df[df["_조사"] == "A"], ITEMS, standard_csv),
+        "B": reference_exceedance(df[df["_조사"] == "B"], ITEMS, standard_csv),
+        "A+B": reference_exceedance(df, ITEMS, standard_csv),
+    }
+    assert set(results) == set(expected)
+    for key, frame in expected.items():
+        pd.testing.assert_frame_equal(results[key], frame, check_dtype=False)
+
+
+def test_survey_partitions_missing_group(standard_csv):
+    df = prepared(100, 6)
+    df = df[df["_조사"] == "A"]
+    results = analyze_survey_partitions(df, ITEMS, standard_csv, survey_col="_조사")
+    pd.testing.assert_frame_equal(results["B"], pd.DataFrame({"항목": ITEMS}))
+    pd.testing.assert_frame_equal(results["A+B"], results["A"])
+
+
+def test_stored_partitions_match_direct_analysis(standard_csv, tmp_path):
+    df = prepared(300, 7)
+    data = tmp_path / "data.csv"
+    data.write_text("x\n")
+    materialize_survey_partitions(df, str(data), ITEMS, standard_csv, survey_col="_조사")
+
+    subset = ["Zn(mg/kg)", "Pb(mg/kg)"]
+    version = get_standards(standard_csv).version
+    stored = slice_survey_partitions(load_summary(str(data), version, subset), subset)
+    direct = analyze_survey_partitions(df, subset, standard_csv, survey_col="_조사")
+    for key in ("A", "B", "A+B"):
+        pd.testing.assert_frame_equal(stored[key], direct[key])
+
+    assert load_summary(str(data), version, subset + ["Cd(mg/kg)"]) is None
+
+
+def test_sliced_partitions_match_direct_analysis(standard_csv):
+    df = prepared(200, 8)
+    df = df[df["_조사"] == "A"]
+    full = analyze_survey_partitions(df, ITEMS, standard_csv, survey_col="_조사")
+
+    subset = ["TPH", "Cu(mg/kg)"]
+    sliced = slice_survey_partitions(full, subset)
+    direct = analyze_survey_partitions(df, subset, standard_csv, survey_col="_조사")
+    for key in ("A", "B", "A+B"):
+        pd.testing.assert_frame_equal(sliced[key], direct[key])
+
+
+# =========================================================
+# 초과 상세 (엑셀 상세 시트)
+# =========================================================
+def test_exceed_detail_lists_highest_level(standard_csv, std):
+    df = prepared(300, 2)
+    detail = exceed_detail(df, ITEMS, standard_csv, survey_col="_조사")
+
+    expected = []
+    for i, row in df.reset_index(drop=True).iterrows():
+        for item in ITEMS:
+            over = [
+                level for level in std.levels
+                if (row["_지역"], level, item) in std.std_map
+                and row[item] > std.std_map[(row["_지역"], level, item)]
+            ]
+            if over:
+                expected.append((i, item, over[-1]))
+
+    assert len(detail) == len(expected) > 0
+    names = df["지점명"].fillna("") + "/" + df["시료명"].fillna("")
+    got = sorted(zip(detail["지점명"].fillna("") + "/" + detail["시료명"].fillna(""), detail["항목"], detail["초과기준"]))
+    want = sorted((names.iloc[i], item, level) for i, item, level in expected)
+    assert got == want
+
+    # 기준별 값 컬럼 = 해당 지역 기준값
+    first = detail.iloc[0]
+    for level in std.levels:
+        value = std.std_map.get((first["지역"], level, first["항목"]), np.nan)
+        assert first[level] == value or (np.isnan(first[level]) and np.isnan(value))
@@ -0,0 +1,70 @@
+import pytest
+
+import app_upgrade
+from conftest import survey_frame
+from utils.catalog import Catalog, dataset_stats
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    path = data_dir / "survey.csv"
+    survey_frame(120, seed=4).to_csv(path, index=False)
+
+    catalog = Catalog(str(tmp_path / "datasets.db"), data_dir=str(data_dir))
+    stats = dataset_stats(str(path))
+    stats.update(row_count=120)
+    catalog.upsert("d1", {"name": "조사", "file": "survey.csv", "provider": "기관"}, stats)
+
+    monkeypatch.setattr(app_upgrade, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(app_upgrade, "CATALOG", catalog)
+    return app_upgrade.app.test_client()
+
+
+def test_datasets_listing(client):
+    body = client.get("/api/datasets").get_json()
+    assert body["datasets"] == [{
+        "id": "d1", "name": "조사", "provider": "기관", "license": None,
+        "sha256": body["datasets"][0]["sha256"], "row_count": 120, "rounds": 1,
+    }]
+
+
+def test_analysis_revalidates_with_etag(client):
+    url = "/api/datasets/d1/analysis?items=Pb(mg/kg)&survey=A"
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers["Cache-Control"]
+    body = first.get_json()
+    assert list(body["results"]) == ["A"] and body["results"]["A"][0]["항목"] == "Pb(mg/kg)"
+
+    again = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and again.data == b""
+
+    other = client.get("/api/datasets/d1/analysis?items=Cu(mg/kg)&survey=A")
+    assert other.headers["ETag"] != first.headers["ETag"]
+
+
+def test_rows_paging(client):
+    body = client.get("/api/datasets/d1/rows?page_size=50").get_json()
+    assert len(body["rows"]) == 50 and body["page"]["total_rows"] == 120
+    assert "page=2" in body["next"]
+
+    last = client.get("/api/datasets/d1/rows?page_size=50&page=3").get_json()
+    assert len(last["rows"]) == 20 and last["next"] is None
+
+
+def test_errors(client):
+    assert client.get("/api/datasets/missing/analysis").status_code == 404
+    assert client.get("/api/datasets/missing/rows").status_code == 404
+    response = client.get("/api/datasets/d1/analysis?survey=C")
+    assert response.status_code == 400 and "survey" in response.get_json()["error"]
+
+
+def test_rows_and_analysis_filters(client):
+    df = survey_frame(120, seed=4)
+    body = client.get("/api/datasets/d1/rows?area=가&page_size=500").get_json()
+    assert len(body["rows"]) == (df["조사구역"] == "가").sum()
+    assert {r["조사구역"] for r in body["rows"]} == {"가"}
+
+    url = "/api/datasets/d1/analysis?items=Pb(mg/kg)&survey=A"
+    assert client.get(url + "&area=가").headers["ETag"] != client.get(url).headers["ETag"]
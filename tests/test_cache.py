@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.blobs import blob_relpath
+from utils.cache import FrameCache, frame_nbytes
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    return str(path)
+
+
+class Loader:
+    def __init__(self, rows=10):
+        self.calls = 0
+        self.rows = rows
+
+    def __call__(self, path):
+        self.calls += 1
+        return pd.DataFrame({"a": np.arange(self.rows)})
+
+
+def test_get_or_load_hits_and_misses(csv_file):
+    cache, loader = FrameCache(), Loader()
+    first = cache.get_or_load(csv_file, loader)
+    assert cache.get_or_load(csv_file, loader) is first
+    assert cache.get_or_load(csv_file, loader, stage="prepared") is not first
+    assert cache.get_or_load(csv_file, loader, version=("v2",)) is not first
+
+    assert loader.calls == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+
+
+def test_new_version_replaces_entry(csv_file):
+    cache, loader = FrameCache(), Loader()
+    cache.get_or_load(csv_file, loader, stage="prepared", version=("v1",))
+    cache.get_or_load(csv_file, loader, stage="prepared", version=("v2",))
+    assert cache.stats()["entries"] == 1   # 기준표가 바뀌면 이전 전처리 결과는 제거
+
+
+def test_peek_never_loads(csv_file):
+    cache, loader = FrameCache(), Loader()
+    assert cache.peek(csv_file) is None
+
+    frame = cache.get_or_load(csv_file, loader, stage="prepared", version="v1")
+    assert cache.peek(csv_file, "prepared", "v1") is frame
+    assert cache.peek(csv_file, "prepared", "v2") is None
+    assert cache.peek(csv_file) is None and loader.calls == 1
+
+    os.remove(csv_file)
+    assert cache.peek(csv_file, "prepared", "v1") is None
+
+
+def test_changed_file_replaces_entry(csv_file):
+    cache, loader = FrameCache(), Loader()
+    cache.get_or_load(csv_file, loader)
+
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write("3,4\n")
+    cache.get_or_load(csv_file, loader)
+
+    assert loader.calls == 2
+    assert cache.stats()["entries"] == 1   # 이전 버전 항목은 제거
+
+
+def test_invalidate_and_deleted_file(csv_file):
+    cache, loader = FrameCache(), Loader()
+    cache.get_or_load(csv_file, loader)
+    cache.get_or_load(csv_file, loader, stage="prepared")
+    assert cache.invalidate(csv_file) == 2
+    assert cache.stats()["entries"] == 0
+
+    cache.get_or_load(csv_file, loader)
+    os.remove(csv_file)
+    with pytest.raises(FileNotFoundError):
+        cache.get_or_load(csv_file, loader)
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used(tmp_path):
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.csv"
+        path.write_text(name)
+        paths.append(str(path))
+    size = frame_nbytes(Loader()(None))
+    cache, loader = FrameCache(max_bytes=2 * size), Loader()
+
+    cache.get_or_load(paths[0], loader)
+    cache.get_or_load(paths[1], loader)
+    cache.get_or_load(paths[0], loader)   # a 를 최근 사용으로
+    cache.get_or_load(paths[2], loader)   # b 제거
+    assert cache.stats()["evictions"] == 1
+
+    cache.get_or_load(paths[0], loader)
+    assert loader.calls == 3
+    cache.get_or_load(paths[1], loader)
+    assert loader.calls == 4
+
+    # 예산보다 큰 항목은 캐시하지 않음
+    big = Loader(rows=1000)
+    cache.get_or_load(paths[2], big)
+    cache.get_or_load(paths[2], big)
+    assert big.calls == 2
+
+
+def test_frame_nbytes_sums_nested_results():
+    a = pd.DataFrame({"x": np.arange(100)})
+    b = pd.DataFrame({"y": np.arange(50.0)})
+    assert frame_nbytes((a, b)) == frame_nbytes(a) + frame_nbytes(b)
+    assert frame_nbytes({"A": a, "B": [b]}) == frame_nbytes(a) + frame_nbytes(b)
+    assert frame_nbytes(b"abc") == 3 and frame_nbytes(None) == 0
+
+
+def test_blob_files_share_key_by_content(tmp_path):
+    sha = "ab" * 32
+    a = tmp_path / "one" / blob_relpath(sha, ".csv")
+    b = tmp_path / "two" / blob_relpath(sha, ".csv")
+    for p in (a, b):
+        p.parent.mkdir(parents=True)
+        p.write_text("x")
+
+    cache, loader = FrameCache(), Loader()
+    cache.get_or_load(str(a), loader)
+    cache.get_or_load(str(b), loader)
+    assert loader.calls == 1
+    assert cache.invalidate(str(b)) == 1
@@ -0,0 +1,206 @@
+import json
+import os
+
+import pytest
+
+from utils.catalog import Catalog, dataset_stats
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def catalog(tmp_path, data_dir):
+    return Catalog(str(tmp_path / "datasets.db"), data_dir=str(data_dir))
+
+
+def spool(data_dir, name, text):
+    path = data_dir / name
+    path.write_text(text, encoding="utf-8")
+    return str(path), dataset_stats(str(path))
+
+
+def add(catalog, data_dir, dataset_id, text):
+    src, stats = spool(data_dir, f"{dataset_id}.tmp", text)
+    stats.update(row_count=text.count("\n") - 1, columns=text.split("\n", 1)[0].split(","))
+    return catalog.add_blob(dataset_id, {"name": dataset_id}, stats, src, ".csv")
+
+
+# =========================================================
+# 등록 / 조회
+# =========================================================
+def test_upsert_and_get(catalog, data_dir):
+    path, stats = spool(data_dir, "a.csv", "x,y\n1,2\n")
+    stats.update(row_count=1, columns=["x", "y"])
+
+    catalog.upsert("a", {"name": "조사", "file": "a.csv", "uploaded": "2025-01-01"}, stats)
+    catalog.upsert("b", {"name": "조사", "file": "b.csv"})
+
+    record = catalog.get("a")
+    assert record["uploaded"] == "2025-01-01"
+    assert record["stats"]["columns"] == ["x", "y"] and record["stats"]["size"] == os.path.getsize(path)
+    assert record["stats"]["encoding"] == "utf-8"
+    assert catalog.encoding_of("a.csv") == "utf-8" and catalog.encoding_of("b.csv") is None
+    assert list(catalog.all()) == ["a", "b"]
+    assert set(catalog.find_by_name("조사")) == {"a", "b"}
+    assert "a" in catalog and "c" not in catalog
+
+    # 같은 id → 교체
+    catalog.upsert("a", {"name": "다른 이름", "file": "a.csv"})
+    assert catalog.get("a")["name"] == "다른 이름"
+    assert catalog.get("a")["stats"]["row_count"] is None
+
+
+# =========================================================
+# 내용 주소 저장 (blob)
+# =========================================================
+def test_same_content_shares_one_file(catalog, data_dir):
+    a = add(catalog, data_dir, "a", "x,y\n1,2\n")
+    b = add(catalog, data_dir, "b", "x,y\n1,2\n")
+
+    assert not a["deduped"] and b["deduped"]
+    assert a["file"] == b["file"]
+    assert not os.path.exists(data_dir / "b.tmp")
+    assert catalog.find_blob(a["stats"]["sha256"])["file"] == a["file"]
+    assert catalog.known_blob(a["stats"]["sha256"])
+
+
+def test_file_removed_only_when_last_reference_released(catalog, data_dir):
+    a = add(catalog, data_dir, "a", "x,y\n1,2\n")
+    add(catalog, data_dir, "b", "x,y\n1,2\n")
+    path = data_dir / a["file"]
+
+    record, released = catalog.release("a")
+    assert record["name"] == "a" and not released and path.exists()
+
+    record, released = catalog.release("b")
+    assert released and not path.exists()
+    assert catalog.release("b") == (None, False)
+
+
+def test_reupload_same_id_releases_previous_file(catalog, data_dir):
+    old = add(catalog, data_dir, "a", "x,y\n1,2\n")
+    new = add(catalog, data_dir, "a", "x,y\n3,4\n")
+
+    assert new["released"] == [old["file"]]
+    assert not (data_dir / old["file"]).exists()
+    assert catalog.get("a")["file"] == new["file"]
+
+
+# =========================================================
+# 조사 회차 파티션
+# =========================================================
+def test_partitions_are_ordered_and_deduplicated(catalog, data_dir):
+    base = add(catalog, data_dir, "a", "x,y\n1,2\n")
+
+    src, stats = spool(data_dir, "p1.tmp", "x,y\n5,6\n")
+    first = catalog.add_partition("a", stats, src, ".csv")
+    src, stats = spool(data_dir, "p2.tmp", "x,y\n7,8\n")
+    second = catalog.add_partition("a", stats, src, ".csv")
+    assert (first["seq"], second["seq"]) == (1, 2)
+
+    # 원본 / 이미 등록된 회차와 같은 내용은 중복
+    src, stats = spool(data_dir, "p3.tmp", "x,y\n5,6\n")
+    assert catalog.add_partition("a", stats, src, ".csv")["duplicate"]
+    src, stats = spool(data_dir, "p4.tmp", "x,y\n1,2\n")
+    assert catalog.add_partition("a", stats, src, ".csv")["duplicate"]
+    assert not any(data_dir.glob("*.tmp"))
+
+    assert catalog.partition_files("a") == [base["file"], first["file"], second["file"]]
+    assert catalog.partition_stats() == {"a": {"partitions": 2, "row_count": 0}}
+
+    record, released = catalog.release("a")
+    assert released
+    assert record["released_partitions"] == [first["file"], second["file"]]
+    assert not any((data_dir / f).exists() for f in record["released_partitions"])
+    assert catalog.partition_files("a") == []
+
+
+def test_partition_for_unknown_dataset(catalog, data_dir):
+    src, stats = spool(data_dir, "p.tmp", "x\n1\n")
+    assert catalog.add_partition("missing", stats, src, ".csv") is None
+    assert not os.path.exists(src)
+
+
+# =========================================================
+# datasets.json 이관
+# =========================================================
+def test_legacy_json_migration(tmp_path, data_dir):
+    (data_dir / "old.csv").write_text("x,y\n1,2\n", encoding="utf-8")
+    (data_dir / "copy.csv").write_text("x,y\n1,2\n", encoding="utf-8")
+    legacy = tmp_path / "datasets.json"
+    legacy.write_text(json.dumps({
+        "d1": {"name": "첫번째", "file": "old.csv", "note": "memo"},
+        "d2": {"name": "사본", "file": "copy.csv"},
+        "d3": {"name": "파일 없음", "file": "missing.csv"},
+    }, ensure_ascii=False), encoding="utf-8")
+
+    db = str(tmp_path / "datasets.db")
+    catalog = Catalog(db, str(legacy), str(data_dir))
+    records = catalog.all()
+    assert list(records) == ["d1", "d2", "d3"]
+    assert records["d1"]["note"] == "memo"
+    assert records["d2"]["file"] == "old.csv"   # 같은 내용은 먼저 등록된 파일 참조
+    assert records["d1"]["stats"]["sha256"] and records["d3"]["stats"]["sha256"] is None
+    assert legacy.exists()
+
+    # 이관 후 삭제한 항목은 다시 열어도 되살아나지 않음
+    catalog.release("d3")
+    Catalog(db, str(legacy), str(data_dir))
+    assert list(catalog.all()) == ["d1", "d2"]
+
+
+def test_legacy_blob_backfilled_by_validated_upload(tmp_path, data_dir):
+    (data_dir / "old.csv").write_text("x,y\n1,2\n", encoding="utf-8")
+    legacy = tmp_path / "datasets.json"
+    legacy.write_text(json.dumps({"d1": {"name": "첫번째", "file": "old.csv"}}), encoding="utf-8")
+    catalog = Catalog(str(tmp_path / "datasets.db"), str(legacy), str(data_dir))
+
+    # 이관 항목은 행 수 / 컬럼 통계가 없음 → 같은 내용 업로드도 검증 필요
+    sha = catalog.get("d1")["stats"]["sha256"]
+    assert catalog.find_blob(sha) and not catalog.known_blob(sha)
+
+    assert add(catalog, data_dir, "d2", "x,y\n1,2\n")["deduped"]
+    assert catalog.known_blob(sha)
+    assert catalog.get("d1")["stats"]["row_count"] == 1
+    assert catalog.get("d1")["stats"]["columns"] == ["x", "y"]
+
+
+# =========================================================
+# 인코딩 기록
+# =========================================================
+def test_read_encoded_probes_once_and_records(catalog, data_dir, monkeypatch):
+    import utils.catalog as catalog_module
+
+    (data_dir / "a.csv").write_bytes("x\n시료\n".encode("cp949"))
+    catalog.upsert("a", {"name": "a", "file": "a.csv"})
+    probes = []
+    detect = catalog_module.detect_encoding
+    monkeypatch.setattr(catalog_module, "detect_encoding", lambda p: probes.append(p) or detect(p))
+
+    read = lambda enc: (data_dir / "a.csv").read_bytes().decode(enc)
+    assert catalog.read_encoded("a.csv", read) == "x\n시료\n"
+    assert catalog.read_encoded("a.csv", read) == "x\n시료\n"
+    assert len(probes) == 1 and catalog.encoding_of("a.csv") == "cp949"
+
+
+def test_read_encoded_falls_back_once_past_sample(catalog, data_dir, monkeypatch):
+    import utils.catalog as catalog_module
+
+    # 앞부분은 UTF-8 로도 유효, 표본 뒤에 CP949 바이트
+    (data_dir / "a.csv").write_bytes(b"x\n" + b"1\n" * 100 + "시료".encode("cp949"))
+    catalog.upsert("a", {"name": "a", "file": "a.csv"})
+    monkeypatch.setattr(catalog_module, "detect_encoding", lambda p: "utf-8")
+
+    tried = []
+    read = lambda enc: tried.append(enc) or (data_dir / "a.csv").read_bytes().decode(enc)
+    assert catalog.read_encoded("a.csv", read).endswith("시료")
+    assert catalog.encoding_of("a.csv") == "cp949"
+
+    tried.clear()
+    catalog.read_encoded("a.csv", read)
+    assert tried == ["cp949"]
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+
+from conftest import ITEMS, survey_frame
+from utils.columnar import (
+    FLAGS_SUFFIX, load_frame, open_sidecar, read_csv_columns, sidecar_path, table_flags, table_frame
+)
+from utils.normalize import normalize_header, normalize_numeric_series, parse_numeric
+
+
+class Reader:
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return pd.read_csv(self.path, dtype=str)
+
+
+def write_survey(tmp_path, n_rows=200, seed=0):
+    path = tmp_path / "data.csv"
+    df = survey_frame(n_rows, seed)
+    df.columns = [c.replace("(mg/kg)", "\n(mg/kg)") for c in df.columns]
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_sidecar_values_match_raw_parsing(tmp_path):
+    path = write_survey(tmp_path)
+    read = Reader(path)
+    df, _ = load_frame(path, read, typed=True)
+    assert os.path.exists(sidecar_path(path)) and read.calls == 1
+
+    raw = read()
+    raw.columns = [normalize_header(c) for c in raw.columns]
+    for item in ITEMS:
+        pd.testing.assert_series_equal(df[item], normalize_numeric_series(raw[item]), check_names=False)
+    assert df["시료명"].tolist() == raw["시료명"].tolist()
+
+    # 플래그는 원본 해석 결과와 동일
+    flags = table_flags(open_sidecar(path), ITEMS)
+    for item in ITEMS:
+        assert flags[item].tolist() == parse_numeric(raw[item])[1].tolist()
+
+
+def test_raw_view_keeps_source_text(tmp_path):
+    path = write_survey(tmp_path, 100)
+    read = Reader(path)
+    load_frame(path, read)
+    df, _ = load_frame(path, read)
+
+    raw = read()
+    raw.columns = [normalize_header(c) for c in raw.columns]
+    for item in ITEMS:
+        assert df[item].tolist() == raw[item].tolist()
+    assert {"<0.01", "ND"} <= set(df["Pb(mg/kg)"].dropna())
+
+
+def test_sidecar_reused_until_source_changes(tmp_path):
+    path = write_survey(tmp_path)
+    read = Reader(path)
+    load_frame(path, read)
+    df, _ = load_frame(path, read, columns=["Pb(mg/kg)", "없는 컬럼"])
+    assert read.calls == 1 and list(df.columns) == ["Pb(mg/kg)"]
+
+    # 같은 내용으로 다시 기록 (mtime 만 바뀜) → 해시가 같으므로 재사용
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, ns=(1, 1))
+    assert open_sidecar(path) is not None
+
+    write_survey(tmp_path, 50, seed=3)
+    assert open_sidecar(path) is None
+    df, _ = load_frame(path, read)
+    assert read.calls == 2 and len(df) == 50
+
+
+def test_flag_columns_are_not_data_columns(tmp_path):
+    path = write_survey(tmp_path, 20)
+    load_frame(path, Reader(path))
+    table = open_sidecar(path)
+    assert "Pb(mg/kg)" + FLAGS_SUFFIX in table.column_names
+    for typed in (True, False):
+        assert list(table_frame(table, typed=typed).columns) == list(survey_frame(20).columns)
+
+
+def test_read_csv_columns_matches_full_read(tmp_path):
+    path = write_survey(tmp_path, 100)
+    columns = ["Cu(mg/kg)", "시료명", "없는 컬럼", "Cu(mg/kg)"]
+    df = read_csv_columns(path, "utf-8", columns)
+    assert list(df.columns) == ["Cu(mg/kg)", "시료명"]
+
+    full = pd.read_csv(path, dtype=str)
+    full.columns = [normalize_header(c) for c in full.columns]
+    pd.testing.assert_frame_equal(df, full[["Cu(mg/kg)", "시료명"]])
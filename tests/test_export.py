@@ -0,0 +1,24 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils.export import write_xlsx, xlsx_bytes
+
+
+def test_xlsx_round_trip_in_chunks(tmp_path):
+    a = pd.DataFrame({"항목": ["Pb", "Cu", "Zn"], "값": [1.5, np.nan, 3.0]})
+    b = pd.DataFrame({"n": np.arange(25)})
+    path = tmp_path / "out.xlsx"
+    write_xlsx(str(path), {"요약": a, "상세": b}, chunk_rows=4)
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ["요약", "상세"]
+    pd.testing.assert_frame_equal(sheets["요약"], a)
+    pd.testing.assert_frame_equal(sheets["상세"], b)
+
+
+def test_xlsx_bytes_is_a_workbook():
+    data = xlsx_bytes({"빈 시트": pd.DataFrame({"x": []})})
+    sheets = pd.read_excel(io.BytesIO(data), sheet_name=None)
+    assert list(sheets["빈 시트"].columns) == ["x"] and sheets["빈 시트"].empty
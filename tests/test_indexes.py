@@ -0,0 +1,138 @@
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from conftest import survey_frame
+from utils.indexes import (
+    FILTER_ARGS, RowIndex, filter_params, load_index, parse_filter_args, remove_index, save_index
+)
+
+
+# =========================================================
+# 기준 구현 (전체 행 불리언 마스크)
+# =========================================================
+def row_day(value):
+    if value is None:
+        return None
+    parts = re.split(r"[./-]", str(value).strip())
+    try:
+        return (date(*map(int, parts[:3])) - date(1970, 1, 1)).days
+    except (TypeError, ValueError):
+        return None
+
+
+def row_depth(value):
+    m = re.match(r"\s*(\d+(?:\.\d+)?)", str(value)) if value is not None else None
+    return float(m.group(1)) if m else None
+
+
+def in_range(v, low, high):
+    return v is not None and (low is None or v >= low) and (high is None or v <= high)
+
+
+def reference_select(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for name, fields in FILTER_ARGS.items():
+        if name in filters:
+            hit = np.zeros(len(df), dtype=bool)
+            for f in fields:
+                hit |= df[f].isin(filters[name]).to_numpy()
+            mask &= hit
+    if "date" in filters:
+        mask &= np.array([in_range(row_day(v), *filters["date"]) for v in df["시료채취일"]])
+    if "depth" in filters:
+        mask &= np.array([in_range(row_depth(v), *filters["depth"]) for v in df["깊이"]])
+    return np.flatnonzero(mask)
+
+
+def random_filters(rng, df):
+    choices = {
+        "area": ["가", "나", "다", "없음"],
+        "land_use": ["주거", "공장", "임야"],
+        "site": list(df["지점명"].unique()[:5]) + list(df["시료명"].dropna().unique()[:5]),
+        "depth_level": ["표토", "심토"],
+    }
+    filters = {}
+    for name, values in choices.items():
+        if rng.random() < 0.4:
+            filters[name] = tuple(rng.choice(values, rng.integers(1, 3), replace=False))
+    if rng.random() < 0.5:
+        lo, hi = sorted(rng.integers(20148, 20270, 2).tolist())   # 2025-03 ~ 2025-06 전후
+        filters["date"] = (lo if rng.random() < 0.8 else None, hi if rng.random() < 0.8 else None)
+    if rng.random() < 0.5:
+        lo, hi = sorted(rng.choice([0.0, 0.15, 0.3, 0.5, 0.6, 1.0, 2.5, 3.0], 2).tolist())
+        filters["depth"] = (lo if rng.random() < 0.8 else None, hi if rng.random() < 0.8 else None)
+    return filters
+
+
+# =========================================================
+# 행 선택
+# =========================================================
+@pytest.mark.parametrize("seed", range(5))
+def test_select_matches_boolean_mask(seed):
+    df = survey_frame(2000, seed)
+    index = RowIndex(df)
+    rng = np.random.default_rng(seed)
+
+    for _ in range(40):
+        filters = random_filters(rng, df)
+        rows = index.select(filters)
+        if not filters:
+            assert rows is None
+            continue
+        np.testing.assert_array_equal(rows, reference_select(df, filters), err_msg=str(filters))
+
+
+def test_date_range_is_inclusive():
+    df = pd.DataFrame({"시료채취일": ["2025.03.01", "2025-03-02", "2025/03/03", "미기재", None]})
+    index = RowIndex(df)
+    day = row_day("2025.03.02")
+    assert index.select({"date": (day, day)}).tolist() == [1]
+    assert index.select({"date": (None, day)}).tolist() == [0, 1]
+    assert index.select({"date": (day, None)}).tolist() == [1, 2]
+
+
+def test_missing_columns_select_nothing():
+    index = RowIndex(pd.DataFrame({"Pb(mg/kg)": [1.0, 2.0]}))
+    assert index.select({"area": ("가",)}).tolist() == []
+    assert index.select({"date": (0, None)}).tolist() == []
+    assert index.select({"depth": (0.0, 1.0)}).tolist() == []
+
+
+# =========================================================
+# 요청 파라미터
+# =========================================================
+def test_parse_filter_args():
+    args = MultiDict([
+        ("area", "가"), ("area", "나"), ("site", ""), ("date_from", "2025.03.02"),
+        ("depth_max", "0.5"), ("depth_min", "x"), ("page", "2"),
+    ])
+    filters = parse_filter_args(args)
+    assert filters == {"area": ("가", "나"), "date": (row_day("2025.03.02"), None), "depth": (None, 0.5)}
+    assert filter_params(args) == [("area", "가"), ("area", "나"), ("date_from", "2025.03.02"),
+                                   ("depth_min", "x"), ("depth_max", "0.5")]
+
+
+def test_parse_filter_args_empty():
+    assert parse_filter_args(MultiDict([("date_from", "미기재"), ("area", "")])) == {}
+
+
+# =========================================================
+# 저장 / 로딩
+# =========================================================
+def test_index_invalidated_when_data_changes(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n")
+    save_index(str(path), RowIndex(survey_frame(10)))
+    assert load_index(str(path)).n_rows == 10
+
+    path.write_text("a\n1\n2\n")
+    assert load_index(str(path)) is None
+
+    remove_index(str(path))
+    remove_index(str(path))
+    assert load_index(str(path)) is None
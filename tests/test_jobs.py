@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from utils.jobs import IngestQueue, QueueFull
+
+
+def wait(job, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if job.status in ("done", "failed"):
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job.name} did not finish")
+
+
+def test_job_result_and_failure():
+    queue = IngestQueue(workers=1, max_pending=4)
+
+    def work(job, value):
+        job.update("계산", 0.5)
+        return value * 2
+
+    def fail(job):
+        raise ValueError("검증 실패")
+
+    ok = wait(queue.submit("ok", work, 21))
+    bad = wait(queue.submit("bad", fail))
+    assert ok.to_dict()["result"] == 42 and ok.progress == 1.0
+    assert bad.status == "failed" and bad.error == "검증 실패"
+    assert queue.get(ok.id) is ok and queue.pending() == 0
+
+
+def test_queue_full_until_slot_released():
+    queue = IngestQueue(workers=1, max_pending=2)
+    gate = threading.Event()
+    jobs = [queue.submit(f"j{i}", lambda job: gate.wait(5)) for i in range(2)]
+
+    assert queue.full()
+    with pytest.raises(QueueFull):
+        queue.submit("extra", lambda job: None)
+
+    gate.set()
+    for job in jobs:
+        wait(job)
+    # 상태 갱신 직후 슬롯이 반환되므로 잠깐 재시도
+    for _ in range(100):
+        try:
+            job = queue.submit("next", lambda job: "ok")
+            break
+        except QueueFull:
+            threading.Event().wait(0.01)
+    assert wait(job).result == "ok"
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from utils.materialize import load_summary, remove_summary, save_summary, slice_items, summary_path
+
+RESULTS = {"A": pd.DataFrame({"항목": ["Pb", "Cu", "Zn"], "n": [1, 2, 3]})}
+
+
+def test_summary_round_trip_and_invalidation(tmp_path):
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n")
+    save_summary(str(data), ("v1",), ["Pb", "Cu", "Zn"], RESULTS)
+
+    stored = load_summary(str(data), ("v1",), ["Zn", "Pb"])
+    pd.testing.assert_frame_equal(stored["A"], RESULTS["A"])
+
+    assert load_summary(str(data), ("v2",), ["Pb"]) is None          # 기준표 변경
+    assert load_summary(str(data), ("v1",), ["Pb", "Cd"]) is None    # 저장되지 않은 항목
+
+    data.write_text("a\n1\n2\n")                                      # 데이터 변경
+    assert load_summary(str(data), ("v1",), ["Pb"]) is None
+
+    remove_summary(str(data))
+    remove_summary(str(data))
+    assert not os.path.exists(summary_path(str(data)))
+
+
+def test_corrupt_summary_is_ignored(tmp_path):
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n")
+    (tmp_path / "data.csv.summary.pkl").write_bytes(b"not a pickle")
+    assert load_summary(str(data), ("v1",), ["Pb"]) is None
+
+
+def test_slice_items_keeps_request_order():
+    out = slice_items(RESULTS["A"], ["Zn", "Pb"])
+    assert out["항목"].tolist() == ["Zn", "Pb"] and out["n"].tolist() == [3, 1]
+    assert out.index.tolist() == [0, 1]
@@ -0,0 +1,58 @@
+from flask import Flask
+
+from utils.cache import FrameCache
+from utils.metrics import Metrics
+
+
+def make_app(metrics):
+    app = Flask(__name__)
+
+    @app.route("/items/<name>")
+    def item(name):
+        with metrics.stage("read"):
+            metrics.add_bytes_read(10)
+        with metrics.stage("read"):
+            pass
+        return name
+
+    metrics.install(app)
+    return app
+
+
+def test_server_timing_and_prometheus_text():
+    metrics = Metrics()
+    cache = FrameCache()
+    metrics.register_cache("dataset", cache)
+    client = make_app(metrics).test_client()
+
+    response = client.get("/items/a")
+    header = response.headers["Server-Timing"]
+    assert header.startswith("read;dur=") and "total;dur=" in header
+    client.get("/items/b")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'datahub_request_duration_seconds_count{route="/items/<name>"} 2' in text
+    assert 'datahub_requests_total{route="/items/<name>",status="200"} 2' in text
+    assert 'datahub_stage_seconds_count{stage="read"} 4' in text
+    assert "datahub_bytes_read_total 20" in text
+    assert 'datahub_cache_hit_ratio{cache="dataset"} 0.0' in text
+
+
+def test_disabled_metrics_register_nothing():
+    metrics = Metrics(enabled=False)
+    client = make_app(metrics).test_client()
+
+    response = client.get("/items/a")
+    assert response.data == b"a" and "Server-Timing" not in response.headers
+    assert client.get("/metrics").status_code == 404
+    assert metrics.stage("read") is metrics.stage("analyze")
+
+
+def test_duration_count_keeps_growing_past_window():
+    metrics = Metrics(window=4)
+    client = make_app(metrics).test_client()
+    for _ in range(10):
+        client.get("/items/a")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'datahub_request_duration_seconds_count{route="/items/<name>"} 10' in text
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import survey_frame
+from utils.normalize import (
+    FLAG_BELOW_DL, FLAG_UNPARSEABLE, REGIONS, SURVEY_TYPES, map_unique, normalize_header,
+    normalize_numeric_series, numeric_flag_summary, parse_numeric
+)
+from utils.region_analysis import normalize_region, normalize_survey_type
+
+
+# =========================================================
+# 수치 해석 (검출한계 / 해석 불가 표시)
+# =========================================================
+def test_parse_numeric_values_and_flags():
+    s = pd.Series(["12.5", "1,191", "<0.01", "< 0.5", "ND", "n.d.", "불검출",
+                   "１２", "1.2s", "abc", "-", "", None, "0"])
+    values, flags = parse_numeric(s)
+
+    expected_values = [12.5, 1191.0, 0.01, 0.5, np.nan, np.nan, np.nan,
+                       12.0, np.nan, np.nan, np.nan, np.nan, np.nan, 0.0]
+    expected_flags = [0, 0, FLAG_BELOW_DL, FLAG_BELOW_DL, FLAG_BELOW_DL, FLAG_BELOW_DL, FLAG_BELOW_DL,
+                      0, FLAG_UNPARSEABLE, FLAG_UNPARSEABLE, 0, 0, 0, 0]
+    np.testing.assert_array_equal(values, expected_values)
+    assert flags.tolist() == expected_flags
+
+
+def test_parse_numeric_numeric_dtype_passthrough():
+    s = pd.Series([1.0, np.nan, 3.5])
+    values, flags = parse_numeric(s)
+    np.testing.assert_array_equal(values, [1.0, np.nan, 3.5])
+    assert not flags.any()
+    values[0] = 99
+    assert s.iloc[0] == 1.0   # 원본을 바꾸지 않음
+
+
+def test_parse_numeric_repeated_values_share_result():
+    s = pd.Series(["<0.01", "5", "<0.01", "x"] * 1000)
+    values, flags = parse_numeric(s)
+    assert np.count_nonzero(flags == FLAG_BELOW_DL) == 2000
+    assert np.count_nonzero(flags == FLAG_UNPARSEABLE) == 1000
+    assert np.nansum(values) == pytest.approx(1000 * 5 + 2000 * 0.01)
+
+
+def test_normalize_numeric_series_drops_flagged_cells():
+    s = pd.Series(["<0.01", "ND", "7", "x", None], index=list("abcde"), name="Pb")
+    out = normalize_numeric_series(s)
+    assert out.name == "Pb" and list(out.index) == list("abcde")
+    assert out.isna().tolist() == [True, True, False, True, True]
+    assert out["c"] == 7.0
+
+
+def test_numeric_flag_summary_counts():
+    _, flags = parse_numeric(pd.Series(["<1", "ND", "x", "2"]))
+    summary = numeric_flag_summary({"Pb": flags})
+    assert summary.to_dict("records") == [{"항목": "Pb", "검출한계 미만": 2, "해석 불가": 1}]
+
+
+# =========================================================
+# 범주 정규화
+# =========================================================
+
+
+def test_map_unique_categories():
+    s = pd.Series(["1지역", "1", "2", "x", None] * 3)
+    out = map_unique(s, lambda v: {"1지역": "1지역", "1": "1지역", "2": "2지역"}.get(v), REGIONS)
+    assert list(out.cat.categories) == REGIONS
+    assert out.iloc[:3].tolist() == ["1지역", "1지역", "2지역"]
+    assert out.iloc[:5].isna().tolist() == [False, False, False, True, True]
+
+
+@pytest.mark.parametrize("column, func, categories", [
+    ("조사구분", normalize_survey_type, SURVEY_TYPES),
+    ("지목(1/2/3)", normalize_region, REGIONS),
+])
+def test_map_unique_matches_row_apply(column, func, categories):
+    s = survey_frame(500, 2)[column]
+    expected = s.apply(func)
+    out = map_unique(s, func, categories)
+    pd.testing.assert_series_equal(out.astype(object), expected.astype(object), check_names=False)
+
+
+def test_normalize_header():
+    assert normalize_header(" Pb\n(mg/kg) ") == "Pb(mg/kg)"
+    assert normalize_header("TPH \r\n(mg/kg)") == "TPH (mg/kg)"
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from werkzeug.datastructures import MultiDict
+
+from utils.paging import PagedView, page_url, parse_page_args
+
+
+def params(**args):
+    return parse_page_args(MultiDict(args))
+
+
+def test_page_args_are_clamped():
+    p = parse_page_args(MultiDict([("page", "0"), ("page_size", "99999"), ("order", "x"),
+                                   ("filter", "a:1"), ("filter", "bad"), ("filter", "b:")]))
+    assert p == {"page": 1, "page_size": 1000, "sort": None, "order": "asc", "filters": [("a", "1")]}
+
+
+def test_page_url_keeps_params():
+    p = params(sort="Pb", order="desc", page_size="50")
+    p["filters"] = [("지점명", "P1")]
+    assert page_url("/dataset/x", p, page=3) == (
+        "/dataset/x?page=3&page_size=50&sort=Pb&order=desc&filter=%EC%A7%80%EC%A0%90%EB%AA%85%3AP1"
+    )
+
+
+def test_sort_filter_and_page_meta():
+    df = pd.DataFrame({
+        "지점명": [f"P{i % 7}" for i in range(50)],
+        "Pb": [float(v) for v in np.random.default_rng(0).permutation(50)],
+    })
+    view = PagedView()
+    p = params(sort="Pb", order="desc", page_size="4", page="2")
+    p["filters"] = [("지점명", "p3"), ("없는컬럼", "x")]
+
+    window, meta = view.page("k", df, p)
+    expected = df[df["지점명"] == "P3"].sort_values("Pb", ascending=False)
+    assert window.index.tolist() == expected.index[4:8].tolist()
+    assert meta == {"total_rows": 50, "filtered_rows": len(expected), "page": 2,
+                    "pages": 2, "start": 5, "end": len(expected)}
+
+    # 마지막 페이지를 넘으면 마지막 페이지
+    _, meta = view.page("k", df, {**p, "page": 9})
+    assert meta["page"] == 2
+
+
+def test_positions_cached_per_key():
+    df = pd.DataFrame({"a": [3, 1, 2]})
+    view = PagedView(max_entries=1)
+    p = params(sort="a")
+    first = view.positions("k", df, p)
+    assert first.tolist() == [1, 2, 0]
+    assert view.positions("k", df, p) is first
+    view.positions("other", df, p)
+    assert view.positions("k", df, p) is not first
+
+
+def test_empty_result_meta():
+    df = pd.DataFrame({"a": ["x", "y"]})
+    p = params()
+    p["filters"] = [("a", "z")]
+    window, meta = PagedView().page("k", df, p)
+    assert window.empty
+    assert (meta["filtered_rows"], meta["pages"], meta["start"], meta["end"]) == (0, 1, 0, 0)
+
+
+def test_mixed_type_column_sorts_as_text():
+    df = pd.DataFrame({"a": [10, "b", 2, "a"]})
+    assert PagedView().positions("k", df, params(sort="a")).tolist() == [0, 2, 3, 1]
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import app_upgrade
+from conftest import survey_frame
+from utils.catalog import Catalog, dataset_stats
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    catalog = Catalog(str(tmp_path / "datasets.db"), data_dir=str(data_dir))
+    for seed in range(3):
+        path = data_dir / f"survey{seed}.csv"
+        survey_frame(150, seed=seed).to_csv(path, index=False)
+        catalog.upsert(f"d{seed}", {"name": f"조사{seed}", "file": path.name})
+
+    monkeypatch.setattr(app_upgrade, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(app_upgrade, "CATALOG", catalog)
+    monkeypatch.setattr(app_upgrade, "PORTFOLIO_WORKERS", 3)
+    return catalog
+
+
+@pytest.fixture
+def items():
+    columns = survey_frame(1).columns
+    return [i for i in app_upgrade.load_standards().items if i in columns]
+
+
+def test_portfolio_map_caps_concurrency(catalog, items, monkeypatch):
+    running, peak = [0], [0]
+    lock = threading.Lock()
+    analyze = app_upgrade.analyze_file
+
+    def tracked(*args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return analyze(*args)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(app_upgrade, "portfolio_pool", lambda: pool)
+    monkeypatch.setattr(app_upgrade, "analyze_file", tracked)
+
+    table, info = app_upgrade.portfolio_analysis(items, workers=2, use_cache=False)
+    serial, _ = app_upgrade.portfolio_analysis(items, serial=True, use_cache=False)
+    pool.shutdown()
+
+    assert peak[0] <= 2 and info["computed"] == 3
+    pd.testing.assert_frame_equal(table, serial)
+    # 표본으로 판별한 인코딩 기록
+    assert catalog.encoding_of("survey0.csv") == "utf-8"
+
+
+def test_portfolio_pool_is_shared(catalog, items):
+    table, info = app_upgrade.portfolio_analysis(items, workers=2, use_cache=False)
+    pool = app_upgrade.portfolio_pool()
+    app_upgrade.portfolio_analysis(items, workers=3, use_cache=False)
+
+    assert app_upgrade.portfolio_pool() is pool
+    assert info["workers"] == 2 and info["datasets"] == 3
+    assert set(table["데이터셋"]) == {"d0", "d1", "d2"}
+    assert list(table.columns[-5:]) == [
+        "지점수", "최고", "우려40초과_지점수", "우려초과_지점수", "대책초과_지점수"
+    ]
+    assert (table["우려40초과_지점수"] >= table["우려초과_지점수"]).all()
@@ -0,0 +1,153 @@
+import pandas as pd
+import pytest
+
+import app_upgrade
+from conftest import ITEMS, survey_frame
+from utils.aggregates import Aggregates
+from utils.materialize import load_summary, save_summary
+from utils.normalize import REGIONS
+from utils.portfolio_worker import slice_result
+from utils.region_analysis import (
+    ITEM_GROUPS, aggregate_result, analysis_items, analyze_regions, exceed_label, prepare_frame,
+    prepared_columns
+)
+
+
+def reference_regions(df, items, std):
+    """
+    행마다 기준종류별 기준값과 비교하는 기준 구현 (벡터화 이전 동작)
+    """
+    tables = {level: std.threshold_table(level) for level in std.levels}
+    site = df["시료명"].astype(str) if "시료명" in df.columns else None
+
+    def is_exceed(row, item, region, level):
+        v, table = row[item], tables[level]
+        if pd.isna(v) or region not in table.index or item not in table.columns:
+            return False
+        return v > table.loc[region, item]
+
+    out = []
+    for item in items:
+        r = {"항목": item}
+        for region in REGIONS:
+            if item not in df.columns:
+                r[f"{region}_지점수"] = 0
+                r[f"{region}_최고"] = None
+                for level in std.levels:
+                    r[f"{region}_{exceed_label(level)}"] = 0
+                continue
+            sub = df[df["_지역"] == region]
+            r[f"{region}_지점수"] = site.loc[sub.index].nunique() if site is not None else len(sub)
+            r[f"{region}_최고"] = None if sub[item].isna().all() else float(sub[item].max())
+            for level in std.levels:
+                ex = sub[sub.apply(lambda x: is_exceed(x, item, region, level), axis=1)] if len(sub) else sub
+                r[f"{region}_{exceed_label(level)}"] = (
+                    site.loc[ex.index].nunique() if site is not None else len(ex)
+                )
+        out.append(r)
+    return pd.DataFrame(out).where(pd.notna, None)
+
+
+def prepared(n_rows, seed=0, **kwargs):
+    return prepare_frame(survey_frame(n_rows, seed, **kwargs), ITEMS)
+
+
+# =========================================================
+# 지역별 결과표
+# =========================================================
+@pytest.mark.parametrize("survey", ["A", "B"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_analyze_regions_matches_reference(std, survey, seed):
+    df = prepared(300, seed)
+    sub = df[df["_조사"] == survey]
+    items = ITEMS + ["Cd(mg/kg)"]   # 없는 컬럼 포함
+
+    expected = reference_regions(sub, items, std)
+    pd.testing.assert_frame_equal(analyze_regions(sub, items, std), expected, check_dtype=False)
+    assert expected.filter(like="_우려초과_지점수").to_numpy().sum() > 0
+    assert (
+        expected.filter(like="_우려40초과_지점수").to_numpy().sum()
+        > expected.filter(like="_대책초과_지점수").to_numpy().sum()
+    )
+
+
+def test_analyze_regions_without_site_columns(std):
+    df = prepared(200, 4).drop(columns=["시료명", "지점명"])
+    pd.testing.assert_frame_equal(
+        analyze_regions(df, ITEMS, std), reference_regions(df, ITEMS, std), check_dtype=False
+    )
+
+
+def test_analyze_regions_empty_region(std):
+    df = prepared(100, 5)
+    df = df[df["_지역"] != "2지역"]
+    result = analyze_regions(df, ITEMS, std)
+    assert (result["2지역_지점수"] == 0).all() and result["2지역_최고"].isna().all()
+    pd.testing.assert_frame_equal(result, reference_regions(df, ITEMS, std), check_dtype=False)
+
+
+def test_aggregate_result_for_missing_item(std):
+    agg = Aggregates(std.version, ITEMS, std.levels)
+    agg.update(prepare_frame(survey_frame(50).drop(columns=["TPH"]), ITEMS), std, ("p",))
+    row = aggregate_result(agg, "A", ["TPH"]).iloc[0]
+    assert row["1지역_지점수"] == 0 and row["1지역_최고"] is None
+
+
+# =========================================================
+# 전처리 / 사전 계산 항목
+# =========================================================
+def test_prepare_frame_normalizes_codes_and_values():
+    df = pd.DataFrame({
+        "조사구분(개황/정밀)": ["개황조사", "상세조사", "기타", None],
+        "지목(1/2/3)": ["1지역", "2", "기타", None],
+        "Pb(mg/kg)": ["1,191", "<0.01", "ND", "12.5"],
+    })
+    out = prepare_frame(df, ["Pb(mg/kg)"])
+
+    assert out["_조사"].tolist()[:2] == ["A", "B"]
+    assert out["_조사"].isna().tolist() == [False, False, True, True]
+    assert out["_지역"].tolist()[:2] == ["1지역", "2지역"]
+    assert out["_지역"].isna().tolist() == [False, False, True, True]
+    assert out["Pb(mg/kg)"].tolist()[0] == 1191.0
+    assert out["Pb(mg/kg)"].isna().tolist() == [False, True, True, False]
+
+
+def test_prepared_columns_keeps_order_and_analysis_columns():
+    columns = ["NO", "조사구분(개황/정밀)", "지목(1/2/3)", "시료명", "Pb(mg/kg)", "비고", "Cu(mg/kg)"]
+    assert prepared_columns(columns, ["Cu(mg/kg)", "Pb(mg/kg)"]) == [
+        "조사구분(개황/정밀)", "지목(1/2/3)", "시료명", "Pb(mg/kg)", "Cu(mg/kg)"
+    ]
+
+
+def test_analysis_items_cover_standards_and_groups(std):
+    items = analysis_items(std)
+    assert len(items) == len(set(items))
+    assert set(std.items) <= set(items)
+    assert {i for g in ITEM_GROUPS.values() for i in g} <= set(items)
+
+
+# =========================================================
+# app_upgrade 응답 / 저장 결과
+# =========================================================
+def test_iter_csv_matches_single_to_csv(std):
+    df = analyze_regions(prepared(300, 2), ITEMS, std)
+    big = pd.concat([df] * 700, ignore_index=True)   # CSV_CHUNK_ROWS 를 넘는 행 수
+
+    chunks = list(app_upgrade.iter_csv(big))
+    assert len(chunks) == 1 + -(-len(big) // app_upgrade.CSV_CHUNK_ROWS)
+    assert "".join(chunks) == big.to_csv(index=False)
+
+
+def test_stored_summary_slices_match_direct_analysis(std, tmp_path):
+    df = prepared(300, 6)
+    a = df[df["_조사"] == "A"]
+    data = tmp_path / "data.csv"
+    data.write_text("x\n")
+    items = ITEMS + ["Cd(mg/kg)"]
+    save_summary(str(data), ("v",), items, {"A": analyze_regions(a, items, std)})
+
+    subset = ["TPH", "Cd(mg/kg)", "Pb(mg/kg)"]
+    stored = load_summary(str(data), ("v",), subset)
+    pd.testing.assert_frame_equal(
+        slice_result(stored["A"], subset), analyze_regions(a, subset, std)
+    )
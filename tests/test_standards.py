@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+
+import app_upgrade
+from conftest import STANDARD_CSV
+from utils.standards import LEVELS, canonical_level, get_standards
+
+
+def test_canonical_level_labels():
+    assert canonical_level("우려 40% 또는 70%") == "우려40"
+    assert canonical_level(" 우려기준 ") == "우려기준"
+    assert canonical_level("대책기준") == "대책기준"
+    assert canonical_level("비고") is None
+    assert canonical_level(float("nan")) is None
+
+
+def test_merged_region_cells_are_filled_down():
+    std = get_standards(STANDARD_CSV)
+
+    assert std.regions == ["1지역", "2지역", "3지역"]
+    assert std.levels == LEVELS
+    assert std.std_map[("1지역", "대책기준", "Cd(mg/kg)")] == 12.0
+    assert std.std_map[("1지역", "우려기준", "Cd(mg/kg)")] == 4.0
+    assert std.std_map[("1지역", "우려40", "Cd(mg/kg)")] == 2.8
+    assert std.get("3지역", "우려40", "Cu(mg/kg)") == 1400.0
+    assert np.isnan(std.get("4지역", "우려40", "Cu(mg/kg)"))
+    assert all("\n" not in item for item in std.items)
+
+
+def test_app_standards_keep_each_level():
+    std = app_upgrade.load_standards(STANDARD_CSV)
+
+    assert std.threshold_table("우려기준").loc["1지역", "Cd(mg/kg)"] == 4.0
+    assert std.threshold_table("대책기준").loc["2지역", "Cd(mg/kg)"] == 30.0
+    nested = std.to_nested()
+    assert set(nested["2지역"]) == set(LEVELS)
+    assert nested["1지역"]["우려40"]["Cd(mg/kg)"] == 2.8
+
+
+def test_registry_recompiles_only_when_file_changes(standard_csv):
+    first = get_standards(standard_csv)
+    assert get_standards(standard_csv) is first
+
+    with open(standard_csv, "a", encoding="utf-8") as f:
+        f.write("4지역,우려기준,1,1,1,1\n")
+    os.utime(standard_csv, ns=(0, os.stat(standard_csv).st_mtime_ns + 1))
+    second = get_standards(standard_csv)
+    assert second is not first and second.version != first.version
+    assert "4지역" in second.regions
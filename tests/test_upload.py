@@ -0,0 +1,137 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from utils.encoding import detect_encoding, read_with_fallback
+from utils.upload import UploadRejected, match_columns, spool_upload, validate_spooled
+
+REQUIRED = ["시료명", "지목"]
+NUMERIC = ["Pb", "Cu"]
+
+
+def csv_bytes(rows, header="시 료 명,지목\n(1/2/3),Pb(mg/kg),Cu(mg/kg)", encoding="utf-8"):
+    names = ",".join(f'"{h}"' for h in header.split(","))
+    return (names + "\n" + "".join(",".join(r) + "\n" for r in rows)).encode(encoding)
+
+
+def upload(tmp_path, data, max_bytes=1024 * 1024):
+    dest = str(tmp_path / "data.csv")
+    tmp, stats = spool_upload(io.BytesIO(data), dest, max_bytes=max_bytes, chunk_bytes=64)
+    return dest, validate_spooled(tmp, dest, stats, REQUIRED, NUMERIC, chunk_rows=50)
+
+
+def leftovers(tmp_path):
+    return [p.name for p in tmp_path.iterdir() if p.name.endswith(".upload")]
+
+
+# =========================================================
+# 통과
+# =========================================================
+def test_accepts_detection_limit_and_thousands_notation(tmp_path):
+    rows = [["S1", "1", "<0.01", '"1,191"'], ["S2", "2", "ND", "12.5"], ["S3", "3", "", "불검출"]]
+    data = csv_bytes(rows)
+    dest, stats = upload(tmp_path, data)
+
+    assert stats["row_count"] == 3
+    assert stats["columns"] == ["시 료 명", "지목(1/2/3)", "Pb(mg/kg)", "Cu(mg/kg)"]
+    assert stats["size"] == len(data) and stats["sha256"] == hashlib.sha256(data).hexdigest()
+    assert stats["encoding"] == "utf-8"
+    assert os.path.exists(dest) and not leftovers(tmp_path)
+
+
+def test_tolerates_a_few_unparseable_values(tmp_path):
+    rows = [[f"S{i}", "1", "1.2s" if i < 5 else "3", "4"] for i in range(100)]
+    _, stats = upload(tmp_path, csv_bytes(rows))
+    assert stats["row_count"] == 100
+
+
+def test_cp949_upload(tmp_path):
+    _, stats = upload(tmp_path, csv_bytes([["시료1", "1", "3", "4"]], encoding="cp949"))
+    assert stats["encoding"] == "cp949" and stats["row_count"] == 1
+
+
+def test_match_columns_ignores_spaces_and_suffix():
+    found = match_columns(["시 료 명", "지목\n(1/2/3)", "Pb(mg/kg)"], ["시료명", "지목", "Cd"])
+    assert found == {"시료명": "시 료 명", "지목": "지목\n(1/2/3)"}
+
+
+# =========================================================
+# 거부
+# =========================================================
+def test_rejects_missing_required_column(tmp_path):
+    data = csv_bytes([["1", "2", "3"]], header="지목,Pb(mg/kg),Cu(mg/kg)")
+    with pytest.raises(UploadRejected, match="시료명"):
+        upload(tmp_path, data)
+    assert not os.path.exists(tmp_path / "data.csv") and not leftovers(tmp_path)
+
+
+def test_rejects_too_many_unparseable_values(tmp_path):
+    rows = [[f"S{i}", "1", "3", "x" if i >= 80 else "4"] for i in range(100)]
+    with pytest.raises(UploadRejected, match=r"Cu\(mg/kg\) 82행 'x'") as e:
+        upload(tmp_path, csv_bytes(rows))
+    assert e.value.status == 400
+    assert not leftovers(tmp_path)
+
+
+def test_rejects_oversize_upload(tmp_path):
+    with pytest.raises(UploadRejected) as e:
+        upload(tmp_path, csv_bytes([["S1", "1", "3", "4"]] * 500), max_bytes=1000)
+    assert e.value.status == 413
+    assert not leftovers(tmp_path)
+
+
+def test_rejects_empty_file(tmp_path):
+    with pytest.raises(UploadRejected, match="빈 파일"):
+        upload(tmp_path, b"")
+
+
+def test_validation_reports_progress(tmp_path):
+    dest = str(tmp_path / "data.csv")
+    rows = [[f"S{i}", "1", "3", "4"] for i in range(120)]
+    tmp, stats = spool_upload(io.BytesIO(csv_bytes(rows)), dest, chunk_bytes=64)
+    seen = []
+    validate_spooled(tmp, dest, stats, REQUIRED, NUMERIC, chunk_rows=50, progress=seen.append)
+    assert seen and seen == sorted(seen) and not leftovers(tmp_path)
+
+
+def test_failed_upload_keeps_existing_file(tmp_path):
+    (tmp_path / "data.csv").write_bytes(b"old")
+    with pytest.raises(UploadRejected):
+        upload(tmp_path, csv_bytes([["1"]], header="지목"))
+    assert (tmp_path / "data.csv").read_bytes() == b"old"
+
+
+# =========================================================
+# 인코딩 판별
+# =========================================================
+def test_detect_encoding_reads_only_sample(tmp_path):
+    path = tmp_path / "mixed.csv"
+    path.write_bytes(b"a,b\n" + b"1,2\n" * 1000 + "시료".encode("cp949") + b"\n")
+    # 표본 밖의 CP949 바이트는 보지 않음 (읽을 때 read_with_fallback 이 보정)
+    assert detect_encoding(str(path), sample_bytes=256) == "utf-8"
+    assert detect_encoding(str(path)) == "cp949"
+
+    path.write_bytes(b"\xef\xbb\xbf" + "시료,값\n".encode("utf-8"))
+    assert detect_encoding(str(path), sample_bytes=3) == "utf-8-sig"
+
+    # 표본 경계에서 잘린 멀티바이트 문자
+    path.write_bytes("시료,값\n".encode("utf-8"))
+    assert detect_encoding(str(path), sample_bytes=4) == "utf-8"
+
+    # 파일 끝까지 읽은 표본은 잘린 문자를 허용하지 않음
+    path.write_bytes("시료".encode("utf-8")[:-1])
+    assert detect_encoding(str(path)) == "latin-1"
+
+
+def test_read_with_fallback_tries_next_candidate():
+    tried = []
+
+    def read(enc):
+        tried.append(enc)
+        return "시료".encode("cp949").decode(enc)
+
+    assert read_with_fallback(read, "utf-8-sig") == ("시료", "cp949")
+    assert tried == ["utf-8-sig", "cp949"]
+    assert read_with_fallback(lambda enc: b"\xff".decode(enc), "cp949")[1] == "latin-1"